@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""Benchmark: in-memory vs chunked EEG preprocessing to bandpower in healing_sim.
+
+The in-memory path mirrors load_eeg_edf + eeg_to_features on a full array
+(zero-phase band-pass, average reference, resample to 128 Hz, welch). The
+chunked path feeds BLOCK_S-second blocks to stream_bandpower, as
+edf_bandpower_chunked does while reading the EDF. Blocks are generated on
+the fly, so only the chunked path never holds the whole recording.
+
+Run: python benchmarks/healing/bench_chunked_eeg.py
+"""
+import time
+import tracemalloc
+
+import numpy as np
+from scipy.signal import fftconvolve, resample_poly
+
+from quantum.eeg_stream import bandpass_taps, stream_bandpower
+from quantum.healing_sim import bandpower_features
+
+N_CHANNELS = 64
+SFREQ = 512
+MINUTES = 20
+BLOCK_S = 60
+
+
+def blocks():
+    rs = np.random.RandomState(0)
+    step = BLOCK_S * SFREQ
+    for _ in range(0, MINUTES * 60 * SFREQ, step):
+        yield rs.randn(N_CHANNELS, step) * 1e-5
+
+
+def in_memory():
+    data = np.concatenate(list(blocks()), axis=1)
+    filtered = fftconvolve(data, bandpass_taps(SFREQ)[None, :], mode="same", axes=-1)
+    filtered -= filtered.mean(axis=0)
+    return bandpower_features(resample_poly(filtered, 1, SFREQ // 128, axis=-1), 128)
+
+
+def chunked():
+    return stream_bandpower(blocks(), SFREQ)
+
+
+def measure(fn):
+    t0 = time.perf_counter()
+    out = fn()
+    elapsed = time.perf_counter() - t0
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return out, elapsed, peak / 2 ** 20
+
+
+if __name__ == "__main__":
+    full_mb = N_CHANNELS * SFREQ * MINUTES * 60 * 8 / 2 ** 20
+    print(f"{N_CHANNELS} ch x {MINUTES} min @ {SFREQ} Hz ({full_mb:.0f} MB as float64), {BLOCK_S} s blocks")
+    ref, t_ref, m_ref = measure(in_memory)
+    out, t_out, m_out = measure(chunked)
+    print(f"in-memory {t_ref:6.2f} s  peak {m_ref:7.0f} MB")
+    print(f"chunked   {t_out:6.2f} s  peak {m_out:7.0f} MB")
+    print(f"median rel diff {np.median(np.abs(out - ref) / np.abs(ref)):.1e}")
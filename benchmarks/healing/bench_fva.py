@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""Benchmark: cobra's flux_variability_analysis vs quantum.fba.flux_variability.
+
+Uses the synthetic pathway network from bench_warm_start.py, runs FVA over
+all reactions serially and with N_WORKERS processes, then times per-recording
+FVA of the top-20 changed reactions inside an FBASession (baseline ranges are
+reused across recordings).
+
+Run: python benchmarks/healing/bench_fva.py
+"""
+import time
+
+import numpy as np
+from cobra.flux_analysis import flux_variability_analysis
+
+from bench_warm_start import deltas, pathway_model
+from quantum.fba import FBASession, flux_variability
+
+N_WORKERS = 4
+
+
+def timed(fn):
+    t0 = time.perf_counter()
+    out = fn()
+    return out, time.perf_counter() - t0
+
+
+if __name__ == "__main__":
+    model, genes = pathway_model()
+    n = len(model.reactions)
+    print(f"{n} reactions")
+    ref, t = timed(lambda: flux_variability_analysis(model, processes=1))
+    print(f"cobra FVA, 1 process          {t:7.2f} s")
+    ours, t = timed(lambda: flux_variability(model, n_workers=1))
+    print(f"flux_variability, 1 worker    {t:7.2f} s")
+    print(f"  max |diff| vs cobra {np.abs(ours.loc[ref.index].to_numpy() - ref.to_numpy()).max():.2e}")
+    _, t = timed(lambda: flux_variability_analysis(model, processes=N_WORKERS))
+    print(f"cobra FVA, {N_WORKERS} processes         {t:7.2f} s")
+    last = {}
+    _, t = timed(lambda: flux_variability(model, n_workers=N_WORKERS, progress=last.update))
+    print(f"flux_variability, {N_WORKERS} workers   {t:7.2f} s  (last progress: {last})")
+
+    fcs = deltas(np.random.RandomState(0), len(genes))
+    with FBASession(model) as session:
+        for fc in fcs:
+            session.solve(genes, fc, fva=True)
+        fva_s = np.array([r["fva_s"] for r in session.records])
+    print(f"session FVA of top-20 changes: first recording {fva_s[0] * 1e3:.0f} ms, "
+          f"then median {np.median(fva_s[1:]) * 1e3:.0f} ms / recording")
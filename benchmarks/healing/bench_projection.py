@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""Benchmark: regenerated vs cached projection matrices in features_to_gene_delta.
+
+Maps N_RECORDINGS feature vectors to a genome-scale gene list three ways:
+regenerating W per call (the old behaviour), per-call with the LRU cache,
+and one batched matmul.
+
+Run: python benchmarks/healing/bench_projection.py
+"""
+import time
+
+import numpy as np
+
+from quantum.healing_sim import PROJECTION_CACHE, features_to_gene_delta
+
+N_RECORDINGS = 200
+N_FEATURES = 64
+N_GENES = 20000
+
+
+def regenerated(feats, ngenes, seed):
+    W = np.random.RandomState(seed).normal(scale=0.01, size=(feats.size, ngenes))
+    return np.tanh(feats.dot(W)) * 0.5
+
+
+if __name__ == "__main__":
+    feats = np.random.RandomState(0).randn(N_RECORDINGS, N_FEATURES)
+    PROJECTION_CACHE.clear()
+
+    t0 = time.perf_counter()
+    ref = np.stack([regenerated(f, N_GENES, 1) for f in feats])
+    t_regen = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    cached = np.stack([features_to_gene_delta(f, ngenes=N_GENES, seed=1) for f in feats])
+    t_cached = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    batched = features_to_gene_delta(feats, ngenes=N_GENES, seed=1)
+    t_batch = time.perf_counter() - t0
+
+    print(f"{N_RECORDINGS} recordings x {N_GENES} genes")
+    print(f"regenerate W per call {t_regen * 1e3:8.1f} ms")
+    print(f"cached W per call     {t_cached * 1e3:8.1f} ms  ({t_regen / t_cached:5.1f}x)")
+    print(f"cached W, one matmul  {t_batch * 1e3:8.1f} ms  ({t_regen / t_batch:5.1f}x)")
+    print(f"max abs diff {max(np.abs(cached - ref).max(), np.abs(batched - ref).max()):.1e}")
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""Benchmark: fresh `with model:` solves vs a warm-started FBASession.
+
+Builds a synthetic linear pathway network (N_REACTIONS internal reactions,
+one gene each) and solves one perturbation per gene delta. Deltas touch a
+random PERTURBED fraction of the genes, as successive recordings do.
+
+Run: python benchmarks/healing/bench_warm_start.py
+"""
+import time
+
+import cobra
+import numpy as np
+
+from quantum.fba import FBASession, apply_gene_delta_to_model
+
+N_REACTIONS = 3000
+N_PATHWAYS = 30
+N_PERTURBATIONS = 30
+PERTURBED = 0.2
+
+
+def pathway_model():
+    model = cobra.Model("pathways")
+    out = cobra.Metabolite("out_c")
+    per_path = N_REACTIONS // N_PATHWAYS
+    reactions, genes = [], []
+    for p in range(N_PATHWAYS):
+        mets = [cobra.Metabolite(f"p{p}_m{i}_c") for i in range(per_path)]
+        uptake = cobra.Reaction(f"EX_p{p}", lower_bound=-10.0, upper_bound=0.0)
+        uptake.add_metabolites({mets[0]: 1})
+        reactions.append(uptake)
+        for i in range(per_path):
+            rxn = cobra.Reaction(f"R{p}_{i}", lower_bound=0.0, upper_bound=10.0 + i % 7)
+            product = mets[i + 1] if i + 1 < per_path else out
+            rxn.add_metabolites({mets[i]: -1, product: 1})
+            rxn.gene_reaction_rule = f"G{p}_{i}"
+            genes.append(f"G{p}_{i}")
+            reactions.append(rxn)
+    sink = cobra.Reaction("EX_out", lower_bound=0.0, upper_bound=1000.0)
+    sink.add_metabolites({out: -1})
+    model.add_reactions(reactions + [sink])
+    model.objective = "EX_out"
+    return model, genes
+
+
+def deltas(rs, n_genes):
+    fc = rs.uniform(-0.5, 0.5, size=(N_PERTURBATIONS, n_genes))
+    fc[rs.random_sample(fc.shape) > PERTURBED] = 0.0
+    return fc
+
+
+if __name__ == "__main__":
+    rs = np.random.RandomState(0)
+    model, genes = pathway_model()
+    fcs = deltas(rs, len(genes))
+    baseline = model.optimize()
+
+    t0 = time.perf_counter()
+    for fc in fcs:
+        with model:
+            apply_gene_delta_to_model(model, genes, fc)
+            model.optimize()
+    fresh_ms = (time.perf_counter() - t0) / len(fcs) * 1e3
+    print(f"{len(model.reactions)} reactions, {N_PERTURBATIONS} perturbations ({PERTURBED:.0%} of genes each)")
+    print(f"with model:      {fresh_ms:8.1f} ms / perturbation")
+
+    for warm in (False, True):
+        with FBASession(model, baseline, warm_start=warm) as session:
+            t0 = time.perf_counter()
+            for fc in fcs:
+                session.solve(genes, fc)
+            total_ms = (time.perf_counter() - t0) / len(fcs) * 1e3
+            s = session.stats()
+        label = "session warm" if warm else "session cold"
+        print(f"{label:15s}  {total_ms:8.1f} ms / perturbation  "
+              f"(solve p50 {s['solve_s_p50'] * 1e3:.1f} ms, p95 {s['solve_s_p95'] * 1e3:.1f} ms, "
+              f"{s['n_changed_bounds_mean']:.0f} bounds updated)")
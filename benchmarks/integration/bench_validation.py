@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""Benchmark: full vs schema-compiled vs sampled combined-output validation.
+
+Also compares a compiled deep schema (per-domain checks) against walking the
+same schema at call time, which is what the compiled path avoids.
+
+Run: python benchmarks/integration/bench_validation.py
+"""
+import timeit
+
+from pdpbiogen.validation.compiled import compile_schema
+from pdpbiogen.validation.validators import (
+    fast_validate_combined_output,
+    sampled_combined_validator,
+    validate_combined_output,
+)
+
+RESULT = {
+    "combined": {"domains": {
+        "neural": {"neural_count": 3, "mean_length": 4.0},
+        "genomic": {"variant_count": 2, "top_variant": {"chr": "1", "pos": 12345}},
+        "metabolic": {"measure_count": 3, "avg_value": 4.9},
+    }},
+    "agent": {"score": 1.0, "n_domains": 3},
+}
+
+DEEP_SCHEMA = {
+    "combined": {"domains": {
+        "neural": {"neural_count": int, "mean_length": (int, float)},
+        "genomic": {"variant_count": int, "top_variant": object},
+        "metabolic": {"measure_count": int, "avg_value": (int, float)},
+    }},
+    "agent": {"score": (int, float), "n_domains": int},
+}
+N = 200000
+
+
+def walk_schema(obj, schema):
+    """Reference interpreter: re-inspects the schema on every call."""
+    for key, spec in schema.items():
+        if key not in obj:
+            raise ValueError(f"Missing key: {key}")
+        value = obj[key]
+        if isinstance(spec, dict):
+            walk_schema(value, spec)
+        elif spec is not object and not isinstance(value, spec):
+            raise ValueError(f"Invalid value for {key}")
+    return True
+
+
+def bench(label, fn, base=None):
+    t = min(timeit.repeat("fn(r)", globals={"fn": fn, "r": RESULT}, number=N, repeat=5))
+    speedup = f"({base / t:5.2f}x)" if base else "(1.00x)"
+    print(f"{label:34s} {t / N * 1e9:8.1f} ns/call  {speedup}")
+    return t
+
+
+if __name__ == "__main__":
+    print("combined-output schema")
+    base = bench("validate_combined_output", validate_combined_output)
+    bench("fast_validate_combined_output", fast_validate_combined_output, base)
+    bench("sampled 1 in 10", sampled_combined_validator(10), base)
+    bench("sampled 1 in 100", sampled_combined_validator(100), base)
+
+    print("deep per-domain schema")
+    deep = compile_schema(DEEP_SCHEMA)
+    base = bench("walk_schema", lambda r: walk_schema(r, DEEP_SCHEMA))
+    bench("compile_schema", deep, base)
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""Benchmark: building 1M agents in dpbiogen.quantum.
+
+Compares a dict-backed Agent (the pre-__slots__ layout) built one
+add_agent call at a time against the __slots__ Agent via add_agent and
+add_agents, and against ArrayMapper.add_agents. Memory is the
+tracemalloc peak while building.
+
+Run: python benchmarks/quantum/bench_agents.py [n_agents]
+"""
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from dpbiogen.quantum import ArrayMapper, Mapper
+
+
+class DictAgent:
+    def __init__(self, name, initial_state=0.0, is_neural=False):
+        self.name = name
+        self.state = float(initial_state)
+        self.is_neural = is_neural
+
+
+def dict_loop(names, states, neural):
+    agents = []
+    for n, s, f in zip(names, states.tolist(), neural.tolist()):
+        agents.append(DictAgent(n, s, f))
+    return agents
+
+
+def slots_loop(names, states, neural):
+    mapper = Mapper()
+    for n, s, f in zip(names, states.tolist(), neural.tolist()):
+        mapper.add_agent(n, s, f)
+    return mapper
+
+
+def slots_bulk(names, states, neural):
+    mapper = Mapper()
+    mapper.add_agents(names, states, neural)
+    return mapper
+
+
+def array_bulk(names, states, neural):
+    mapper = ArrayMapper()
+    mapper.add_agents(names, states, neural)
+    return mapper
+
+
+def measure(fn, *args):
+    """Wall time of an untraced run, then the tracemalloc peak of a second run."""
+    t0 = time.perf_counter()
+    result = fn(*args)
+    elapsed = time.perf_counter() - t0
+    del result
+    tracemalloc.start()
+    result = fn(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return elapsed, peak
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rs = np.random.RandomState(0)
+    names = [f"agent-{i}" for i in range(n)]
+    states = rs.randn(n) * 20
+    neural = rs.rand(n) < 0.01
+    print(f"{n} agents")
+    for label, fn in (("dict Agent, loop", dict_loop), ("slots Agent, add_agent", slots_loop),
+                      ("slots Agent, add_agents", slots_bulk), ("ArrayMapper.add_agents", array_bulk)):
+        elapsed, peak = measure(fn, names, states, neural)
+        print(f"{label:24s} {elapsed:6.2f} s  {n / elapsed / 1e6:5.2f} M agents/s  peak {peak / 2**20:7.1f} MiB")
@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+"""Benchmark: per-state qt.concurrence vs batched NumPy concurrence on (T, 4, 4).
+
+Run: python benchmarks/quantum/bench_concurrence.py
+"""
+import time
+
+import numpy as np
+import qutip as qt
+
+from pdpbiogen.quantum.evolution import PropagatorEngine, concurrence
+
+REPEAT = 20
+
+
+def timed(fn):
+    t0 = time.perf_counter()
+    for _ in range(REPEAT):
+        fn()
+    return (time.perf_counter() - t0) / REPEAT * 1e3
+
+
+if __name__ == "__main__":
+    rho0 = qt.ket2dm(qt.bell_state("00"))
+    for T in (5, 51, 1001):
+        rhos = PropagatorEngine(g=0.3).evolve(rho0, 0.8, np.linspace(0, 1, T))
+        qobjs = [qt.Qobj(r, dims=rho0.dims) for r in rhos]
+        ref = timed(lambda: [qt.concurrence(q) for q in qobjs])
+        fast = timed(lambda: concurrence(rhos))
+        print(f"T={T:5d}  qutip {ref:8.3f} ms  numpy {fast:8.3f} ms  ({ref / fast:6.1f}x)")
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""Benchmark: MultiModeEntangler methods for N = 2..12 modes.
+
+For each N, times dense / krylov / mean_field on the full 2-level basis
+and on a 3-level basis truncated to 2 total excitations. Reports the
+largest occupation error against mean-field, which is exact for
+occupations under the quadratic hopping Hamiltonian.
+
+Run: python benchmarks/quantum/bench_multimode.py
+"""
+import time
+
+import numpy as np
+
+from pdpbiogen.quantum.multimode import MultiModeEntangler
+
+DENSE_LIMIT = 1024
+CONFIGS = (("levels=2 full", 2, None), ("levels=3 exc<=2", 3, 2))
+
+
+def run(n_modes, levels, max_exc, method):
+    ent = MultiModeEntangler(n_modes, levels, g=1.0, max_excitations=max_exc,
+                             method=method, dt=0.1, n_steps=50)
+    t0 = time.perf_counter()
+    out = ent.evolve(1.0)
+    return (time.perf_counter() - t0) * 1e3, out
+
+
+if __name__ == "__main__":
+    for label, levels, max_exc in CONFIGS:
+        print(label)
+        print(f"{'N':>3} {'dim':>7} {'dense ms':>10} {'krylov ms':>10} {'mf ms':>8} {'max err':>9}")
+        for n in range(2, 13):
+            mf_ms, ref = run(n, levels, max_exc, "mean_field")
+            kr_ms, kr = run(n, levels, max_exc, "krylov")
+            dim = kr["dim"]
+            if dim <= DENSE_LIMIT:
+                de_ms = f"{run(n, levels, max_exc, 'dense')[0]:10.2f}"
+            else:
+                de_ms = f"{'-':>10}"
+            err = np.abs(kr["occupations"] - ref["occupations"]).max()
+            print(f"{n:3d} {dim:7d} {de_ms} {kr_ms:10.2f} {mf_ms:8.2f} {err:9.1e}")
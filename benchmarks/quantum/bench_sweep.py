@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""Benchmark: batched multiplier/rate/perturbation sweeps over a full-body-sized mapper.
+
+Compares a loop of Mapper.collapse() calls (one Mapper per scenario) with
+SweepSimulator in-process and run_sweep over a process pool.
+
+Run: python benchmarks/quantum/bench_sweep.py [n_workers]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+from dpbiogen.quantum import Mapper, SweepSimulator, run_sweep, scenario_grid
+
+N_AGENTS = 40
+N_STEPS = 20
+
+
+def build(multiplier, states, neural, groups):
+    mapper = Mapper(multiplier)
+    agents = mapper.add_agents([f"a{i}" for i in range(len(states))], states, neural)
+    for g in groups:
+        mapper.entangle_group([agents[i] for i in g])
+    return mapper
+
+
+if __name__ == "__main__":
+    n_workers = int(sys.argv[1]) if len(sys.argv) > 1 else os.cpu_count()
+    rs = np.random.RandomState(0)
+    base = rs.randn(N_AGENTS) * 20
+    neural = np.zeros(N_AGENTS, dtype=bool)
+    neural[0] = True
+    groups = [np.arange(N_AGENTS)] + [rs.choice(N_AGENTS, 8, replace=False) for _ in range(5)]
+    grid = scenario_grid(base, np.linspace(1, 300, 100), [1.0], n_perturbations=100,
+                         perturbation_scale=2.0, seed=0)
+    n = len(grid[0])
+    print(f"{n} scenarios x {N_AGENTS} agents, {N_STEPS} full-collapse steps")
+
+    t0 = time.perf_counter()
+    for states, mult in zip(grid[0][:500], grid[1][:500]):
+        mapper = build(mult, states, neural, groups)
+        for _ in range(N_STEPS):
+            mapper.collapse()
+    loop = (time.perf_counter() - t0) * n / 500
+    print(f"Mapper loop (extrapolated) {loop:7.2f} s")
+
+    sim = SweepSimulator.from_mapper(build(100.0, base, neural, groups))
+    for label, workers in (("SweepSimulator, 1 process", 1), (f"run_sweep, {n_workers} workers", n_workers)):
+        t0 = time.perf_counter()
+        run_sweep(sim, *grid, n_steps=N_STEPS, n_workers=workers, chunk_size=1000)
+        print(f"{label:26s} {time.perf_counter() - t0:7.2f} s")
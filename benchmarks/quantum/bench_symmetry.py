@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""Benchmark: eigh + pdist(mahalanobis) vs SymmetryOptimizer on streaming windows.
+
+pdist's mahalanobis metric cannot be used on an n x n matrix directly (the
+row covariance is singular), so the legacy path is given a pseudo-inverse.
+
+Run: python benchmarks/quantum/bench_symmetry.py
+"""
+import time
+
+import numpy as np
+from scipy.linalg import eigh
+from scipy.spatial.distance import pdist
+
+from pdpbiogen.quantum.mapper import SymmetryOptimizer
+
+N_WIN = 20
+
+
+def windows(n, width=1024, step=64, seed=0):
+    rs = np.random.RandomState(seed)
+    sig = rs.randn(n, width + step * N_WIN)
+    offset = 0.5 * rs.rand(n, n)
+    for k in range(N_WIN):
+        x = sig[:, k * step:k * step + width]
+        x = x - x.mean(axis=1, keepdims=True)
+        yield x @ x.T / (width - 1) + offset
+
+
+def legacy(cov, reg=1e-5):
+    vals, vecs = eigh(cov)
+    symmetric = vecs @ np.diag(np.abs(vals) + reg) @ vecs.T
+    vi = np.linalg.pinv(np.cov(symmetric.T), hermitian=True)
+    return symmetric, 1 - np.mean(pdist(symmetric, metric="mahalanobis", VI=vi))
+
+
+def timed(fn, covs):
+    t0 = time.perf_counter()
+    for c in covs:
+        fn(c)
+    return (time.perf_counter() - t0) / len(covs) * 1e3
+
+
+if __name__ == "__main__":
+    for n in (64, 128, 256):
+        covs = list(windows(n))
+        cold = SymmetryOptimizer(max_iter=50, warm_start=False)
+        warm = SymmetryOptimizer(max_iter=50, warm_start=True)
+        t_legacy = timed(legacy, covs)
+        t_cold = timed(cold.optimize, covs)
+        t_warm = timed(warm.optimize, covs)
+        print(f"n={n:4d}  eigh+pdist {t_legacy:8.2f} ms  cold {t_cold:8.2f} ms  "
+              f"warm {t_warm:8.2f} ms  ({t_legacy / t_warm:5.1f}x)")
@@ -1,4 +1,8 @@
 # dpbiogen/quantum/__init__.py
 from .mapper import Agent, Entangler, Mapper
+from .arrays import AgentView, ArrayEntangler, ArrayMapper
+from .consensus import ConsensusSolver
+from .sweep import SweepSimulator, run_sweep, scenario_grid
 
-__all__ = ["Agent", "Entangler", "Mapper"]
+__all__ = ["Agent", "Entangler", "Mapper", "AgentView", "ArrayEntangler", "ArrayMapper", "ConsensusSolver",
+           "SweepSimulator", "run_sweep", "scenario_grid"]
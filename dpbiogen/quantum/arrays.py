@@ -0,0 +1,248 @@
+# dpbiogen/quantum/arrays.py
+"""
+Array-backed variant of the quantum-inspired symmetry mapper.
+
+- AgentArray: agent names, states and neural flags in growable NumPy arrays
+- GroupIndex: entanglement groups as a CSR index (indptr + member indices)
+- ArrayEntangler: collapse_symmetry as segmented reductions (np.add.reduceat)
+- ArrayMapper: same API as Mapper; add_agent returns an AgentView, a thin
+  Agent-compatible view onto one row of the arrays
+
+Entangler.collapse_symmetry processes groups in order, so when groups
+overlap, a later group sees the states already written by earlier groups.
+To reproduce this exactly, groups are split into layers. A group's layer is
+one more than the highest layer of any earlier group it shares an agent
+with. Groups in the same layer are then disjoint, and each layer collapses
+in one vectorized pass. Disjoint groups (the common case) all fall in a
+single layer.
+
+collapse_consensus is the order-independent alternative for overlapping
+groups (see consensus.py).
+"""
+
+import numpy as np
+
+from .consensus import ConsensusSolver
+from .mapper import Agent
+
+
+class AgentArray:
+    """Growable columnar storage for agent name/state/is_neural."""
+
+    def __init__(self, capacity: int = 1024):
+        self.names: list[str] = []
+        self._states = np.zeros(capacity)
+        self._neural = np.zeros(capacity, dtype=bool)
+        self.size = 0
+
+    def _reserve(self, n: int):
+        if n > len(self._states):
+            cap = max(n, 2 * len(self._states))
+            self._states = np.resize(self._states, cap)
+            self._neural = np.resize(self._neural, cap)
+
+    def append(self, names, states, is_neural) -> np.ndarray:
+        """Append agents in bulk; returns their row indices."""
+        names = list(names)
+        states = np.asarray(states, dtype=float).ravel()
+        is_neural = np.asarray(is_neural, dtype=bool)
+        if is_neural.ndim == 0:
+            is_neural = np.broadcast_to(is_neural, states.shape)
+        if not len(names) == len(states) == len(is_neural):
+            raise ValueError(
+                f"names, states and is_neural differ in length: "
+                f"{len(names)}, {len(states)}, {len(is_neural)}")
+        start, stop = self.size, self.size + len(states)
+        self._reserve(stop)
+        self._states[start:stop] = states
+        self._neural[start:stop] = is_neural
+        self.names.extend(names)
+        self.size = stop
+        return np.arange(start, stop)
+
+    @property
+    def states(self) -> np.ndarray:
+        return self._states[:self.size]
+
+    @property
+    def neural(self) -> np.ndarray:
+        return self._neural[:self.size]
+
+
+class GroupIndex:
+    """CSR index of entanglement groups: members of group k are indices[indptr[k]:indptr[k+1]]."""
+
+    def __init__(self):
+        self._chunks: list[np.ndarray] = []
+        self._indptr = np.zeros(1, dtype=np.int64)
+        self._indices = np.zeros(0, dtype=np.int64)
+        self._layers = None
+
+    @classmethod
+    def from_csr(cls, indptr, indices):
+        groups = cls()
+        groups._indptr = np.asarray(indptr, dtype=np.int64)
+        groups._indices = np.asarray(indices, dtype=np.int64)
+        return groups
+
+    def add(self, members):
+        members = np.asarray(members, dtype=np.int64).ravel()
+        if len(members) > 1:
+            self._chunks.append(members)
+            self._layers = None
+
+    def _flush(self):
+        if self._chunks:
+            lengths = [len(c) for c in self._chunks]
+            self._indptr = np.concatenate([self._indptr, self._indptr[-1] + np.cumsum(lengths)])
+            self._indices = np.concatenate([self._indices] + self._chunks)
+            self._chunks = []
+
+    @property
+    def indptr(self) -> np.ndarray:
+        self._flush()
+        return self._indptr
+
+    @property
+    def indices(self) -> np.ndarray:
+        self._flush()
+        return self._indices
+
+    def __len__(self) -> int:
+        return len(self.indptr) - 1
+
+    def members(self, k: int) -> np.ndarray:
+        return self.indices[self.indptr[k]:self.indptr[k + 1]]
+
+    def layers(self, n_agents: int) -> list[np.ndarray]:
+        """Group ids split into layers of mutually disjoint groups (cached until groups change)."""
+        if self._layers is None:
+            indptr, indices = self.indptr, self.indices
+            if not len(indices) or np.bincount(indices, minlength=n_agents).max() <= 1:
+                self._layers = [np.arange(len(self))] if len(self) else []
+                return self._layers
+            last = np.full(n_agents, -1, dtype=np.int64)
+            layer_of = np.empty(len(self), dtype=np.int64)
+            for k in range(len(self)):
+                members = indices[indptr[k]:indptr[k + 1]]
+                layer = last[members].max() + 1
+                last[members] = layer
+                layer_of[k] = layer
+            order = np.argsort(layer_of, kind="stable")
+            splits = np.flatnonzero(np.diff(layer_of[order])) + 1
+            self._layers = np.split(order, splits) if len(order) else []
+        return self._layers
+
+
+class ArrayEntangler:
+    """Weighted-average collapse over a GroupIndex, vectorized per layer."""
+
+    def __init__(self, agents: AgentArray, neural_weight_multiplier: float = 100.0):
+        self.agents = agents
+        self.groups = GroupIndex()
+        self.neural_weight_multiplier = neural_weight_multiplier
+        self.solver = ConsensusSolver()
+
+    def _weights(self) -> np.ndarray:
+        return np.where(self.agents.neural, self.neural_weight_multiplier, 1.0)
+
+    def entangle(self, members):
+        self.groups.add(members)
+
+    def collapse_symmetry(self):
+        states = self.agents.states
+        weights = self._weights()
+        indptr, indices = self.groups.indptr, self.groups.indices
+        for layer in self.groups.layers(self.agents.size):
+            starts, stops = indptr[layer], indptr[layer + 1]
+            lengths = stops - starts
+            # Member indices of this layer's groups, concatenated group by group
+            offsets = np.repeat(starts - np.concatenate([[0], np.cumsum(lengths)[:-1]]), lengths)
+            members = indices[np.arange(lengths.sum()) + offsets]
+            seg = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+            w = weights[members]
+            total = np.add.reduceat(w, seg)
+            weighted = np.add.reduceat(w * states[members], seg)
+            ok = total != 0
+            target = np.divide(weighted, total, out=np.zeros_like(weighted), where=ok)
+            keep = np.repeat(ok, lengths)
+            states[members[keep]] = np.repeat(target, lengths)[keep]
+
+    def collapse_consensus(self):
+        """Replace states with the weighted-consensus solution of ``self.solver``."""
+        states = self.agents.states
+        states[:] = self.solver.solve(states, self._weights(), self.groups.indptr, self.groups.indices)
+
+
+class AgentView(Agent):
+    """Agent-compatible view of one row of an AgentArray."""
+
+    __slots__ = ("_store", "_index")
+
+    def __init__(self, store: AgentArray, index: int):
+        self._store = store
+        self._index = index
+
+    @property
+    def name(self) -> str:
+        return self._store.names[self._index]
+
+    @property
+    def state(self) -> float:
+        return float(self._store.states[self._index])
+
+    @state.setter
+    def state(self, value: float):
+        self._store.states[self._index] = value
+
+    @property
+    def is_neural(self) -> bool:
+        return bool(self._store.neural[self._index])
+
+    @is_neural.setter
+    def is_neural(self, value: bool):
+        self._store.neural[self._index] = value
+
+
+class ArrayMapper:
+    """Drop-in Mapper backed by AgentArray/ArrayEntangler."""
+
+    def __init__(self, neural_weight_multiplier: float = 100.0):
+        self.store = AgentArray()
+        self.entangler = ArrayEntangler(self.store, neural_weight_multiplier)
+
+    @property
+    def agents(self) -> list[AgentView]:
+        return [AgentView(self.store, i) for i in range(self.store.size)]
+
+    @property
+    def states(self) -> np.ndarray:
+        return self.store.states
+
+    def add_agent(self, name: str, initial_state: float = 0.0, is_neural: bool = False) -> AgentView:
+        index = self.store.append([name], [initial_state], is_neural)[0]
+        return AgentView(self.store, int(index))
+
+    def add_agents(self, names, states, is_neural=False) -> np.ndarray:
+        """Bulk add; returns the new agents' indices (usable with entangle_group)."""
+        return self.store.append(names, states, is_neural)
+
+    def entangle_group(self, agents):
+        """Entangle AgentViews from this mapper, or an array of agent indices."""
+        if len(agents) and isinstance(agents[0], AgentView):
+            agents = [a._index for a in agents]
+        self.entangler.entangle(agents)
+
+    def collapse(self):
+        self.entangler.collapse_symmetry()
+
+    def collapse_consensus(self):
+        """Order-independent collapse for overlapping groups (ConsensusSolver)."""
+        self.entangler.collapse_consensus()
+
+    def print_states(self):
+        for a in self.agents:
+            print(a)
+
+    def bio_deviation(self) -> float:
+        return float(np.abs(self.store.states[~self.store.neural]).sum())
@@ -24,7 +24,7 @@ Optionally: python full_body_demo.py path/to/real_heart_data.csv
 
 import sys
 from mapper import Mapper
-from utils import load_initial_states_from_csv  # New loader utility
+from utils import load_agent_columns_from_csv  # New loader utility
 
 if __name__ == "__main__":
     # Optional: Load real heart data from CSV if provided as arg
@@ -50,10 +50,8 @@ if __name__ == "__main__":
     # Heart/cardiovascular subsystem agents (from heart_demo, with more added)
     if real_heart_csv:
         print(f"Loading real heart data from {real_heart_csv}...")
-        real_states = load_initial_states_from_csv(real_heart_csv)
-        heart_agents = []
-        for name, state in real_states.items():
-            heart_agents.append(mapper.add_agent(name, initial_state=state))
+        names, states = load_agent_columns_from_csv(real_heart_csv)
+        heart_agents = mapper.add_agents(names, states)
     else:
         heart_agents = [
             mapper.add_agent("Heart-Rate-Variability", 25.0),
@@ -13,6 +13,8 @@ biological system to near-zero deviation — simulating non-local, 50-ms latency
 """
 
 class Agent:
+    __slots__ = ("name", "state", "is_neural")
+
     def __init__(self, name: str, initial_state: float = 0.0, is_neural: bool = False):
         self.name = name
         self.state = float(initial_state)
@@ -66,6 +68,26 @@ class Mapper:
         self.agents.append(agent)
         return agent
 
+    def add_agents(self, names, states, is_neural=False) -> list[Agent]:
+        """Bulk add_agent: ``states`` and ``is_neural`` may be sequences or NumPy arrays
+        (``is_neural`` may also be a single bool for all agents). Raises ValueError,
+        without adding anything, if the lengths differ."""
+        names = list(names)
+        states = states.tolist() if hasattr(states, "tolist") else list(states)
+        if hasattr(is_neural, "tolist"):
+            is_neural = is_neural.tolist()
+        if isinstance(is_neural, (bool, int)):
+            is_neural = [bool(is_neural)] * len(names)
+        else:
+            is_neural = list(is_neural)
+        if not len(names) == len(states) == len(is_neural):
+            raise ValueError(
+                f"names, states and is_neural differ in length: "
+                f"{len(names)}, {len(states)}, {len(is_neural)}")
+        agents = list(map(Agent, names, states, is_neural))
+        self.agents.extend(agents)
+        return agents
+
     def entangle_group(self, agents: list[Agent]):
         self.entangler.entangle(agents)
 
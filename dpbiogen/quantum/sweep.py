@@ -0,0 +1,146 @@
+# dpbiogen/quantum/sweep.py
+"""
+Time-stepped collapse over many scenarios at once.
+
+A scenario is one Mapper configuration: initial agent states, a
+neural_weight_multiplier and a partial-collapse rate. All scenarios share
+the same agents and entanglement groups, so states are stored as one
+(scenarios x agents) array. A step moves every group toward its weighted
+target:
+
+    x_a <- x_a + rate * (target_g - x_a)
+
+rate = 1 reproduces Mapper.collapse() exactly, including group order for
+overlapping groups (groups are applied in the disjoint layers from
+GroupIndex.layers). Smaller rates give a gradual, multi-step relaxation.
+
+run_sweep splits large sweeps into scenario chunks and runs them in a
+process pool. The chunks are independent, so results are identical to a
+single-process run.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+
+import numpy as np
+
+from .arrays import ArrayMapper, GroupIndex
+
+
+def scenario_grid(base_states, multipliers, rates=(1.0,), n_perturbations=1,
+                  perturbation_scale=0.0, seed=None):
+    """Cartesian product of multipliers x rates x perturbation draws.
+
+    Returns (states (S, A), multipliers (S,), rates (S,)). Each perturbation
+    draw adds Gaussian noise with std ``perturbation_scale`` to the base states.
+    """
+    base = np.asarray(base_states, dtype=float)
+    rng = np.random.default_rng(seed)
+    combos = list(product(multipliers, rates, range(n_perturbations)))
+    states = np.repeat(base[None, :], len(combos), axis=0)
+    if perturbation_scale:
+        states += rng.normal(0.0, perturbation_scale, size=states.shape)
+    mult = np.array([c[0] for c in combos], dtype=float)
+    rate = np.array([c[1] for c in combos], dtype=float)
+    return states, mult, rate
+
+
+class SweepSimulator:
+    """Batched partial collapse over a fixed agent set and group index."""
+
+    def __init__(self, indptr, indices, neural):
+        self.neural = np.asarray(neural, dtype=bool)
+        groups = GroupIndex.from_csr(indptr, indices)
+        self._layers = []
+        for layer in groups.layers(len(self.neural)):
+            members = np.concatenate([groups.members(k) for k in layer])
+            lengths = np.diff(groups.indptr)[layer]
+            seg = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+            self._layers.append((members, seg, lengths))
+
+    @classmethod
+    def from_mapper(cls, mapper):
+        """Build from an ArrayMapper or a plain Mapper (agents, groups and neural flags)."""
+        if isinstance(mapper, ArrayMapper):
+            groups = mapper.entangler.groups
+            return cls(groups.indptr, groups.indices, mapper.store.neural.copy())
+        index = {id(a): i for i, a in enumerate(mapper.agents)}
+        groups = [[index[id(a)] for a in g] for g in mapper.entangler.groups]
+        indptr = np.concatenate([[0], np.cumsum([len(g) for g in groups])])
+        indices = np.array([i for g in groups for i in g], dtype=np.int64)
+        return cls(indptr, indices, [a.is_neural for a in mapper.agents])
+
+    def weights(self, multipliers):
+        """Per-scenario agent weights, shape (S, A)."""
+        mult = np.asarray(multipliers, dtype=float)[:, None]
+        return np.where(self.neural[None, :], mult, 1.0)
+
+    def step(self, states, weights, rates):
+        """One partial collapse of every group, in place on ``states`` (S, A)."""
+        rates = np.asarray(rates, dtype=float)[:, None]
+        for members, seg, lengths in self._layers:
+            x = states[:, members]
+            w = weights[:, members]
+            total = np.add.reduceat(w, seg, axis=1)
+            weighted = np.add.reduceat(w * x, seg, axis=1)
+            ok = total != 0
+            target = np.divide(weighted, total, out=np.zeros_like(weighted), where=ok)
+            delta = np.repeat(target, lengths, axis=1) - x
+            delta *= np.repeat(ok, lengths, axis=1)  # zero-weight groups are skipped
+            x += rates * delta
+            states[:, members] = x
+        return states
+
+    def bio_deviation(self, states):
+        return np.abs(states[:, ~self.neural]).sum(axis=1)
+
+    def run(self, states, multipliers, rates=1.0, n_steps=1, hold_neural=False):
+        """Simulate ``n_steps`` partial collapses for every scenario.
+
+        ``hold_neural`` clamps neural agents to their initial states after
+        each step (sustained intent rather than a one-off measurement).
+        Returns {'states': final (S, A), 'bio_deviation': (S, n_steps + 1)}.
+        """
+        states = np.array(states, dtype=float, ndmin=2)
+        n = len(states)
+        multipliers = np.broadcast_to(np.asarray(multipliers, dtype=float), (n,))
+        rates = np.broadcast_to(np.asarray(rates, dtype=float), (n,))
+        weights = self.weights(multipliers)
+        held = states[:, self.neural].copy() if hold_neural else None
+        deviation = np.empty((n, n_steps + 1))
+        deviation[:, 0] = self.bio_deviation(states)
+        for t in range(1, n_steps + 1):
+            self.step(states, weights, rates)
+            if held is not None:
+                states[:, self.neural] = held
+            deviation[:, t] = self.bio_deviation(states)
+        return {'states': states, 'bio_deviation': deviation}
+
+
+def _run_chunk(args):
+    sim, states, multipliers, rates, n_steps, hold_neural = args
+    return sim.run(states, multipliers, rates, n_steps, hold_neural)
+
+
+def run_sweep(sim, states, multipliers, rates=1.0, n_steps=1, hold_neural=False,
+              n_workers=None, chunk_size=1024):
+    """SweepSimulator.run split into ``chunk_size`` scenario chunks over a process pool.
+
+    ``n_workers=1`` (or a sweep that fits in one chunk) runs in-process;
+    ``None`` lets ProcessPoolExecutor pick the CPU count.
+    """
+    states = np.asarray(states, dtype=float)
+    n = len(states)
+    multipliers = np.broadcast_to(np.asarray(multipliers, dtype=float), (n,))
+    rates = np.broadcast_to(np.asarray(rates, dtype=float), (n,))
+    if n_workers == 1 or n <= chunk_size:
+        return sim.run(states, multipliers, rates, n_steps, hold_neural)
+    bounds = range(0, n, chunk_size)
+    jobs = [(sim, states[i:i + chunk_size], multipliers[i:i + chunk_size],
+             rates[i:i + chunk_size], n_steps, hold_neural) for i in bounds]
+    with ProcessPoolExecutor(max_workers=n_workers) as pool:
+        results = list(pool.map(_run_chunk, jobs))
+    return {
+        'states': np.concatenate([r['states'] for r in results]),
+        'bio_deviation': np.concatenate([r['bio_deviation'] for r in results]),
+    }
@@ -4,7 +4,7 @@ Utility functions for the quantum module, e.g., loading agent states from data f
 """
 
 import csv
-from typing import Dict
+from typing import Dict, List, Tuple
 
 def load_initial_states_from_csv(file_path: str) -> Dict[str, float]:
     """
@@ -29,3 +29,23 @@ def load_initial_states_from_csv(file_path: str) -> Dict[str, float]:
                 except ValueError:
                     print(f"Warning: Invalid state for {name}: {state_str} — skipping.")
     return states
+
+
+def load_agent_columns_from_csv(file_path: str) -> Tuple[List[str], List[float]]:
+    """
+    Same format and skipping rules as load_initial_states_from_csv, but returns
+    parallel (names, states) lists for Mapper.add_agents instead of building a dict.
+    Duplicate names are kept as separate rows.
+    """
+    names, states = [], []
+    with open(file_path, mode='r') as csvfile:
+        for row in csv.reader(csvfile):
+            if len(row) == 2:
+                name, state_str = row
+                try:
+                    states.append(float(state_str))
+                except ValueError:
+                    print(f"Warning: Invalid state for {name}: {state_str} — skipping.")
+                    continue
+                names.append(name.strip())
+    return names, states
@@ -1 +1 @@
-from .core import PDPBioGen
+"""Core orchestration: domain dispatch, integration and I/O helpers."""
@@ -0,0 +1,19 @@
+class AgentSystem:
+    """Placeholder agent layer: scores a combined multi-domain output."""
+
+    def step(self, combined: dict) -> dict:
+        """Run one agent step; score is the fraction of domains with a non-empty output."""
+        domains = combined.get("domains", {})
+        if not domains:
+            return {"score": 0.0, "n_domains": 0}
+        populated = sum(1 for out in domains.values() if out)
+        return {"score": populated / len(domains), "n_domains": len(domains)}
+
+    async def astep(self, combined: dict) -> dict:
+        """Coroutine form of ``step`` used by ``Integrator.arun``.
+
+        The default scoring is CPU-only, so it runs inline. Agents that call out
+        to model servers should override this with a native async client so
+        many subjects can await their responses concurrently.
+        """
+        return self.step(combined)
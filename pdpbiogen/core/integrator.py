@@ -1,3 +1,7 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+
 from pdpbiogen.core.domain_manager import DomainManager
 from pdpbiogen.core.agent_system import AgentSystem
 from pdpbiogen.validation.validators import validate_combined_output
@@ -6,24 +10,121 @@ class Integrator:
     """
     Simple orchestrator: load domain data, dispatch to mappers, collect outputs,
     run an agent step, then validate.
+
+    ``hooks`` is a list of objects implementing ``before_stage``/``after_stage``
+    (see ``pdpbiogen.core.profiling.StageHook``), called around each stage.
+    ``validator`` replaces validate_combined_output, e.g. with
+    ``sampled_combined_validator(n)`` for batch runs.
+
+    ``arun``/``arun_many`` are the asyncio variants: domain mapping is pushed
+    to an executor (thread or process pool) while agent steps are awaited
+    via ``AgentSystem.astep``, at most ``max_concurrency`` at a time.
     """
-    def __init__(self, domain_manager: DomainManager = None, agent_system: AgentSystem = None):
+    def __init__(self, domain_manager: DomainManager = None, agent_system: AgentSystem = None,
+                 hooks: list = None, validator=None):
         self.domain_manager = domain_manager or DomainManager()
         self.agent_system = agent_system or AgentSystem()
+        self.validator = validator or validate_combined_output
+        self.hooks = list(hooks or [])
 
-    def run(self, inputs: dict) -> dict:
-        """Run end-to-end pipeline on a dict of domain inputs."""
+    def add_hook(self, hook):
+        self.hooks.append(hook)
+        return hook
+
+    def _before(self, stage, domain=None, payload=None):
+        for hook in self.hooks:
+            hook.before_stage(stage, domain, payload)
+
+    def _after(self, stage, domain=None, output=None):
+        for hook in self.hooks:
+            hook.after_stage(stage, domain, output)
+
+    @contextmanager
+    def _stage(self, stage, domain=None, payload=None):
+        """Call before_stage, and stage_failed if the body raises.
+
+        after_stage is left to the caller, once the stage output exists.
+        """
+        self._before(stage, domain, payload)
+        try:
+            yield
+        except BaseException as exc:
+            for hook in self.hooks:
+                # hooks written before stage_failed existed only define before/after
+                failed = getattr(hook, "stage_failed", None)
+                if failed is not None:
+                    failed(stage, domain, exc)
+            raise
+
+    def _map_domains(self, inputs: dict) -> dict:
         outputs = {}
         for domain, payload in inputs.items():
-            map_out = self.domain_manager.map(domain, payload)
+            with self._stage("map", domain, payload):
+                map_out = self.domain_manager.map(domain, payload)
+            self._after("map", domain, map_out)
             outputs[domain] = map_out
+        return outputs
 
-        # Combine domain outputs (simple merge for demo)
-        combined = {"domains": outputs}
-        # run one agent step (placeholder)
-        agent_result = self.agent_system.step(combined)
+    def _finish(self, combined: dict, agent_result: dict) -> dict:
         result = {"combined": combined, "agent": agent_result}
 
         # Validate result
-        validate_combined_output(result)
+        with self._stage("validate", payload=result):
+            self.validator(result)
+        self._after("validate")
         return result
+
+    def run(self, inputs: dict) -> dict:
+        """Run end-to-end pipeline on a dict of domain inputs."""
+        outputs = self._map_domains(inputs)
+
+        # Combine domain outputs (simple merge for demo)
+        combined = {"domains": outputs}
+        # run one agent step (placeholder)
+        with self._stage("agent", payload=combined):
+            agent_result = self.agent_system.step(combined)
+        self._after("agent", output=agent_result)
+        return self._finish(combined, agent_result)
+
+    async def arun(self, inputs: dict, executor=None, semaphore: asyncio.Semaphore = None) -> dict:
+        """Async pipeline: map in ``executor``, then await the agent step.
+
+        With a ProcessPoolExecutor, mapping runs in a worker process and map
+        stage hooks are not called (they would fire in the child).
+        """
+        loop = asyncio.get_running_loop()
+        if isinstance(executor, ProcessPoolExecutor):
+            outputs = await loop.run_in_executor(executor, map_domains, self.domain_manager, inputs)
+        else:
+            outputs = await loop.run_in_executor(executor, self._map_domains, inputs)
+
+        combined = {"domains": outputs}
+        if semaphore is None:
+            agent_result = await self._astep(combined)
+        else:
+            async with semaphore:
+                agent_result = await self._astep(combined)
+        return self._finish(combined, agent_result)
+
+    async def _astep(self, combined: dict) -> dict:
+        # hooks run once the semaphore is held, so "agent" excludes queue wait
+        with self._stage("agent", payload=combined):
+            agent_result = await self.agent_system.astep(combined)
+        self._after("agent", output=agent_result)
+        return agent_result
+
+    async def arun_many(self, subjects, max_concurrency: int = 8, executor=None) -> list:
+        """Run many subjects concurrently; results keep the input order.
+
+        ``max_concurrency`` bounds the number of agent steps in flight. Time
+        spent waiting for a slot is not part of the "agent" stage.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        return await asyncio.gather(
+            *(self.arun(inputs, executor=executor, semaphore=semaphore) for inputs in subjects)
+        )
+
+
+def map_domains(domain_manager: DomainManager, inputs: dict) -> dict:
+    """Map every domain payload; module-level so process pools can pickle it."""
+    return {domain: domain_manager.map(domain, payload) for domain, payload in inputs.items()}
@@ -0,0 +1,161 @@
+"""Stage hooks and a built-in profiler for the Integrator pipeline.
+
+Integrator.run goes through three stages per subject:
+
+- "map"      once per domain (``domain`` is set)
+- "agent"    the AgentSystem step over the combined output
+- "validate" validate_combined_output on the final result
+
+Hooks receive ``before_stage(stage, domain, payload)`` before each stage and
+``after_stage(stage, domain, output)`` after it. If the stage raises,
+``stage_failed(stage, domain, error)`` is called instead of ``after_stage``
+and the exception propagates. ``StageHook`` provides no-op defaults so hooks
+only override what they need.
+"""
+
+import asyncio
+import json
+import sys
+import threading
+import time
+
+import numpy as np
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# ru_maxrss is reported in bytes on macOS and in kilobytes elsewhere
+_RSS_UNIT = 1 if sys.platform == "darwin" else 1024
+
+
+class StageHook:
+    """Base class for Integrator stage callbacks."""
+
+    def before_stage(self, stage, domain=None, payload=None):
+        pass
+
+    def after_stage(self, stage, domain=None, output=None):
+        pass
+
+    def stage_failed(self, stage, domain=None, error=None):
+        pass
+
+
+def peak_rss_bytes():
+    """Peak resident set size of this process so far, in bytes (0 if unknown)."""
+    if resource is None:
+        return 0
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * _RSS_UNIT
+
+
+def _context_key():
+    """Identify the running thread/task so concurrent subjects don't share timers."""
+    try:
+        task = asyncio.current_task()
+    except RuntimeError:
+        task = None
+    return threading.get_ident(), id(task) if task is not None else None
+
+
+def payload_nbytes(obj):
+    """Approximate in-memory size of a payload (arrays by nbytes, containers recursively)."""
+    if isinstance(obj, np.ndarray):
+        return int(obj.nbytes)
+    if isinstance(obj, (bytes, bytearray, str)):
+        return len(obj)
+    if isinstance(obj, dict):
+        return sum(payload_nbytes(k) + payload_nbytes(v) for k, v in obj.items())
+    if isinstance(obj, (list, tuple)):
+        return sum(payload_nbytes(v) for v in obj)
+    return sys.getsizeof(obj)
+
+
+class StageProfiler(StageHook):
+    """Records wall time, CPU time, peak-RSS delta and payload sizes per stage.
+
+    Peak RSS is a high-water mark, so ``peak_rss_delta_bytes`` is non-zero only
+    for stages that pushed the process to a new peak. Open timers are keyed by
+    thread and asyncio task, so the profiler can observe ``Integrator.arun_many``.
+    """
+
+    def __init__(self, measure_payloads=True):
+        self.measure_payloads = measure_payloads
+        self.records = []
+        self._open = {}
+
+    def before_stage(self, stage, domain=None, payload=None):
+        self._open[(_context_key(), stage, domain)] = (
+            time.perf_counter(),
+            time.process_time(),
+            peak_rss_bytes(),
+            payload_nbytes(payload) if self.measure_payloads and payload is not None else 0,
+        )
+
+    def after_stage(self, stage, domain=None, output=None):
+        self._record(stage, domain, output, None)
+
+    def stage_failed(self, stage, domain=None, error=None):
+        self._record(stage, domain, None, error)
+
+    def _record(self, stage, domain, output, error):
+        wall0, cpu0, rss0, in_bytes = self._open.pop((_context_key(), stage, domain))
+        self.records.append({
+            "stage": stage,
+            "domain": domain,
+            "wall_s": time.perf_counter() - wall0,
+            "cpu_s": time.process_time() - cpu0,
+            "peak_rss_delta_bytes": max(0, peak_rss_bytes() - rss0),
+            "input_bytes": in_bytes,
+            "output_bytes": payload_nbytes(output) if self.measure_payloads and output is not None else 0,
+            "error": type(error).__name__ if error is not None else None,
+        })
+
+    def reset(self):
+        self.records = []
+        self._open = {}
+
+    def summary(self):
+        """Aggregate records per (stage, domain)."""
+        agg = {}
+        for r in self.records:
+            key = (r["stage"], r["domain"])
+            s = agg.setdefault(key, {
+                "stage": r["stage"], "domain": r["domain"], "count": 0,
+                "wall_s": 0.0, "cpu_s": 0.0, "peak_rss_delta_bytes": 0,
+                "input_bytes": 0, "output_bytes": 0, "errors": 0,
+            })
+            s["count"] += 1
+            s["errors"] += r["error"] is not None
+            s["wall_s"] += r["wall_s"]
+            s["cpu_s"] += r["cpu_s"]
+            s["peak_rss_delta_bytes"] = max(s["peak_rss_delta_bytes"], r["peak_rss_delta_bytes"])
+            s["input_bytes"] += r["input_bytes"]
+            s["output_bytes"] += r["output_bytes"]
+        return list(agg.values())
+
+    def to_json(self, indent=2):
+        return json.dumps({"records": self.records, "summary": self.summary()}, indent=indent)
+
+    def to_prometheus(self, prefix="pdpbiogen_stage"):
+        """Render the summary in the Prometheus text exposition format."""
+        metrics = [
+            ("count", "counter", "Number of stage executions"),
+            ("errors", "counter", "Number of stage executions that raised"),
+            ("wall_s", "counter", "Total wall-clock seconds"),
+            ("cpu_s", "counter", "Total process CPU seconds"),
+            ("peak_rss_delta_bytes", "gauge", "Largest peak-RSS increase in bytes"),
+            ("input_bytes", "counter", "Total input payload bytes"),
+            ("output_bytes", "counter", "Total output payload bytes"),
+        ]
+        summary = self.summary()
+        lines = []
+        for field, kind, help_text in metrics:
+            name = f"{prefix}_{field}"
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for s in summary:
+                labels = f'stage="{s["stage"]}",domain="{s["domain"] or ""}"'
+                lines.append(f"{name}{{{labels}}} {s[field]}")
+        return "\n".join(lines) + "\n"
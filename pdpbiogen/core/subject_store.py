@@ -0,0 +1,193 @@
+"""Columnar on-disk store for multi-domain subject payloads.
+
+Layout of a subject directory::
+
+    subject/
+        manifest.json      # format version, domains, files, row counts
+        neural.arrow       # Arrow IPC file, one per domain
+        genomic.arrow
+        metabolic.arrow
+
+Arrow IPC (uncompressed) is used rather than Parquet because it can be
+memory-mapped and read without decoding: ``load_subject`` returns payloads
+whose arrays are views over the mapped files, so opening a large subject
+costs page faults rather than a JSON parse.
+
+Payloads keep the shape the domain mappers already expect:
+
+- neural:    {"signals": [array, ...]}          one NumPy view per channel
+- genomic:   {"variants": <sequence of dicts>}  rows materialized on access
+- metabolic: {"measures": <mapping name -> value>}  ``as_array()`` gives the column
+"""
+
+from collections.abc import Mapping, Sequence
+from pathlib import Path
+
+import numpy as np
+
+from pdpbiogen.core.utils import load_json, save_json
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as pa_ipc
+except ImportError:
+    pa = None
+    pa_ipc = None
+
+FORMAT_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise ImportError("The columnar subject store requires pyarrow (pip install pyarrow)")
+
+
+# ---------------------
+# Zero-copy payload views
+# ---------------------
+class VariantRecords(Sequence):
+    """Read-only sequence of variant dicts backed by an Arrow table."""
+
+    def __init__(self, table):
+        self.table = table
+
+    def __len__(self):
+        return self.table.num_rows
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self[i] for i in range(*idx.indices(len(self)))]
+        if idx < 0:
+            idx += len(self)
+        if not 0 <= idx < len(self):
+            raise IndexError("variant index out of range")
+        return self.table.slice(idx, 1).to_pylist()[0]
+
+    def __iter__(self):
+        for batch in self.table.to_batches():
+            yield from batch.to_pylist()
+
+    def batches(self, batch_size):
+        """Yield lists of variant dicts, as consumed by GenomicMapper.map_batches."""
+        for batch in self.table.to_batches(max_chunksize=batch_size):
+            yield batch.to_pylist()
+
+
+class MeasureMapping(Mapping):
+    """Read-only metabolite mapping backed by name/value columns."""
+
+    def __init__(self, names, values):
+        self._names = names
+        self._values = values
+        self._index = None
+
+    def __len__(self):
+        return len(self._values)
+
+    def __iter__(self):
+        return iter(self._names)
+
+    def __getitem__(self, key):
+        if self._index is None:
+            self._index = {name: i for i, name in enumerate(self._names)}
+        return float(self._values[self._index[key]])
+
+    def as_array(self):
+        """The value column as a read-only float64 array, in key order."""
+        return self._values
+
+
+# ---------------------
+# Per-domain encoders / decoders
+# ---------------------
+def _encode_neural(payload):
+    signals = payload.get("signals", [])
+    arr = pa.array([np.asarray(s, dtype=np.float64) for s in signals], type=pa.list_(pa.float64()))
+    return pa.table({"signals": arr})
+
+
+def _decode_neural(table):
+    col = table.column("signals").combine_chunks()
+    values = col.values.to_numpy(zero_copy_only=True)
+    offsets = col.offsets.to_numpy(zero_copy_only=True)
+    signals = [values[offsets[i]:offsets[i + 1]] for i in range(len(col))]
+    return {"signals": signals}
+
+
+def _encode_genomic(payload):
+    variants = payload.get("variants", [])
+    return pa.table({
+        "chr": pa.array([str(v.get("chr")) for v in variants], type=pa.string()),
+        "pos": pa.array([v.get("pos") for v in variants], type=pa.int64()),
+        "ref": pa.array([v.get("ref") for v in variants], type=pa.string()),
+        "alt": pa.array([v.get("alt") for v in variants], type=pa.string()),
+    })
+
+
+def _decode_genomic(table):
+    return {"variants": VariantRecords(table)}
+
+
+def _encode_metabolic(payload):
+    measures = payload.get("measures", {})
+    return pa.table({
+        "name": pa.array(list(measures.keys()), type=pa.string()),
+        "value": pa.array(list(measures.values()), type=pa.float64()),
+    })
+
+
+def _decode_metabolic(table):
+    names = table.column("name").to_pylist()
+    values = table.column("value").combine_chunks().to_numpy(zero_copy_only=True)
+    return {"measures": MeasureMapping(names, values)}
+
+
+CODECS = {
+    "neural": (_encode_neural, _decode_neural),
+    "genomic": (_encode_genomic, _decode_genomic),
+    "metabolic": (_encode_metabolic, _decode_metabolic),
+}
+
+
+# ---------------------
+# Public API
+# ---------------------
+def save_subject(path, inputs: dict):
+    """Write a dict of domain payloads as one Arrow IPC file per domain plus a manifest."""
+    _require_pyarrow()
+    root = Path(path)
+    root.mkdir(parents=True, exist_ok=True)
+    domains = {}
+    for domain, payload in inputs.items():
+        if domain not in CODECS:
+            raise ValueError(f"Unknown domain: {domain}")
+        table = CODECS[domain][0](payload)
+        fname = f"{domain}.arrow"
+        with pa_ipc.new_file(str(root / fname), table.schema) as writer:
+            writer.write_table(table)
+        domains[domain] = {"file": fname, "num_rows": table.num_rows}
+    manifest = {"format_version": FORMAT_VERSION, "domains": domains}
+    save_json(root / MANIFEST_NAME, manifest)
+    return manifest
+
+
+def load_subject(path, domains=None) -> dict:
+    """Memory-map a subject directory and return Integrator-ready payloads.
+
+    Returned arrays reference the mapped files; they stay valid for as long
+    as the payloads are referenced.
+    """
+    _require_pyarrow()
+    root = Path(path)
+    manifest = load_json(root / MANIFEST_NAME)
+    if manifest.get("format_version") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported subject store version: {manifest.get('format_version')}")
+    inputs = {}
+    for domain, entry in manifest["domains"].items():
+        if domains is not None and domain not in domains:
+            continue
+        source = pa.memory_map(str(root / entry["file"]), "r")
+        table = pa_ipc.open_file(source).read_all()
+        inputs[domain] = CODECS[domain][1](table)
+    return inputs
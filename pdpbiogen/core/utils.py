@@ -10,5 +10,4 @@ def save_json(path, obj):
     p = Path(path)
     p.parent.mkdir(parents=True, exist_ok=True)
     with p.open("w", encoding="utf-8") as fh:
-
-
+        json.dump(obj, fh, indent=2)
@@ -1,6 +1,44 @@
+from pdpbiogen.modules.genomic.vcf_reader import DEFAULT_BATCH_SIZE, iter_vcf_batches
+
+
 class GenomicMapper:
-    """Simple genomic mapper: counts variants and returns a summary."""
+    """Simple genomic mapper: counts variants and returns a summary.
+
+    Payloads either carry an in-memory ``"variants"`` list, or point at a
+    VCF/BCF file via ``"vcf"`` (plus optional ``"region"`` and
+    ``"batch_size"``), in which case records are streamed in batches and the
+    summary is built incrementally. Both forms return the same keys; an
+    in-memory list counts as a single batch.
+    """
 
     def map(self, payload):
+        if "vcf" in payload:
+            batches = iter_vcf_batches(
+                payload["vcf"],
+                batch_size=payload.get("batch_size", DEFAULT_BATCH_SIZE),
+                region=payload.get("region"),
+            )
+            return self.map_batches(batches)
         variants = payload.get("variants", [])
-        return {"variant_count": len(variants), "top_variant": variants[0] if variants else None
+        return self.map_batches([variants] if len(variants) else [])
+
+    def map_batches(self, batches):
+        """Summarize an iterable of variant batches in constant memory."""
+        count = 0
+        top_variant = None
+        chrom_counts = {}
+        n_batches = 0
+        for batch in batches:
+            n_batches += 1
+            if top_variant is None and batch:
+                top_variant = batch[0]
+            count += len(batch)
+            for v in batch:
+                chrom = v.get("chr")
+                chrom_counts[chrom] = chrom_counts.get(chrom, 0) + 1
+        return {
+            "variant_count": count,
+            "top_variant": top_variant,
+            "chrom_counts": chrom_counts,
+            "batch_count": n_batches,
+        }
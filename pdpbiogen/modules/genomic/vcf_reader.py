@@ -0,0 +1,118 @@
+"""Streaming VCF/BCF reader that yields variants in fixed-size batches.
+
+Records come out as the same dicts used by ``data/sample/genome_sample.json``
+({"chr", "pos", "ref", "alt"}), so GenomicMapper can consume them without
+materializing a whole genome in memory.
+
+Region queries use pysam (tabix/CSI index) when it is installed; otherwise
+a pure-Python reader scans plain or bgzip-compressed VCF text and filters
+records on the fly.
+"""
+
+import gzip
+from pathlib import Path
+
+try:
+    import pysam
+except ImportError:
+    pysam = None
+
+DEFAULT_BATCH_SIZE = 10000
+
+
+def parse_region(region):
+    """Parse 'chr', 'chr:start' or 'chr:start-end' into (chrom, start, end).
+
+    Coordinates are 1-based and inclusive, as in tabix; missing bounds are None.
+    """
+    if region is None:
+        return None
+    chrom, _, span = region.partition(":")
+    if not span:
+        return chrom, None, None
+    start, _, end = span.replace(",", "").partition("-")
+    return chrom, int(start) if start else None, int(end) if end else None
+
+
+def _in_region(chrom, pos, region):
+    r_chrom, r_start, r_end = region
+    if chrom != r_chrom:
+        return False
+    if r_start is not None and pos < r_start:
+        return False
+    if r_end is not None and pos > r_end:
+        return False
+    return True
+
+
+def _open_text(path):
+    with open(path, "rb") as fh:
+        magic = fh.read(2)
+    if magic == b"\x1f\x8b":
+        # bgzip is a series of gzip members, which gzip reads transparently
+        return gzip.open(path, "rt", encoding="utf-8")
+    return open(path, "r", encoding="utf-8")
+
+
+def _iter_text_records(path, region=None):
+    """Pure-Python fallback: scan VCF text line by line."""
+    with _open_text(path) as fh:
+        for line in fh:
+            if not line or line[0] == "#":
+                continue
+            fields = line.rstrip("\n").split("\t", 5)
+            if len(fields) < 5:
+                continue
+            chrom, pos = fields[0], int(fields[1])
+            if region is not None and not _in_region(chrom, pos, region):
+                continue
+            yield {"chr": chrom, "pos": pos, "ref": fields[3], "alt": fields[4]}
+
+
+def _iter_pysam_records(path, region=None):
+    """Indexed access via pysam; handles BCF and tabix/CSI-indexed VCF."""
+    with pysam.VariantFile(str(path)) as vf:
+        if region is None:
+            it = vf.fetch()
+        else:
+            chrom, start, end = region
+            # pysam takes 0-based half-open coordinates
+            it = vf.fetch(chrom, start - 1 if start else None, end)
+        for rec in it:
+            yield {
+                "chr": rec.chrom,
+                "pos": rec.pos,
+                "ref": rec.ref,
+                "alt": ",".join(rec.alts or ()),
+            }
+
+
+def _has_index(path):
+    p = str(path)
+    return any(Path(p + ext).exists() for ext in (".tbi", ".csi"))
+
+
+def iter_vcf_records(path, region=None):
+    """Yield variant dicts from a VCF/BCF file, optionally limited to a region."""
+    path = Path(path)
+    region = parse_region(region) if isinstance(region, str) else region
+    is_bcf = path.suffix == ".bcf"
+    if pysam is not None and (is_bcf or region is None or _has_index(path)):
+        return _iter_pysam_records(path, region)
+    if is_bcf:
+        raise ImportError("Reading BCF files requires pysam")
+    return _iter_text_records(path, region)
+
+
+def iter_vcf_batches(path, batch_size=DEFAULT_BATCH_SIZE, region=None):
+    """Yield lists of at most ``batch_size`` variant dicts."""
+    if batch_size < 1:
+        raise ValueError("batch_size must be positive")
+    batch = []
+    for rec in iter_vcf_records(path, region=region):
+        batch.append(rec)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
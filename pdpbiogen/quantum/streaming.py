@@ -0,0 +1,227 @@
+"""
+Streaming real-time mode for the quantum neuro-symmetry mapper.
+
+StreamingQuantumMapper ingests EEG samples as they arrive and keeps a
+sliding window in a preallocated ring buffer. Instead of recomputing
+np.cov each time, it keeps the window mean and centered scatter matrix
+Σ(x-m)(x-m)ᵀ, updated per push with Chan's pairwise formulas: the new block
+is merged in and the evicted block removed, each as a rank-k update.
+Raw sums Σx and Σxxᵀ would lose most of their precision to cancellation
+when the signal carries a large DC offset. The statistics are re-derived
+from the buffer every ``refresh_every`` updates to bound floating-point
+drift. Quantum propagators come from the cached PropagatorEngine, and the
+SymmetryOptimizer is warm-started from the previous window.
+
+Latency is tracked per update in a LatencyHistogram. When the recent p99
+exceeds ``latency_budget_ms`` the optimizer's iteration cap is lowered one
+step at a time, down to a single projection. It is restored when latency
+falls back under half the budget. The budget is a target the mapper steers
+toward by trading symmetry accuracy, not a bound: a single push can still
+take longer, and ``budget_overruns`` counts how often it did.
+"""
+
+import time
+from collections import deque
+
+import numpy as np
+from Bio.Seq import Seq
+
+from pdpbiogen.quantum.evolution import concurrence
+from pdpbiogen.quantum.mapper import BELL_00, DarkPhotonEntangler, SymmetryOptimizer
+
+DEFAULT_BUCKETS_MS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 25.0, 50.0, 100.0, 250.0, 1000.0)
+
+
+def _block_stats(x):
+    """Per-channel mean and centered scatter matrix of a (channels, k) block."""
+    mean = x.mean(axis=1)
+    centered = x - mean[:, None]
+    return mean, centered @ centered.T
+
+
+class LatencyHistogram:
+    """Cumulative bucket counts plus a sliding window for exact recent percentiles."""
+
+    def __init__(self, buckets_ms=DEFAULT_BUCKETS_MS, window=1024):
+        self.buckets_ms = tuple(buckets_ms)
+        self.counts = np.zeros(len(self.buckets_ms) + 1, dtype=np.int64)  # last = +Inf
+        self.total = 0
+        self.sum_ms = 0.0
+        self.recent = deque(maxlen=window)
+
+    def observe(self, ms):
+        self.counts[np.searchsorted(self.buckets_ms, ms)] += 1
+        self.total += 1
+        self.sum_ms += ms
+        self.recent.append(ms)
+
+    def percentile(self, q):
+        """q-th percentile (0-100) over the recent window; 0.0 if empty."""
+        if not self.recent:
+            return 0.0
+        return float(np.percentile(np.fromiter(self.recent, dtype=float), q))
+
+    def snapshot(self):
+        return {
+            "count": self.total,
+            "sum_ms": self.sum_ms,
+            "buckets_ms": list(self.buckets_ms),
+            "bucket_counts": self.counts.tolist(),
+            "p50_ms": self.percentile(50),
+            "p99_ms": self.percentile(99),
+        }
+
+    def to_prometheus(self, name="pdpbiogen_stream_update_latency_ms"):
+        lines = [f"# TYPE {name} histogram"]
+        cumulative = np.cumsum(self.counts)
+        for edge, c in zip(self.buckets_ms, cumulative):
+            lines.append(f'{name}_bucket{{le="{edge}"}} {c}')
+        lines.append(f'{name}_bucket{{le="+Inf"}} {cumulative[-1]}')
+        lines.append(f"{name}_sum {self.sum_ms}")
+        lines.append(f"{name}_count {self.total}")
+        return "\n".join(lines) + "\n"
+
+
+class StreamingQuantumMapper:
+    """Stateful sliding-window mapper that steers toward a p99 latency budget.
+
+    ``push(samples)`` takes a (channels, k) block of new samples and returns
+    the map for the current window, or None until the window has filled.
+    The returned ``quantum_human_map`` is written into a reused buffer and
+    is overwritten by the next push; copy it if you need to keep it.
+    """
+
+    def __init__(self, n_channels, window=256, genomic_data=None, g=0.01, gap_mm=5,
+                 latency_budget_ms=10.0, max_iter=5, flux_resolution=1e-3,
+                 refresh_every=1000, seed=None):
+        self.n_channels = n_channels
+        self.window = window
+        self.gap_mm = gap_mm
+        self.latency_budget_ms = latency_budget_ms
+        self.flux_resolution = flux_resolution
+        self.refresh_every = refresh_every
+        self.rng = np.random.default_rng(seed)
+
+        self.entangler = DarkPhotonEntangler(g=g)
+        self.symmetry_agent = SymmetryOptimizer(max_iter=max_iter, warm_start=True)
+        self.max_iter = max_iter
+        self.motif = str(Seq(genomic_data)[:12]) if genomic_data else str(Seq('ATGC' * 3))
+        self.status = f'Viable ({gap_mm}mm gap; entanglement SNR boost)'
+
+        # Preallocated state
+        self._buf = np.zeros((n_channels, window))
+        self._pos = 0
+        self._count = 0
+        self._mean = np.zeros(n_channels)
+        self._m2 = np.zeros((n_channels, n_channels))
+        self._cov = np.zeros((n_channels, n_channels))
+        self._noise = np.zeros((n_channels, n_channels))
+        self._ent = np.zeros(n_channels)
+        self._map = np.zeros(n_channels * n_channels)
+        self._updates = 0
+
+        self.latency = LatencyHistogram()
+        self.budget_overruns = 0
+
+    def reset(self):
+        self._buf.fill(0.0)
+        self._mean.fill(0.0)
+        self._m2.fill(0.0)
+        self._pos = self._count = self._updates = 0
+        self.symmetry_agent.reset()
+
+    def _refresh_sums(self):
+        # while filling, the valid columns are 0.._count-1
+        data = self._buf[:, :self._count]
+        self._mean[:], self._m2[:] = _block_stats(data)
+
+    def _ingest(self, samples):
+        k = samples.shape[1]
+        if k >= self.window:
+            self._buf[:] = samples[:, -self.window:]
+            self._pos = 0
+            self._count = self.window
+            self._refresh_sums()
+            return
+        idx = (self._pos + np.arange(k)) % self.window
+        n_evict = max(self._count + k - self.window, 0)
+        old = self._buf[:, idx[k - n_evict:]]  # slots before these are still empty
+
+        # Chan et al.: merge the new block, then take the evicted one back out
+        n = self._count
+        mean_b, m2_b = _block_stats(samples)
+        delta = mean_b - self._mean
+        n_add = n + k
+        self._mean += delta * (k / n_add)
+        self._m2 += m2_b + np.outer(delta, delta) * (n * k / n_add)
+        if n_evict:
+            mean_o, m2_o = _block_stats(old)
+            n_keep = n_add - n_evict
+            kept_mean = (self._mean * n_add - mean_o * n_evict) / n_keep
+            delta = mean_o - kept_mean
+            self._mean[:] = kept_mean
+            self._m2 -= m2_o + np.outer(delta, delta) * (n_keep * n_evict / n_add)
+
+        self._buf[:, idx] = samples
+        self._pos = (self._pos + k) % self.window
+        self._count = min(self._count + k, self.window)
+
+    def _adapt_budget(self):
+        if len(self.latency.recent) < 32:
+            return
+        p99 = self.latency.percentile(99)
+        agent = self.symmetry_agent
+        if p99 > self.latency_budget_ms and agent.max_iter > 1:
+            agent.max_iter -= 1
+        elif p99 < 0.5 * self.latency_budget_ms and agent.max_iter < self.max_iter:
+            agent.max_iter += 1
+
+    def _compute_cov(self):
+        np.divide(self._m2, max(self._count - 1, 1), out=self._cov)
+
+    def window_covariance(self):
+        """Channel covariance of the current window from the running statistics."""
+        self._compute_cov()
+        return self._cov.copy()
+
+    def push(self, samples):
+        start = time.perf_counter()
+        samples = np.asarray(samples, dtype=float).reshape(self.n_channels, -1)
+        self._ingest(samples)
+        self._updates += 1
+        if self._updates % self.refresh_every == 0:
+            self._refresh_sums()
+        if self._count < self.window:
+            return None
+
+        self._compute_cov()
+        self.rng.random(out=self._noise)
+        self._noise *= self.gap_mm * 0.1
+        self._cov += self._noise
+
+        flux = self._mean.mean()
+        if self.flux_resolution:
+            flux = round(flux / self.flux_resolution) * self.flux_resolution
+        rhos = self.entangler.propagator.evolve(BELL_00, flux, self.entangler.avg_times)
+        conc = float(concurrence(rhos).mean())
+        photon = np.einsum('iaja->ij', rhos[-1].reshape(2, 2, 2, 2)).real.ravel()
+        k = min(4, self.n_channels)
+        self._ent[:k] = photon[:k]
+        self._cov += self._ent[None, :]
+
+        final_cov, sym_score = self.symmetry_agent.optimize(self._cov)
+        self._map[:] = final_cov.ravel()
+
+        latency = (time.perf_counter() - start) * 1000
+        self.latency.observe(latency)
+        if latency > self.latency_budget_ms:
+            self.budget_overruns += 1
+        self._adapt_budget()
+        return {
+            'quantum_human_map': self._map,
+            'entanglement_concurrence': conc,
+            'symmetry_score': sym_score,
+            'genomic_motif': self.motif,
+            'latency_ms': latency,
+            'non_contact_status': self.status,
+        }
@@ -0,0 +1,75 @@
+"""
+SPD projection and scoring helpers for SymmetryOptimizer.
+
+- ``project_spd``: nearest matrix with eigenvalues >= ``floor`` that keeps
+  the input's diagonal (per-channel power), found by dual ascent on the
+  diagonal constraint. The dual vector from the previous window can be
+  passed back in as a warm start. In a streaming setting it changes slowly,
+  so few iterations are needed (the answer is only start-independent once
+  the ascent has converged). Inputs that are already SPD above the floor
+  are detected with one Cholesky factorization and returned without an
+  eigendecomposition.
+- ``whitened_asymmetry``: mean pairwise Mahalanobis distance between the rows
+  of an SPD matrix S = V Λ V†, measured under S itself. In the whitened
+  coordinates y_i = Λ^½ V† e_i the Gram matrix is S, so
+  d_ij² = S_ii + S_jj - 2 S_ij. This needs no inverse and no pdist call.
+
+Both accept a single (n, n) matrix or a stack (..., n, n).
+"""
+
+import numpy as np
+
+
+def whitened_asymmetry(symmetric):
+    """Mean pairwise whitened-space distance between rows; accepts (..., n, n)."""
+    diag = np.diagonal(symmetric, axis1=-2, axis2=-1)
+    d2 = diag[..., :, None] + diag[..., None, :] - 2 * symmetric
+    iu = np.triu_indices(symmetric.shape[-1], k=1)
+    return np.sqrt(np.clip(d2[..., iu[0], iu[1]], 0, None)).mean(axis=-1)
+
+
+def _clip_eigenvalues(r, floor):
+    vals, vecs = np.linalg.eigh(r)
+    vals = np.maximum(vals, floor)
+    return (vecs * vals[..., None, :]) @ np.swapaxes(vecs, -1, -2)
+
+
+def _is_spd_above(a, floor):
+    try:
+        np.linalg.cholesky(a - floor * np.eye(a.shape[-1]))
+    except np.linalg.LinAlgError:
+        return False
+    return True
+
+
+def project_spd(a, floor=1e-5, max_iter=5, tol=1e-6, dual=None):
+    """Project onto {eigenvalues >= floor} ∩ {diag = diag(a)}.
+
+    Solves the dual problem: x = P(a + diag(y)) where P clips eigenvalues at
+    ``floor``, and y ascends along the diagonal residual. The optimal y is
+    unique, so at convergence a warm-started ``dual`` changes the iteration
+    count but not the answer. When ``max_iter`` stops the ascent early the
+    result depends on the starting dual. Returns (x, dual, n_iter). ``x`` is SPD after every iteration,
+    and ``n_iter`` counts eigendecompositions (0 for the Cholesky fast path).
+    Iteration stops when the diagonal residual is <= tol * ||a|| or after
+    ``max_iter`` iterations.
+    """
+    a = 0.5 * (a + np.swapaxes(a, -1, -2))
+    target_diag = np.diagonal(a, axis1=-2, axis2=-1)
+    if a.ndim == 2 and _is_spd_above(a, floor):
+        return a, np.zeros_like(target_diag), 0
+
+    idx = np.arange(a.shape[-1])
+    scale = tol * np.linalg.norm(a, axis=(-2, -1))
+    y = np.zeros_like(target_diag) if dual is None or np.shape(dual) != target_diag.shape else dual
+    x = a
+    n_iter = 0
+    for n_iter in range(1, max(1, max_iter) + 1):
+        shifted = a.copy()
+        shifted[..., idx, idx] += y
+        x = _clip_eigenvalues(shifted, floor)
+        residual = target_diag - np.diagonal(x, axis1=-2, axis2=-1)
+        if np.all(np.linalg.norm(residual, axis=-1) <= scale):
+            break
+        y = y + residual
+    return x, y, n_iter
@@ -1,3 +1,17 @@
+from pdpbiogen.validation.compiled import compile_schema, sample_validator
+
+COMBINED_OUTPUT_SCHEMA = {
+    "combined": object,
+    "agent": {"score": (int, float)},
+}
+
+_COMBINED_OUTPUT_MESSAGES = {
+    "combined": "Malformed pipeline output: missing keys",
+    "agent": "Malformed pipeline output: missing keys",
+    "agent.score": "Invalid agent score",
+}
+
+
 def validate_combined_output(obj: dict):
     """Basic validation: ensure keys exist and scores are numeric."""
     if "combined" not in obj or "agent" not in obj:
@@ -7,3 +21,16 @@ def validate_combined_output(obj: dict):
         raise ValueError("Invalid agent score")
     # More domain-specific checks could go here
     return True
+
+
+# Same checks as validate_combined_output, compiled once from the schema above
+fast_validate_combined_output = compile_schema(
+    COMBINED_OUTPUT_SCHEMA,
+    messages=_COMBINED_OUTPUT_MESSAGES,
+    name="fast_validate_combined_output",
+)
+
+
+def sampled_combined_validator(sample_every: int = 1):
+    """Compiled combined-output validator that checks 1 in ``sample_every`` results."""
+    return sample_validator(fast_validate_combined_output, sample_every=sample_every)
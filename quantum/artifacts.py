@@ -0,0 +1,167 @@
+"""
+quantum.artifacts
+Artifact writing for the healing_sim pipeline: files are hashed while they are
+written, and an optional ArtifactStore keeps them content-addressed so identical
+outputs are stored once and completed stages can be skipped.
+"""
+
+from pathlib import Path
+import json, hashlib, os, shutil, tempfile
+
+def sha256_file(path: Path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(8192), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+class _HashingWriter:
+    """Binary write-only file wrapper that feeds every chunk to a sha256 as it is written."""
+    def __init__(self, fh):
+        self._fh = fh
+        self.sha = hashlib.sha256()
+        self._pos = 0
+
+    def write(self, data):
+        self.sha.update(data)
+        self._pos += len(data)
+        return self._fh.write(data)
+
+    def tell(self):
+        return self._pos
+
+    def flush(self):
+        self._fh.flush()
+
+    def writable(self):
+        return True
+
+    def seekable(self):
+        return False
+
+    @property
+    def closed(self):
+        return self._fh.closed
+
+def _link_or_copy(src: Path, dest: Path):
+    # hardlink (copy across filesystems) to a temp name, then rename over dest, so an
+    # existing dest is replaced rather than written through
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    tmp = dest.with_name(f".{dest.name}.{os.getpid()}.tmp")
+    try:
+        os.link(src, tmp)
+    except OSError:
+        shutil.copyfile(src, tmp)
+    os.replace(tmp, dest)
+
+def write_artifact(path: Path, write, store=None):
+    """
+    Write an artifact through write(fh) and return its sha256, computed from the bytes
+    as they are written (no re-read). The file lands via temp file + rename. With an
+    ArtifactStore the bytes go into the store and path becomes a hardlink to the blob.
+    """
+    path = Path(path)
+    if store is not None:
+        return store.write(path, write)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp, "wb") as fh:
+        writer = _HashingWriter(fh)
+        write(writer)
+    os.replace(tmp, path)
+    return writer.sha.hexdigest()
+
+STAGE_CACHE_VERSION = 1
+
+class ArtifactStore:
+    """
+    Content-addressed store for healing_sim artifacts under root/:
+      objects/ab/cdef...   read-only blobs named by sha256 (identical artifacts stored once)
+      stages/<key>.json    outputs of a stage, keyed by a hash of its name + input hashes
+      inputs/<key>.json    sha256 of an input file, keyed by path, size and mtime
+    Run directories get hardlinks to the blobs. A stage whose key is already recorded
+    (and whose blobs still exist) is skipped and its outputs are linked instead.
+    Safe for concurrent writers: blobs and records are written to temp files and renamed.
+    """
+    def __init__(self, root):
+        self.root = Path(root)
+        for sub in ("objects", "stages", "inputs", "tmp"):
+            (self.root / sub).mkdir(parents=True, exist_ok=True)
+        self.blobs_written = 0
+        self.blobs_deduplicated = 0
+        self.stage_hits = 0
+
+    def blob_path(self, digest):
+        return self.root / "objects" / digest[:2] / digest[2:]
+
+    def write(self, path: Path, write):
+        """Stream an artifact into the store, link it to path, return its sha256."""
+        fd, tmp = tempfile.mkstemp(dir=self.root / "tmp")
+        with os.fdopen(fd, "wb") as fh:
+            writer = _HashingWriter(fh)
+            write(writer)
+        digest = writer.sha.hexdigest()
+        blob = self.blob_path(digest)
+        if blob.exists():
+            os.unlink(tmp)
+            self.blobs_deduplicated += 1
+        else:
+            blob.parent.mkdir(exist_ok=True)
+            os.chmod(tmp, 0o444)
+            os.replace(tmp, blob)
+            self.blobs_written += 1
+        self.link(digest, path)
+        return digest
+
+    def link(self, digest, path: Path):
+        _link_or_copy(self.blob_path(digest), Path(path))
+
+    def file_digest(self, path):
+        """sha256 of an input file, re-hashed only when its path, size or mtime change."""
+        st = os.stat(path)
+        stamp = f"{Path(path).resolve()}\0{st.st_size}\0{st.st_mtime_ns}"
+        record = self.root / "inputs" / f"{hashlib.sha256(stamp.encode()).hexdigest()}.json"
+        if record.exists():
+            with open(record) as fh:
+                return json.load(fh)["sha256"]
+        digest = sha256_file(path)
+        self._put_json(record, {"path": str(path), "sha256": digest})
+        return digest
+
+    @staticmethod
+    def stage_key(stage, **inputs):
+        """Hash of the stage name, STAGE_CACHE_VERSION and JSON-serializable inputs."""
+        payload = json.dumps({"stage": stage, "version": STAGE_CACHE_VERSION, **inputs}, sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def get_stage(self, key):
+        """{'blobs': {name: sha256}, 'meta': {...}} for a completed stage, else None."""
+        record = self.root / "stages" / f"{key}.json"
+        if not record.exists():
+            return None
+        with open(record) as fh:
+            outputs = json.load(fh)
+        if not all(self.blob_path(d).exists() for d in outputs["blobs"].values()):
+            return None
+        self.stage_hits += 1
+        return outputs
+
+    def put_stage(self, key, blobs, meta=None):
+        self._put_json(self.root / "stages" / f"{key}.json", {"blobs": blobs, "meta": meta or {}})
+
+    def _put_json(self, path: Path, obj):
+        fd, tmp = tempfile.mkstemp(dir=self.root / "tmp")
+        with os.fdopen(fd, "w") as fh:
+            json.dump(obj, fh)
+        os.replace(tmp, path)
+
+    def stats(self):
+        return {"blobs_written": self.blobs_written,
+                "blobs_deduplicated": self.blobs_deduplicated,
+                "stage_hits": self.stage_hits}
+
+def as_store(store):
+    """An ArtifactStore, its root directory, or None -> ArtifactStore or None."""
+    if store is None or isinstance(store, ArtifactStore):
+        return store
+    return ArtifactStore(store)
@@ -0,0 +1,154 @@
+"""
+quantum.eeg_stream
+Chunked (memory-lean) EEG preprocessing: band-pass FIR with carried state, decimation
+and Welch bandpower accumulated block by block, so a long EDF recording is reduced to
+bandpower features without ever being loaded whole. Results match the in-memory
+load_eeg_edf + bandpower_features path of healing_sim.
+"""
+
+import numpy as np
+
+# Canonical delta/theta/alpha/beta/gamma bands (Hz, both edges inclusive)
+EEG_BANDS = ((1, 4), (4, 8), (8, 12), (12, 30), (30, 45))
+
+def band_means(f, Pxx, bands):
+    """Mean of Pxx over each (lo, hi) band of frequencies f, flattened channel-major."""
+    lo = np.searchsorted(f, [b[0] for b in bands], side='left')
+    hi = np.searchsorted(f, [b[1] for b in bands], side='right')
+    csum = np.concatenate([np.zeros(Pxx.shape[:-1] + (1,)), np.cumsum(Pxx, axis=-1)], axis=-1)
+    bp = (csum[..., hi] - csum[..., lo]) / (hi - lo)  # (..., n_channels, n_bands)
+    return bp.reshape(bp.shape[:-2] + (-1,))
+
+def bandpass_taps(sfreq, l_freq=1.0, h_freq=40.0):
+    """
+    Linear-phase band-pass FIR taps with the same design rules as the
+    raw.filter(l_freq, h_freq, method='fir', fir_design='firwin') call in load_eeg_edf:
+    MNE's 'auto' transition bandwidths, cutoffs at the transition midpoints, a hamming
+    window and 3.3 / min(transition) * sfreq taps (odd, so the delay is whole samples).
+    """
+    from scipy.signal import firwin
+    l_trans = min(max(l_freq * 0.25, 2.0), l_freq)
+    h_trans = min(max(h_freq * 0.25, 2.0), sfreq / 2.0 - h_freq)
+    numtaps = int(round(3.3 / min(l_trans, h_trans) * sfreq))
+    numtaps += 1 - numtaps % 2
+    return firwin(numtaps, [l_freq - l_trans / 2.0, h_freq + h_trans / 2.0],
+                  pass_zero=False, fs=sfreq, window="hamming")
+
+class StreamingFIR:
+    """
+    FIR filter over consecutive (n_channels, n) blocks by overlap-save FFT convolution.
+    The last len(taps) - 1 input samples are carried to the next block, and the
+    (len(taps) - 1) / 2 sample group delay is dropped from the start and recovered by
+    flush(), so the concatenated output equals the zero-phase filtered signal (with zero
+    padding at the edges).
+    """
+    def __init__(self, taps, n_channels):
+        self.taps = np.asarray(taps, dtype=float)[None, :]
+        self.delay = (self.taps.shape[1] - 1) // 2
+        self._tail = np.zeros((n_channels, self.taps.shape[1] - 1))
+        self._skip = self.delay
+
+    def process(self, block):
+        from scipy.signal import fftconvolve
+        x = np.concatenate([self._tail, block], axis=1)
+        self._tail = x[:, block.shape[1]:]
+        y = fftconvolve(x, self.taps, mode="valid", axes=-1)
+        if self._skip:
+            k = min(self._skip, y.shape[1])
+            y = y[:, k:]
+            self._skip -= k
+        return y
+
+    def flush(self):
+        """The last `delay` output samples (input followed by zeros)."""
+        return self.process(np.zeros((self._tail.shape[0], self.delay)))
+
+class StreamingBandpower:
+    """
+    Welch bandpower accumulated block by block. Segments, window (hann, nperseg =
+    2 * sfreq, 50% overlap), per-segment mean removal and density scaling are those
+    of bandpower_features, so result() equals bandpower_features on the concatenated
+    blocks; only the unfinished last segment is buffered.
+    """
+    def __init__(self, n_channels, sfreq, bands=EEG_BANDS):
+        from scipy.signal import get_window
+        self.sfreq = sfreq
+        self.bands = bands
+        self.nperseg = int(sfreq * 2)
+        self.step = self.nperseg - self.nperseg // 2
+        self.window = get_window("hann", self.nperseg)
+        self._buf = np.zeros((n_channels, 0))
+        self._power = np.zeros((n_channels, self.nperseg // 2 + 1))
+        self.n_segments = 0
+
+    def update(self, block):
+        from numpy.lib.stride_tricks import sliding_window_view
+        buf = np.concatenate([self._buf, block], axis=1)
+        n_seg = max(0, (buf.shape[1] - self.nperseg) // self.step + 1)
+        if n_seg:
+            segs = sliding_window_view(buf, self.nperseg, axis=1)[:, :(n_seg - 1) * self.step + 1:self.step]
+            segs = segs - segs.mean(axis=-1, keepdims=True)
+            spec = np.fft.rfft(segs * self.window, axis=-1)
+            self._power += (spec.real ** 2 + spec.imag ** 2).sum(axis=1)
+            self.n_segments += n_seg
+        self._buf = buf[:, n_seg * self.step:]
+
+    def psd(self):
+        if not self.n_segments:
+            raise ValueError(f"Recording is shorter than one Welch segment ({self.nperseg} samples)")
+        Pxx = self._power / self.n_segments / (self.sfreq * (self.window ** 2).sum())
+        Pxx[:, 1:-1 if self.nperseg % 2 == 0 else None] *= 2  # one-sided
+        return np.fft.rfftfreq(self.nperseg, 1.0 / self.sfreq), Pxx
+
+    def result(self):
+        return band_means(*self.psd(), self.bands)
+
+def stream_bandpower(blocks, sfreq, sfreq_target=128, l_freq=1.0, h_freq=40.0, bands=EEG_BANDS):
+    """
+    Bandpower features from an iterable of (n_channels, n) blocks without holding the
+    whole signal: band-pass FIR (bandpass_taps) with carried state, average reference,
+    decimation to sfreq_target, streaming Welch. The FIR doubles as the anti-alias
+    filter, so decimation keeps every q-th sample when sfreq / sfreq_target is an
+    integer q. Otherwise Welch runs at the native rate, which has the same 0.5 Hz
+    resolution and per-Hz density. Memory is O(block + filter length + one segment).
+    """
+    ratio = sfreq / sfreq_target
+    q = int(round(ratio)) if ratio >= 1 and abs(ratio - round(ratio)) < 1e-9 else 1
+    fs_out = sfreq / q
+    taps = bandpass_taps(sfreq, l_freq, h_freq)
+    if q > 1 and h_freq + min(max(h_freq * 0.25, 2.0), sfreq / 2.0 - h_freq) / 2.0 > fs_out / 2.0:
+        raise ValueError(f"h_freq={h_freq} leaves no anti-alias margin for decimation to {fs_out} Hz")
+    fir = acc = None
+    phase = 0
+
+    def feed(y):
+        # keep every q-th sample of the concatenated stream, whatever the block sizes
+        nonlocal phase
+        kept = y[:, phase::q]
+        phase = (phase - y.shape[1]) % q
+        acc.update(kept - kept.mean(axis=0, keepdims=True))
+
+    for block in blocks:
+        block = np.asarray(block, dtype=float)
+        if fir is None:
+            fir = StreamingFIR(taps, block.shape[0])
+            acc = StreamingBandpower(block.shape[0], fs_out, bands)
+        feed(fir.process(block))
+    if fir is None:
+        raise ValueError("No EEG data")
+    feed(fir.flush())
+    return acc.result()
+
+def edf_bandpower_chunked(edf_path: str, sfreq_target=128, block_s=60.0, picks=None, bands=EEG_BANDS):
+    """
+    Chunked counterpart of load_eeg_edf + the bandpower step of eeg_to_features: the EDF
+    is opened without preload and read block_s seconds at a time into stream_bandpower.
+    Peak memory is a few blocks instead of two copies of the full recording.
+    """
+    import mne
+    raw = mne.io.read_raw_edf(edf_path, preload=False, verbose=False)
+    sfreq = raw.info['sfreq']
+    step = max(1, int(block_s * sfreq))
+    blocks = (raw.get_data(picks=picks, start=start, stop=min(start + step, raw.n_times))
+              for start in range(0, raw.n_times, step))
+    return stream_bandpower(blocks, sfreq, sfreq_target=sfreq_target, bands=bands)
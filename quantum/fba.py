@@ -0,0 +1,475 @@
+"""
+quantum.fba
+COBRA model side of the healing_sim pipeline: gene deltas mapped to reaction
+bounds through the GPR rules, FBA reports, chunked parallel flux variability
+analysis, and FBASession for warm-started solves across many perturbations.
+"""
+
+import ast
+import hashlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+import os, time
+import numpy as np
+import pandas as pd
+
+from .artifacts import write_artifact
+
+# ---------------------
+# Apply gene delta to COBRA model (simple deterministic mapping)
+# ---------------------
+def gpr_to_dnf(rule: str):
+    """
+    Parse a gene_reaction_rule ("g1 and (g2 or g3)") into OR-of-AND clauses
+    [["g1", "g2"], ["g1", "g3"]]. Empty rules give [].
+    """
+    rule = (rule or "").strip()
+    if not rule:
+        return []
+    # gene ids are not always valid Python names: swap them for placeholders first
+    tokens = rule.replace("(", " ( ").replace(")", " ) ").split()
+    names, expr = {}, []
+    for tok in tokens:
+        low = tok.lower()
+        if tok in ("(", ")"):
+            expr.append(tok)
+        elif low in ("and", "or"):
+            expr.append(low)
+        else:
+            expr.append(names.setdefault(tok, f"_g{len(names)}"))
+    genes = {v: k for k, v in names.items()}
+
+    def walk(node):
+        if isinstance(node, ast.Name):
+            return [[genes[node.id]]]
+        if isinstance(node, ast.BoolOp) and isinstance(node.op, ast.Or):
+            return [clause for v in node.values for clause in walk(v)]
+        if isinstance(node, ast.BoolOp) and isinstance(node.op, ast.And):
+            clauses = [[]]
+            for v in node.values:
+                clauses = [c + d for c in clauses for d in walk(v)]
+            return clauses
+        raise ValueError(f"Unsupported GPR rule: {rule!r}")
+    return walk(ast.parse(" ".join(expr), mode="eval").body)
+
+class GeneReactionIndex:
+    """
+    Reaction x gene structure of a COBRA model, built once and reused per recording.
+      - mean: CSR (n_reactions x n_genes) with 1/len(rxn.genes) entries, so the
+        mean gene score per reaction is one sparse product (the original rule)
+      - and_or: each GPR in OR-of-AND form, as flat CSR clause/gene indices;
+        AND takes the min score of a clause's genes, OR the max over clauses
+    Reactions without genes get factor 1.0 (bounds untouched).
+    """
+    def __init__(self, cobra_model):
+        from scipy import sparse
+        self.reactions = list(cobra_model.reactions)
+        self.signature = _gpr_signature(self.reactions)
+        self.gene_ids = sorted({g.id for rxn in self.reactions for g in getattr(rxn, 'genes', ())})
+        col = {g: i for i, g in enumerate(self.gene_ids)}
+        rows, cols, vals = [], [], []
+        clause_genes, clause_ptr, rxn_clause_ptr = [], [0], [0]
+        for r, rxn in enumerate(self.reactions):
+            genes = [g.id for g in getattr(rxn, 'genes', ())]
+            rows.extend([r] * len(genes))
+            cols.extend(col[g] for g in genes)
+            vals.extend([1.0 / max(len(genes), 1)] * len(genes))
+            clauses = gpr_to_dnf(getattr(rxn, 'gene_reaction_rule', ''))
+            if genes and not clauses:
+                clauses = [genes]
+            for clause in clauses:
+                clause_genes.extend(col[g] for g in clause if g in col)
+                clause_ptr.append(len(clause_genes))
+            rxn_clause_ptr.append(len(clause_ptr) - 1)
+        shape = (len(self.reactions), len(self.gene_ids))
+        self.mean_matrix = sparse.csr_matrix((vals, (rows, cols)), shape=shape)
+        self.has_genes = np.diff(self.mean_matrix.indptr) > 0
+        self.clause_genes = np.asarray(clause_genes, dtype=np.int64)
+        self.clause_ptr = np.asarray(clause_ptr, dtype=np.int64)
+        self.rxn_clause_ptr = np.asarray(rxn_clause_ptr, dtype=np.int64)
+
+    def gene_scores(self, gene_list, log2fc):
+        """log2fc aligned to self.gene_ids (0.0 for model genes missing from gene_list)."""
+        series = pd.Series(np.asarray(log2fc, dtype=float), index=list(gene_list))
+        series = series[~series.index.duplicated(keep='last')]
+        return series.reindex(self.gene_ids, fill_value=0.0).to_numpy()
+
+    def reaction_scores(self, scores, gpr="mean"):
+        if gpr == "mean":
+            return self.mean_matrix @ scores
+        if gpr != "and_or":
+            raise ValueError(f"Unknown GPR mode: {gpr}")
+        out = np.zeros(len(self.reactions))
+        n_clause_genes = np.diff(self.clause_ptr)
+        clause_ok = n_clause_genes > 0
+        clause_val = np.full(len(n_clause_genes), -np.inf)
+        if clause_ok.any():
+            clause_val[clause_ok] = np.minimum.reduceat(scores[self.clause_genes],
+                                                        self.clause_ptr[:-1][clause_ok])
+        n_clauses = np.diff(self.rxn_clause_ptr)
+        rxn_ok = n_clauses > 0
+        if rxn_ok.any():
+            out[rxn_ok] = np.maximum.reduceat(clause_val, self.rxn_clause_ptr[:-1][rxn_ok])
+        return np.where(np.isfinite(out), out, 0.0)
+
+    def factors(self, gene_list, log2fc, gpr="mean"):
+        """Per-reaction bound factor clip(1 + score, 0.2, 2.0); 1.0 without genes."""
+        score = self.reaction_scores(self.gene_scores(gene_list, log2fc), gpr)
+        factor = np.clip(1.0 + score, 0.2, 2.0)
+        return np.where(self.has_genes, factor, 1.0)
+
+def _gpr_signature(reactions):
+    """Digest of every (reaction id, GPR rule): changes when any rule is edited or reactions move."""
+    h = hashlib.sha256()
+    for rxn in reactions:
+        h.update(f"{rxn.id}\0{getattr(rxn, 'gene_reaction_rule', '')}\n".encode())
+    return h.hexdigest()
+
+def gene_reaction_index(cobra_model):
+    """GeneReactionIndex cached on the model (and pickled with it to batch workers)."""
+    index = getattr(cobra_model, "_gene_reaction_index", None)
+    # model.copy() carries the attribute over by reference, and rules can be
+    # edited in place: rebuild unless the index still points at this model's
+    # own reaction objects and every GPR rule is unchanged
+    rxns = cobra_model.reactions
+    if (index is None or len(index.reactions) != len(rxns)
+            or any(a is not b for a, b in zip(index.reactions, rxns))
+            or index.signature != _gpr_signature(rxns)):
+        index = GeneReactionIndex(cobra_model)
+        cobra_model._gene_reaction_index = index
+    return index
+
+def apply_gene_delta_to_model(cobra_model, gene_list, log2fc, base_expression=None, gpr="mean"):
+    """
+    gene_list: list of gene IDs aligned with log2fc
+    base_expression: optional baseline expression dict {gene: value}
+    Low expression reduces the bounds of reactions associated with that gene:
+    both finite bounds are scaled by clip(1 + score, 0.2, 2.0), where score is
+    the mean log2fc of the reaction's genes (gpr="mean") or the GPR rule
+    evaluated with AND=min / OR=max (gpr="and_or").
+    Scores come from one sparse product / segmented reduction over the cached
+    GeneReactionIndex; only reactions whose factor differs from 1 are touched,
+    each with a single bounds assignment.
+    """
+    index = gene_reaction_index(cobra_model)
+    changed, new_lower, new_upper = _delta_bounds(index, gene_list, log2fc, gpr)
+    for i, lb, ub in zip(changed.tolist(), new_lower.tolist(), new_upper.tolist()):
+        index.reactions[i].bounds = (lb, ub)
+    return cobra_model
+
+def _delta_bounds(index, gene_list, log2fc, gpr="mean"):
+    # (reaction positions, new lower, new upper) for reactions whose factor != 1
+    factor = index.factors(gene_list, log2fc, gpr)
+    changed = np.flatnonzero(factor != 1.0)
+    lower = np.array([index.reactions[i].lower_bound for i in changed], dtype=float)
+    upper = np.array([index.reactions[i].upper_bound for i in changed], dtype=float)
+    # skip blocked/unbounded (non-finite) bounds
+    new_lower = np.where(np.isfinite(lower), lower * factor[changed], lower)
+    new_upper = np.where(np.isfinite(upper), upper * factor[changed], upper)
+    return changed, new_lower, new_upper
+
+def gene_delta_bounds(cobra_model, gene_list, log2fc, gpr="mean"):
+    """
+    The bounds apply_gene_delta_to_model would set, without touching the model:
+    {"reactions": [ids], "lower": array, "upper": array} for the changed reactions.
+    """
+    index = gene_reaction_index(cobra_model)
+    changed, new_lower, new_upper = _delta_bounds(index, gene_list, log2fc, gpr)
+    return {"reactions": [index.reactions[i].id for i in changed.tolist()],
+            "lower": new_lower, "upper": new_upper}
+
+# ---------------------
+# Run flux-balance analysis & return key flux changes
+# ---------------------
+def top_abs_changes(diffs: pd.Series, k=20):
+    """
+    [(reaction_id, delta), ...] for the k largest |delta|, largest first. Ties keep
+    reaction order (same as a stable full sort) but selection is an O(n) argpartition.
+    k <= 0 gives an empty list.
+    """
+    if k <= 0:
+        return []
+    values = diffs.to_numpy(dtype=float)
+    mag = np.abs(values)
+    n = len(values)
+    if k < n:
+        kth = np.argpartition(mag, n - k)[n - k]
+        above = np.flatnonzero(mag > mag[kth])
+        ties = np.flatnonzero(mag == mag[kth])[:k - len(above)]
+        idx = np.concatenate([above, ties])
+    else:
+        idx = np.arange(n)
+    idx = idx[np.lexsort((idx, -mag[idx]))]
+    ids = diffs.index
+    return [(ids[i], float(values[i])) for i in idx]
+
+def _flux_delta_writer(reaction_ids, before, after):
+    frame = pd.DataFrame({
+        "reaction": reaction_ids,
+        "flux_baseline": before.astype(np.float32),
+        "flux_changed": after.astype(np.float32),
+        "flux_delta": (after - before).astype(np.float32),
+    })
+    return lambda fh: frame.to_parquet(fh, index=False)
+
+def write_flux_delta_parquet(reaction_ids, before, after, path: Path):
+    """Full per-reaction fluxes and deltas as float32 columns in a Parquet file."""
+    write_artifact(path, _flux_delta_writer(reaction_ids, before, after))
+    return path
+
+def run_fba_and_report(cobra_model, baseline_solution=None, top_k=20, flux_delta_path=None, store=None):
+    """
+    FBA on the current model vs the baseline. The report lists the top_k reactions by
+    absolute flux change; with flux_delta_path the full flux-delta vector is also
+    written there as float32 Parquet (see write_flux_delta_parquet), through `store`
+    if given, and its sha256 is reported.
+    """
+    # get baseline if not provided
+    if baseline_solution is None:
+        baseline_solution = cobra_model.optimize()
+    # run FBA on current model
+    sol = cobra_model.optimize()
+    # compare objective and a few reaction fluxes
+    report = {
+        "objective_baseline": float(baseline_solution.objective_value) if baseline_solution is not None else None,
+        "objective_changed": float(sol.objective_value),
+    }
+    # aligned flux vectors (0.0 for reactions missing from a solution)
+    ids = pd.Index([rxn.id for rxn in cobra_model.reactions])
+    after = sol.fluxes.reindex(ids, fill_value=0.0).to_numpy(dtype=float)
+    if baseline_solution is not None:
+        before = baseline_solution.fluxes.reindex(ids, fill_value=0.0).to_numpy(dtype=float)
+    else:
+        before = np.zeros(len(ids))
+    diffs = pd.Series(after - before, index=ids)
+    report['top_flux_changes'] = top_abs_changes(diffs, top_k)
+    if flux_delta_path is not None:
+        report['flux_delta_path'] = str(flux_delta_path)
+        report['flux_delta_hash'] = write_artifact(
+            flux_delta_path, _flux_delta_writer(ids, before, after), store)
+    return report
+
+# ---------------------
+# Flux variability analysis (chunked, parallel)
+# ---------------------
+def _fva_setup(cobra_model, fraction_of_optimum):
+    # Pin the objective to >= fraction of its optimum (<= for minimization), then clear
+    # it; per-reaction objectives are set by coefficient in _fva_ranges.
+    from optlang.symbolics import Zero
+    optimum = cobra_model.slim_optimize(error_value=None)
+    if optimum is None:
+        raise RuntimeError("FVA needs a feasible model; the objective could not be optimized")
+    expression = cobra_model.solver.objective.expression
+    if cobra_model.solver.objective.direction == "max":
+        pin = cobra_model.problem.Constraint(expression, lb=fraction_of_optimum * optimum, name="fva_objective")
+    else:
+        pin = cobra_model.problem.Constraint(expression, ub=fraction_of_optimum * optimum, name="fva_objective")
+    cobra_model.add_cons_vars([pin])
+    cobra_model.objective = cobra_model.problem.Objective(Zero, direction="max")
+
+def _fva_ranges(cobra_model, reaction_ids):
+    # (n, 2) min/max net flux; each LP starts from the previous optimal basis
+    objective = cobra_model.solver.objective
+    out = np.empty((len(reaction_ids), 2))
+    for i, rid in enumerate(reaction_ids):
+        rxn = cobra_model.reactions.get_by_id(rid)
+        objective.set_linear_coefficients({rxn.forward_variable: 1, rxn.reverse_variable: -1})
+        for j, direction in enumerate(("min", "max")):
+            objective.direction = direction
+            out[i, j] = cobra_model.slim_optimize(error_value=np.nan)
+        objective.set_linear_coefficients({rxn.forward_variable: 0, rxn.reverse_variable: 0})
+    return out
+
+# Per-process FVA model (set in pool workers by _init_fva_worker)
+_FVA_STATE = {}
+
+def _init_fva_worker(cobra_model, fraction_of_optimum):
+    # Runs once per worker process: the pickled model is this worker's own solver copy
+    _fva_setup(cobra_model, fraction_of_optimum)
+    _FVA_STATE["model"] = cobra_model
+
+def _run_fva_chunk(reaction_ids):
+    return _fva_ranges(_FVA_STATE["model"], reaction_ids)
+
+def flux_variability(cobra_model, reaction_ids=None, fraction_of_optimum=1.0,
+                     n_workers=1, chunk_size=None, progress=None):
+    """
+    Min/max flux of each reaction (default: all) while the objective stays within
+    fraction_of_optimum of its optimum. Returns a DataFrame indexed by reaction id with
+    "minimum" and "maximum" columns (NaN where an LP fails), like cobra's FVA.
+    Reactions are split into chunks of chunk_size (default: ~4 chunks per worker) and
+    assigned to n_workers processes (None: CPU count). Each worker receives the model once
+    and keeps its solver, so every LP after the first is warm-started. n_workers=1 runs
+    in-process inside `with model:`, leaving the model unchanged.
+    progress, if given, is called after every chunk with {"done", "total",
+    "elapsed_s", "eta_s"}.
+    """
+    ids = [r.id for r in cobra_model.reactions] if reaction_ids is None else list(reaction_ids)
+    n = len(ids)
+    workers = n_workers or os.cpu_count() or 1
+    if chunk_size is None:
+        chunk_size = max(1, -(-n // (4 * workers)))
+    starts = list(range(0, n, chunk_size))
+    ranges = np.empty((n, 2))
+    t0 = time.perf_counter()
+    done = 0
+
+    def finished(lo, values):
+        nonlocal done
+        ranges[lo:lo + len(values)] = values
+        done += len(values)
+        if progress is not None:
+            elapsed = time.perf_counter() - t0
+            progress({"done": done, "total": n, "elapsed_s": elapsed,
+                      "eta_s": elapsed / done * (n - done)})
+
+    if workers == 1 or len(starts) <= 1:
+        with cobra_model:
+            _fva_setup(cobra_model, fraction_of_optimum)
+            for lo in starts:
+                finished(lo, _fva_ranges(cobra_model, ids[lo:lo + chunk_size]))
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_fva_worker,
+                                 initargs=(cobra_model, fraction_of_optimum)) as pool:
+            futures = {pool.submit(_run_fva_chunk, ids[lo:lo + chunk_size]): lo for lo in starts}
+            for fut in as_completed(futures):
+                finished(futures[fut], fut.result())
+    return pd.DataFrame(ranges, index=pd.Index(ids, name="reaction"), columns=["minimum", "maximum"])
+
+def fva_shift_report(baseline_ranges, changed_ranges, tol=1e-9):
+    """
+    Per reaction: baseline and perturbed [min, max] and whether the change is robust,
+    i.e. the two ranges do not overlap, so every optimal flux distribution moves.
+    """
+    report = []
+    for rid in changed_ranges.index:
+        b_lo, b_hi = baseline_ranges.loc[rid]
+        c_lo, c_hi = changed_ranges.loc[rid]
+        report.append({
+            "reaction": rid,
+            "baseline": [float(b_lo), float(b_hi)],
+            "changed": [float(c_lo), float(c_hi)],
+            "robust": bool(c_lo > b_hi + tol or c_hi < b_lo - tol),
+        })
+    return report
+
+# ---------------------
+# Warm-started FBA session across perturbations
+# ---------------------
+class FBASession:
+    """
+    Keeps one COBRA model (and its optlang problem) alive across gene-delta
+    perturbations. Each solve() sets only the reaction bounds that differ from
+    what is currently loaded in the LP (no `with model:` revert-and-reapply), then
+    re-optimizes from the previous optimal basis, which the solver retains between
+    calls. warm_start=False resets GLPK to the standard basis before every solve,
+    for comparison.
+    Per-perturbation timings are kept in `records`; `stats()` summarizes them.
+    solve(fva=True) adds FVA ranges for the reported reactions on the same warm solver;
+    baseline ranges are computed once per reaction and reused across perturbations.
+    Call close() (or use as a context manager) to restore the original bounds.
+    """
+    def __init__(self, cobra_model, baseline_solution=None, warm_start=True, gpr="mean"):
+        self.model = cobra_model
+        self.warm_start = warm_start
+        self.gpr = gpr
+        self.index = gene_reaction_index(cobra_model)
+        self.ids = pd.Index([rxn.id for rxn in self.index.reactions])
+        self.base_lower = np.array([r.lower_bound for r in self.index.reactions], dtype=float)
+        self.base_upper = np.array([r.upper_bound for r in self.index.reactions], dtype=float)
+        self._lower = self.base_lower.copy()
+        self._upper = self.base_upper.copy()
+        self.baseline = baseline_solution if baseline_solution is not None else cobra_model.optimize()
+        self._baseline_fluxes = self.baseline.fluxes.reindex(self.ids, fill_value=0.0).to_numpy(dtype=float)
+        self._baseline_fva = {}  # (fraction, reaction id) -> (min, max)
+        self.records = []
+
+    def _set_bounds(self, lower, upper):
+        changed = np.flatnonzero((lower != self._lower) | (upper != self._upper))
+        for i, lb, ub in zip(changed.tolist(), lower[changed].tolist(), upper[changed].tolist()):
+            self.index.reactions[i].bounds = (lb, ub)
+        self._lower, self._upper = lower, upper
+        return len(changed)
+
+    def _reset_basis(self):
+        if "glpk" not in type(self.model.solver).__module__:
+            return
+        import swiglpk
+        swiglpk.glp_std_basis(self.model.solver.problem)
+
+    def _fva(self, reaction_ids, fraction_of_optimum):
+        changed = flux_variability(self.model, reaction_ids, fraction_of_optimum)
+        missing = [rid for rid in reaction_ids if (fraction_of_optimum, rid) not in self._baseline_fva]
+        if missing:
+            # briefly back to the original bounds (only the perturbed ones are rewritten)
+            lower, upper = self._lower, self._upper
+            self._set_bounds(self.base_lower.copy(), self.base_upper.copy())
+            base = flux_variability(self.model, missing, fraction_of_optimum)
+            self._set_bounds(lower, upper)
+            for rid, row in zip(missing, base.to_numpy()):
+                self._baseline_fva[(fraction_of_optimum, rid)] = tuple(row)
+        baseline = pd.DataFrame([self._baseline_fva[(fraction_of_optimum, rid)] for rid in reaction_ids],
+                                index=changed.index, columns=changed.columns)
+        return fva_shift_report(baseline, changed)
+
+    def solve(self, gene_list, log2fc, top_k=20, flux_delta_path=None, store=None,
+              fva=False, fraction_of_optimum=1.0):
+        """
+        Apply one gene delta (same bound rule as apply_gene_delta_to_model), solve, report.
+        With fva, report["fva"] gives baseline/perturbed flux ranges of the top_k reactions
+        (see fva_shift_report).
+        """
+        t0 = time.perf_counter()
+        factor = self.index.factors(gene_list, log2fc, self.gpr)
+        lower = np.where(np.isfinite(self.base_lower), self.base_lower * factor, self.base_lower)
+        upper = np.where(np.isfinite(self.base_upper), self.base_upper * factor, self.base_upper)
+        n_changed = self._set_bounds(lower, upper)
+        t1 = time.perf_counter()
+        if not self.warm_start:
+            self._reset_basis()
+        sol = self.model.optimize()
+        t2 = time.perf_counter()
+        after = sol.fluxes.reindex(self.ids, fill_value=0.0).to_numpy(dtype=float)
+        report = {
+            "objective_baseline": float(self.baseline.objective_value),
+            "objective_changed": float(sol.objective_value),
+            "status": sol.status,
+            "top_flux_changes": top_abs_changes(pd.Series(after - self._baseline_fluxes, index=self.ids), top_k),
+        }
+        if flux_delta_path is not None:
+            report["flux_delta_path"] = str(flux_delta_path)
+            report["flux_delta_hash"] = write_artifact(
+                flux_delta_path, _flux_delta_writer(self.ids, self._baseline_fluxes, after), store)
+        record = {"n_changed_bounds": n_changed, "update_s": t1 - t0, "solve_s": t2 - t1}
+        if fva:
+            report["fva"] = self._fva([rid for rid, _ in report["top_flux_changes"]], fraction_of_optimum)
+            record["fva_s"] = time.perf_counter() - t2
+        self.records.append(record)
+        report["solve_stats"] = record
+        return report
+
+    def stats(self):
+        """Count, total and mean/p50/p95 solve and bound-update times over all solves."""
+        if not self.records:
+            return {"count": 0}
+        solve = np.array([r["solve_s"] for r in self.records])
+        update = np.array([r["update_s"] for r in self.records])
+        return {
+            "count": len(self.records),
+            "solve_s_total": float(solve.sum()),
+            "solve_s_mean": float(solve.mean()),
+            "solve_s_p50": float(np.percentile(solve, 50)),
+            "solve_s_p95": float(np.percentile(solve, 95)),
+            "update_s_mean": float(update.mean()),
+            "n_changed_bounds_mean": float(np.mean([r["n_changed_bounds"] for r in self.records])),
+        }
+
+    def close(self):
+        self._set_bounds(self.base_lower.copy(), self.base_upper.copy())
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
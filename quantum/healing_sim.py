@@ -11,11 +11,18 @@ Requirements (add to environment.yml / Docker):
   - scipy
 """
 
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 import json, hashlib, os
 import numpy as np
 import pandas as pd
 
+from .artifacts import as_store, write_artifact
+from .pipeline import Stage, StagePipeline, file_stamp
+from .eeg_stream import EEG_BANDS, band_means, edf_bandpower_chunked
+from .fba import FBASession, apply_gene_delta_to_model, gene_delta_bounds, run_fba_and_report
+
 # External libs (import lazily to avoid failing if not installed)
 def import_mne():
     import mne
@@ -28,18 +35,73 @@ def import_cobra():
 # ---------------------
 # Utility functions
 # ---------------------
-def sha256_file(path: Path):
-    h = hashlib.sha256()
-    with open(path, "rb") as f:
-        for chunk in iter(lambda: f.read(8192), b""):
-            h.update(chunk)
-    return h.hexdigest()
-
 def save_json(obj, path: Path):
     path.parent.mkdir(parents=True, exist_ok=True)
     with open(path, "w") as fh:
         json.dump(obj, fh, indent=2)
 
+# ---------------------
+# Deterministic projection matrices (cached)
+# ---------------------
+class ProjectionCache:
+    """
+    LRU of seeded Gaussian projection matrices, keyed by (seed, shape, scale, dtype).
+    A matrix is bit-identical to np.random.RandomState(seed).normal(scale=scale, size=shape),
+    so cached and uncached runs give the same features.
+    With cache_dir set, matrices are also saved as .npy files (written to a temp
+    file and renamed, so concurrent workers never read a partial file) and loaded
+    back memory-mapped, so worker processes share one copy via the page cache.
+    Returned arrays are read-only.
+    """
+    def __init__(self, maxsize=8, cache_dir=None):
+        self.maxsize = maxsize
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key):
+        seed, (rows, cols), scale, dtype = key
+        return self.cache_dir / f"proj_s{seed}_{rows}x{cols}_sc{scale!r}_{dtype}.npy"
+
+    def _build(self, key):
+        seed, shape, scale, dtype = key
+        if self.cache_dir is not None:
+            path = self._path(key)
+            if not path.exists():
+                mat = np.random.RandomState(seed).normal(scale=scale, size=shape).astype(dtype, copy=False)
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
+                tmp = path.with_name(f"{path.stem}.{os.getpid()}.tmp.npy")
+                np.save(tmp, mat)
+                os.replace(tmp, path)
+            return np.load(path, mmap_mode='r')
+        mat = np.random.RandomState(seed).normal(scale=scale, size=shape).astype(dtype, copy=False)
+        mat.flags.writeable = False
+        return mat
+
+    def get(self, seed, shape, scale=1.0, dtype=np.float64):
+        key = (int(seed), tuple(int(n) for n in shape), float(scale), np.dtype(dtype).name)
+        mat = self._entries.get(key)
+        if mat is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return mat
+        self.misses += 1
+        mat = self._build(key)
+        self._entries[key] = mat
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return mat
+
+    def clear(self):
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+# Shared by eeg_to_features / features_to_gene_delta; set PDPBIOGEN_PROJECTION_CACHE
+# (or PROJECTION_CACHE.cache_dir) to persist matrices across processes and runs.
+PROJECTION_CACHE = ProjectionCache(cache_dir=os.environ.get("PDPBIOGEN_PROJECTION_CACHE"))
+
 # ---------------------
 # EEG loader + deterministic preprocessing
 # ---------------------
@@ -47,6 +109,7 @@ def load_eeg_edf(edf_path: str, picks=None):
     """
     Load EDF via MNE with deterministic processing.
     Returns raw object.
+    The whole recording is preloaded; for long recordings see edf_bandpower_chunked.
     """
     mne = import_mne()
     raw = mne.io.read_raw_edf(edf_path, preload=True, verbose=False)
@@ -55,6 +118,19 @@ def load_eeg_edf(edf_path: str, picks=None):
     raw.set_eeg_reference('average', projection=False)
     return raw
 
+def bandpower_features(data, sfreq, bands=EEG_BANDS):
+    """
+    Mean Welch PSD per band for every channel, flattened channel-major
+    (ch0 bands..., ch1 bands..., ...).
+    data: (..., n_channels, n_times); leading axes (e.g. a stack of recordings) are kept.
+    One welch call covers all channels; band means come from a cumulative sum of
+    the PSD indexed at the band edges instead of a boolean mask per band.
+    """
+    from scipy.signal import welch
+    data = np.asarray(data)
+    f, Pxx = welch(data, fs=sfreq, nperseg=int(sfreq * 2), axis=-1)
+    return band_means(f, Pxx, bands)
+
 def eeg_to_features(raw, sfreq_target=128, n_features=64, seed=42):
     """
     Deterministic feature extraction:
@@ -62,29 +138,31 @@ def eeg_to_features(raw, sfreq_target=128, n_features=64, seed=42):
       - compute bandpower in canonical bands per channel and flatten
       - reduce to n_features with deterministic PCA-like projection (SVD with fixed seed)
     """
-    # get data
-    data = raw.get_data(picks='eeg')  # (n_channels, n_times)
-    # resample deterministically
+    # resample deterministically (copy so the caller's raw keeps its rate)
     raw_res = raw.copy().resample(sfreq_target)
-    data = raw_res.get_data()
-    # compute simple bandpowers per channel for delta/theta/alpha/beta/gamma
-    bands = [(1,4),(4,8),(8,12),(12,30),(30,45)]
-    bp = []
-    from scipy.signal import welch
-    for ch in range(data.shape[0]):
-        f, Pxx = welch(data[ch], fs=raw_res.info['sfreq'], nperseg=int(raw_res.info['sfreq']*2))
-        for (lo,hi) in bands:
-            mask = (f>=lo)&(f<=hi)
-            bp.append(Pxx[mask].mean())
-    bp = np.array(bp)  # shape (n_channels * n_bands,)
-    # deterministic projection to n_features via randomized SVD with fixed seed
-    rs = np.random.RandomState(seed)
-    # create deterministic projection matrix via seeded normal
-    proj = rs.normal(size=(bp.size, n_features))
-    feats = bp.dot(proj)  # shape (n_features,)
+    data = raw_res.get_data()  # (n_channels, n_times)
+    # bandpowers per channel for delta/theta/alpha/beta/gamma
+    bp = bandpower_features(data, raw_res.info['sfreq'])  # shape (n_channels * n_bands,)
+    return bandpower_to_features(bp, n_features=n_features, seed=seed)
+
+def bandpower_to_features(bp, n_features=64, seed=42):
+    """
+    Deterministic projection of bandpower vectors to n_features, z-scored per row.
+    bp: (n_bp,) for one recording or (n_recordings, n_bp) for a batch (one matmul).
+    """
+    bp = np.asarray(bp)
+    # deterministic projection matrix via seeded normal (cached across calls)
+    proj = PROJECTION_CACHE.get(seed, (bp.shape[-1], n_features))
+    feats = bp.dot(proj)  # shape (..., n_features)
     # normalize
-    feats = (feats - feats.mean()) / (feats.std() + 1e-12)
-    return feats
+    mean = feats.mean(axis=-1, keepdims=True)
+    std = feats.std(axis=-1, keepdims=True)
+    return (feats - mean) / (std + 1e-12)
+
+def eeg_to_features_chunked(edf_path: str, sfreq_target=128, n_features=64, seed=42, block_s=60.0):
+    """eeg_to_features(load_eeg_edf(edf_path)) computed with edf_bandpower_chunked."""
+    bp = edf_bandpower_chunked(edf_path, sfreq_target=sfreq_target, block_s=block_s)
+    return bandpower_to_features(bp, n_features=n_features, seed=seed)
 
 # ---------------------
 # Surrogate mapping: EEG features -> gene expression delta
@@ -92,81 +170,130 @@ def eeg_to_features(raw, sfreq_target=128, n_features=64, seed=42):
 def features_to_gene_delta(feats, ngenes=200, seed=0):
     """
     Deterministic mapping: linear projection + tanh nonlinear to keep values bounded.
+    feats may be (n_features,) or (n_recordings, n_features); a batch is mapped in one matmul.
     """
-    rs = np.random.RandomState(seed)
-    W = rs.normal(scale=0.01, size=(feats.size, ngenes))
+    feats = np.asarray(feats)
+    W = PROJECTION_CACHE.get(seed, (feats.shape[-1], ngenes), scale=0.01)
     delta = np.tanh(feats.dot(W))  # between -1 and 1
     # scale to plausible fold-change-like values (log2 scale small)
     # interpret as small log2 fold changes
     log2fc = delta * 0.5  # up to +/-0.5 log2 fold-change
-    return log2fc  # length ngenes
+    return log2fc  # length ngenes (per row)
 
 # ---------------------
-# Apply gene delta to COBRA model (simple deterministic mapping)
+# Orchestration function
 # ---------------------
-def apply_gene_delta_to_model(cobra_model, gene_list, log2fc, base_expression=None):
-    """
-    gene_list: list of gene IDs aligned with log2fc
-    base_expression: optional baseline expression dict {gene: value}
-    We implement a naive mapping: low expression reduces upper bounds of reactions associated with that gene.
-    For real models use GPR parsing; here we use a lightweight approach for prototyping.
-    """
-    # Build gene->score mapping
-    gene_score = {g: float(fc) for g, fc in zip(gene_list, log2fc)}
-    # Apply: for every reaction, if it has genes, compute min gene score and scale flux bounds.
-    for rxn in cobra_model.reactions:
-        genes = [g.id for g in rxn.genes] if hasattr(rxn, 'genes') else []
-        if not genes:
-            continue
-        # compute a factor in (0.2, 1.5) from gene scores
-        vals = [gene_score.get(g, 0.0) for g in genes]
-        mean_fc = float(np.mean(vals)) if vals else 0.0
-        factor = 1.0 + (mean_fc)  # mean_fc is in -0.5..0.5 -> factor in 0.5..1.5
-        # Clip factor to avoid runaway
-        factor = max(0.2, min(2.0, factor))
-        # apply to bounds deterministically (scale upper and lower)
-        # skip blocked/unbounded reactions
-        if rxn.upper_bound is not None and np.isfinite(rxn.upper_bound):
-            rxn.upper_bound = rxn.upper_bound * factor
-        if rxn.lower_bound is not None and np.isfinite(rxn.lower_bound):
-            rxn.lower_bound = rxn.lower_bound * factor
-    return cobra_model
+def _eeg_to_gene_delta(eeg_path, gene_list, outdir: Path, seed, store=None, chunked=False):
+    """
+    Steps 1-2: EEG -> features -> gene delta; writes both artifacts under outdir.
+    With an ArtifactStore each step is skipped when its inputs (EEG file hash or
+    features hash, gene list, seed) already have recorded outputs; those are linked
+    into outdir instead and listed in manifest["cached_stages"].
+    chunked computes the features with eeg_to_features_chunked.
+    """
+    outdir.mkdir(parents=True, exist_ok=True)
+    feats_path = outdir / "eeg_features.npy"
+    gene_delta_path = outdir / "gene_delta.tsv"
+    cached = []
 
-# ---------------------
-# Run flux-balance analysis & return key flux changes
-# ---------------------
-def run_fba_and_report(cobra_model, baseline_solution=None):
-    cobra = import_cobra()
-    # get baseline if not provided
-    if baseline_solution is None:
-        baseline_solution = cobra_model.optimize()
-    # run FBA on current model
-    sol = cobra_model.optimize()
-    # compare objective and a few reaction fluxes
-    report = {
-        "objective_baseline": float(baseline_solution.objective_value) if baseline_solution is not None else None,
-        "objective_changed": float(sol.objective_value),
+    feats = None
+    if store is not None:
+        feats_key = store.stage_key("eeg_to_features", eeg=store.file_digest(eeg_path),
+                                    seed=seed, n_features=64, chunked=bool(chunked))
+        hit = store.get_stage(feats_key)
+        if hit is not None:
+            feats_hash = hit["blobs"]["features"]
+            store.link(feats_hash, feats_path)
+            feats = np.load(store.blob_path(feats_hash))
+            cached.append("eeg_to_features")
+    if feats is None:
+        if chunked:
+            feats = eeg_to_features_chunked(eeg_path, seed=seed, n_features=64)
+        else:
+            raw = load_eeg_edf(eeg_path)
+            feats = eeg_to_features(raw, seed=seed, n_features=64)
+        feats_hash = write_artifact(feats_path, lambda fh: np.save(fh, feats), store)
+        if store is not None:
+            store.put_stage(feats_key, {"features": feats_hash})
+
+    log2fc = None
+    if store is not None:
+        genes_hash = hashlib.sha256("\n".join(gene_list).encode()).hexdigest()
+        delta_key = store.stage_key("features_to_gene_delta", features=feats_hash,
+                                    genes=genes_hash, seed=seed + 1)
+        hit = store.get_stage(delta_key)
+        if hit is not None:
+            gene_delta_hash = hit["blobs"]["gene_delta"]
+            store.link(gene_delta_hash, gene_delta_path)
+            log2fc = pd.read_csv(store.blob_path(gene_delta_hash), sep="\t",
+                                 float_precision="round_trip")["log2fc"].to_numpy()
+            cached.append("features_to_gene_delta")
+    if log2fc is None:
+        log2fc = features_to_gene_delta(feats, ngenes=len(gene_list), seed=seed+1)
+        gene_delta_df = pd.DataFrame({"gene": gene_list, "log2fc": log2fc})
+        gene_delta_hash = write_artifact(
+            gene_delta_path, lambda fh: fh.write(gene_delta_df.to_csv(sep="\t", index=False).encode()), store)
+        if store is not None:
+            store.put_stage(delta_key, {"gene_delta": gene_delta_hash})
+
+    manifest = {
+        "feats_path": str(feats_path),
+        "feats_hash": feats_hash,
+        "gene_delta_path": str(gene_delta_path),
+        "gene_delta_hash": gene_delta_hash,
     }
-    # pick top N reactions by absolute change
-    diffs = {}
-    for rxn in cobra_model.reactions:
-        r_id = rxn.id
-        v_before = float(baseline_solution.fluxes.get(r_id, 0.0)) if baseline_solution is not None else 0.0
-        v_after = float(sol.fluxes.get(r_id, 0.0))
-        diffs[r_id] = v_after - v_before
-    # sort by absolute change
-    top = sorted(diffs.items(), key=lambda kv: abs(kv[1]), reverse=True)[:20]
-    report['top_flux_changes'] = top
-    return report
+    if store is not None:
+        manifest["cached_stages"] = cached
+    return log2fc, manifest
+
+def _apply_and_report(model, baseline, gene_list, log2fc, flux_delta_path=None, store=None):
+    """Steps 5-6 inside `with model:` so bound changes are reverted afterwards."""
+    with model:
+        apply_gene_delta_to_model(model, gene_list, log2fc)
+        return run_fba_and_report(model, baseline_solution=baseline,
+                                  flux_delta_path=flux_delta_path, store=store)
+
+def _fba_key(store, model_hash, manifest, write_flux_delta, fva=False):
+    if store is None or model_hash is None:
+        return None
+    return store.stage_key("fba", model=model_hash, gene_delta=manifest["gene_delta_hash"],
+                           flux_delta=bool(write_flux_delta), fva=bool(fva))
+
+def _fba_stage(store, key, flux_path, solve):
+    """
+    Steps 3-6 through the store: a report recorded under `key` is reused (its flux-delta
+    blob linked to flux_path) without touching the model; otherwise solve() runs and its
+    report is recorded. Returns (report, cached).
+    """
+    if key is not None:
+        hit = store.get_stage(key)
+        if hit is not None:
+            report = dict(hit["meta"]["report"])
+            report["top_flux_changes"] = [tuple(item) for item in report["top_flux_changes"]]
+            if flux_path is not None:
+                store.link(hit["blobs"]["flux_delta"], flux_path)
+                report["flux_delta_path"] = str(flux_path)
+            return report, True
+    report = solve()
+    if key is not None:
+        blobs = {"flux_delta": report["flux_delta_hash"]} if flux_path is not None else {}
+        # per-run fields are not part of the reusable result
+        stored = {k: v for k, v in report.items() if k not in ("flux_delta_path", "solve_stats")}
+        store.put_stage(key, blobs, {"report": stored})
+    return report, False
+
+def _default_gene_list(ng=200):
+    # synthetic gene list
+    return [f"GENE{i:05d}" for i in range(ng)]
 
-# ---------------------
-# Orchestration function
-# ---------------------
 def run_healing_sim(eeg_path: str,
                     cobra_sbml_path: str,
                     gene_list: list = None,
                     outdir: str = "results/healing_sim",
-                    seed: int = 42):
+                    seed: int = 42,
+                    write_flux_delta: bool = False,
+                    store=None,
+                    chunked: bool = False):
     """
     Run the full deterministic pipeline:
       - load EEG
@@ -175,47 +302,265 @@ def run_healing_sim(eeg_path: str,
       - load COBRA model and apply delta
       - run FBA
       - save artifacts and manifest
+    With write_flux_delta the full flux-delta vector goes to flux_delta.parquet.
+    `store` (an ArtifactStore or its root directory) keeps artifacts content-addressed
+    and skips stages whose inputs were seen before; with a hit on the FBA stage the
+    SBML model is not even parsed.
+    chunked streams the EDF in blocks (eeg_to_features_chunked) instead of preloading it;
+    features agree with the default path up to filter edge effects and the
+    resampling method.
     Returns manifest dictionary.
     """
     outdir = Path(outdir)
-    outdir.mkdir(parents=True, exist_ok=True)
+    store = as_store(store)
+    if gene_list is None:
+        gene_list = _default_gene_list()
 
-    # Step 1: EEG -> features
-    raw = load_eeg_edf(eeg_path)
-    feats = eeg_to_features(raw, seed=seed, n_features=64)
-    feats_path = outdir / "eeg_features.npy"
-    np.save(feats_path, feats)
-    feats_hash = sha256_file(feats_path)
+    # Steps 1-2: EEG -> features -> gene delta
+    log2fc, manifest = _eeg_to_gene_delta(eeg_path, gene_list, outdir, seed, store, chunked)
+
+    flux_path = outdir / "flux_delta.parquet" if write_flux_delta else None
 
-    # Step 2: mapping -> gene delta
+    def solve():
+        # Step 3: load COBRA model
+        cobra = import_cobra()
+        model = cobra.io.read_sbml_model(cobra_sbml_path)
+        # Step 4: baseline solution
+        baseline = model.optimize()
+        # Steps 5-6: apply delta, run FBA & report
+        return _apply_and_report(model, baseline, gene_list, log2fc, flux_path, store)
+
+    model_hash = store.file_digest(cobra_sbml_path) if store is not None else None
+    key = _fba_key(store, model_hash, manifest, write_flux_delta)
+    manifest["fba_report"], cached = _fba_stage(store, key, flux_path, solve)
+    if cached:
+        manifest["cached_stages"].append("fba")
+    save_json(manifest, outdir / "manifest.json")
+    return manifest
+
+# ---------------------
+# Batch runner: one model parse + baseline for many recordings
+# ---------------------
+_WORKER_STATE = {}
+
+def _init_batch_worker(model, baseline):
+    # Runs once per worker process; the pickled model arrives here a single time
+    _WORKER_STATE["session"] = FBASession(model, baseline)
+
+def _run_batch_item(eeg_path, gene_list, outdir, seed, write_flux_delta=False, store=None, model_hash=None,
+                    fva=False, chunked=False):
+    outdir = Path(outdir)
+    log2fc, manifest = _eeg_to_gene_delta(eeg_path, gene_list, outdir, seed, store, chunked)
+    manifest["eeg_path"] = str(eeg_path)
+    flux_path = outdir / "flux_delta.parquet" if write_flux_delta else None
+    solve = lambda: _WORKER_STATE["session"].solve(gene_list, log2fc, flux_delta_path=flux_path,
+                                                   store=store, fva=fva)
+    key = _fba_key(store, model_hash, manifest, write_flux_delta, fva)
+    manifest["fba_report"], cached = _fba_stage(store, key, flux_path, solve)
+    if cached:
+        manifest["cached_stages"].append("fba")
+    save_json(manifest, outdir / "manifest.json")
+    return manifest
+
+def run_healing_sim_batch(eeg_paths,
+                          cobra_sbml_path: str = None,
+                          gene_list: list = None,
+                          outdir: str = "results/healing_sim_batch",
+                          seed: int = 42,
+                          n_workers: int = None,
+                          model=None,
+                          write_flux_delta: bool = False,
+                          store=None,
+                          fva: bool = False,
+                          chunked: bool = False):
+    """
+    run_healing_sim over many recordings with one SBML parse and one baseline FBA.
+    Each recording gets its own outdir/<index>_<stem>/ with the same artifacts and
+    manifest as run_healing_sim. Each worker holds one FBASession, so successive
+    recordings only update the bounds that differ and re-solve from the previous
+    basis; the original bounds are restored afterwards. With n_workers != 1 recordings run in
+    a process pool whose workers each receive the pickled model once (initializer),
+    not once per recording. Pass an already loaded `model` to skip the SBML parse.
+    `store` is shared by all workers (see run_healing_sim); the FBA stage is only
+    reused across runs when the model comes from cobra_sbml_path, whose hash keys it.
+    With fva each report also carries FVA ranges of its top flux changes
+    (FBASession.solve(fva=True)), so unstable single-solution changes can be told apart.
+    chunked is passed on to the EEG step (see run_healing_sim).
+    Returns the batch manifest (also written to outdir/batch_manifest.json).
+    """
+    outdir = Path(outdir)
+    outdir.mkdir(parents=True, exist_ok=True)
+    store = as_store(store)
     if gene_list is None:
-        # generate synthetic gene list
-        ng = 200
-        gene_list = [f"GENE{i:05d}" for i in range(ng)]
-    log2fc = features_to_gene_delta(feats, ngenes=len(gene_list), seed=seed+1)
-    gene_delta_df = pd.DataFrame({"gene": gene_list, "log2fc": log2fc})
-    gene_delta_path = outdir / "gene_delta.tsv"
-    gene_delta_df.to_csv(gene_delta_path, sep="\t", index=False)
-    gene_hash = sha256_file(gene_delta_path)
+        gene_list = _default_gene_list()
+    model_hash = store.file_digest(cobra_sbml_path) if store is not None and cobra_sbml_path else None
+    if model is None:
+        cobra = import_cobra()
+        model = cobra.io.read_sbml_model(cobra_sbml_path)
+    baseline = model.optimize()
+
+    eeg_paths = [str(p) for p in eeg_paths]
+    item_dirs = [str(outdir / f"{i:05d}_{Path(p).stem}") for i, p in enumerate(eeg_paths)]
+    jobs = [(p, gene_list, d, seed, write_flux_delta, store, model_hash, fva, chunked)
+            for p, d in zip(eeg_paths, item_dirs)]
+    if n_workers == 1 or len(jobs) <= 1:
+        _init_batch_worker(model, baseline)
+        try:
+            results = [_run_batch_item(*job) for job in jobs]
+        finally:
+            _WORKER_STATE.pop("session").close()
+    else:
+        with ProcessPoolExecutor(max_workers=n_workers, initializer=_init_batch_worker,
+                                 initargs=(model, baseline)) as pool:
+            results = list(pool.map(_run_batch_item, *zip(*jobs)))
+
+    batch_manifest = {
+        "cobra_sbml_path": str(cobra_sbml_path) if cobra_sbml_path else None,
+        "objective_baseline": float(baseline.objective_value),
+        "n_recordings": len(results),
+        "solve_s_total": float(sum(r["fba_report"].get("solve_stats", {}).get("solve_s", 0.0) for r in results)),
+        "recordings": results,
+    }
+    if store is not None:
+        batch_manifest["stage_hits"] = sum(len(r["cached_stages"]) for r in results)
+    save_json(batch_manifest, outdir / "batch_manifest.json")
+    return batch_manifest
+
+# ---------------------
+# healing_sim as a resumable stage pipeline
+# ---------------------
+def _stage_load_eeg(params):
+    return load_eeg_edf(params["eeg_path"])
 
-    # Step 3: load COBRA model
+def _save_raw(raw, path):
+    raw.save(str(path), overwrite=True, verbose=False)
+
+def _load_raw(path):
+    return import_mne().io.read_raw_fif(str(path), preload=True, verbose=False)
+
+def _stage_features(params, raw):
+    return eeg_to_features(raw, seed=params["seed"], n_features=64)
+
+def _save_npy(feats, path):
+    return write_artifact(path, lambda fh: np.save(fh, feats))
+
+def _stage_gene_delta(params, feats):
+    gene_list = params["gene_list"]
+    log2fc = features_to_gene_delta(feats, ngenes=len(gene_list), seed=params["seed"]+1)
+    return pd.DataFrame({"gene": gene_list, "log2fc": log2fc})
+
+def _save_tsv(df, path):
+    return write_artifact(path, lambda fh: fh.write(df.to_csv(sep="\t", index=False).encode()))
+
+def _load_tsv(path):
+    return pd.read_csv(path, sep="\t", float_precision="round_trip")
+
+def _stage_load_model(params):
     cobra = import_cobra()
-    model = cobra.io.read_sbml_model(cobra_sbml_path)
+    model = cobra.io.read_sbml_model(params["cobra_sbml_path"])
+    return model, model.optimize()
 
-    # Step 4: baseline solution
-    baseline = model.optimize()
+def _stage_apply(params, gene_delta, model_and_baseline):
+    model, _ = model_and_baseline
+    return gene_delta_bounds(model, list(gene_delta["gene"]), gene_delta["log2fc"].to_numpy())
 
-    # Step 5: apply delta
-    model_mod = apply_gene_delta_to_model(model, gene_list, log2fc)
+def _stage_fba(params, model_and_baseline, bounds):
+    model, baseline = model_and_baseline
+    flux_path = Path(params["outdir"]) / "flux_delta.parquet" if params["write_flux_delta"] else None
+    with model:
+        for rid, lb, ub in zip(bounds["reactions"], bounds["lower"].tolist(), bounds["upper"].tolist()):
+            model.reactions.get_by_id(rid).bounds = (lb, ub)
+        return run_fba_and_report(model, baseline_solution=baseline, flux_delta_path=flux_path)
 
-    # Step 6: run FBA & report
-    report = run_fba_and_report(model_mod, baseline_solution=baseline)
-    manifest = {
-        "feats_path": str(feats_path),
-        "feats_hash": feats_hash,
-        "gene_delta_path": str(gene_delta_path),
-        "gene_delta_hash": gene_hash,
-        "fba_report": report
+def _fba_files(report):
+    # the flux-delta Parquet is written beside the report, outside the checkpoint
+    if "flux_delta_path" not in report:
+        return {}
+    return {report["flux_delta_path"]: report["flux_delta_hash"]}
+
+def _save_report(report, path):
+    return write_artifact(path, lambda fh: fh.write(json.dumps(report, indent=2).encode()))
+
+def _load_report(path):
+    with open(path) as fh:
+        return json.load(fh)
+
+# Steps 1-6 of run_healing_sim; the model load is shared by all subjects
+HEALING_STAGES = (
+    Stage("load_eeg_edf", _stage_load_eeg, params=("eeg_path", "eeg_stamp"),
+          filename="eeg_raw.fif", save=_save_raw, load=_load_raw),
+    Stage("eeg_to_features", _stage_features, inputs=("load_eeg_edf",), params=("seed",),
+          filename="eeg_features.npy", save=_save_npy, load=np.load),
+    Stage("features_to_gene_delta", _stage_gene_delta, inputs=("eeg_to_features",),
+          params=("gene_list", "seed"), filename="gene_delta.tsv", save=_save_tsv, load=_load_tsv),
+    Stage("load_model", _stage_load_model, shared=True, params=("cobra_sbml_path", "cobra_sbml_stamp"),
+          filename="model.pkl"),
+    Stage("apply", _stage_apply, inputs=("features_to_gene_delta", "load_model"), params=(),
+          filename="bounds.pkl"),
+    Stage("fba", _stage_fba, inputs=("load_model", "apply"), params=("outdir", "write_flux_delta"),
+          filename="fba_report.json", save=_save_report, load=_load_report, files=_fba_files),
+)
+
+def run_healing_sim_pipeline(eeg_paths,
+                             cobra_sbml_path: str,
+                             gene_list: list = None,
+                             outdir: str = "results/healing_sim_pipeline",
+                             seed: int = 42,
+                             n_workers: int = 1,
+                             write_flux_delta: bool = False):
+    """
+    run_healing_sim for many recordings as a resumable StagePipeline over HEALING_STAGES.
+    Every stage output is checkpointed under outdir/<index>_<stem>/ (the model under
+    outdir/_shared/), so rerunning after a crash, or with more recordings, only runs the
+    stages that have not completed. The flux-delta Parquet (write_flux_delta) is recorded
+    in the fba stage's marker, so deleting or editing it reruns that stage. With
+    n_workers != 1 subjects run concurrently in a process pool, and the model load
+    overlaps with the EEG stages.
+    Writes a manifest.json per recording (same fields as run_healing_sim, plus per-stage
+    timings and whether each stage was resumed) and outdir/pipeline_manifest.json.
+    """
+    outdir = Path(outdir)
+    if gene_list is None:
+        gene_list = _default_gene_list()
+    eeg_paths = [str(p) for p in eeg_paths]
+    subjects = {}
+    for i, p in enumerate(eeg_paths):
+        sid = f"{i:05d}_{Path(p).stem}"
+        # size + mtime in the params, so an edited input file invalidates its stages
+        subjects[sid] = {"eeg_path": p, "eeg_stamp": file_stamp(p), "outdir": str(outdir / sid),
+                         "gene_list": list(gene_list), "seed": seed,
+                         "write_flux_delta": bool(write_flux_delta)}
+    shared = {"cobra_sbml_path": str(cobra_sbml_path), "cobra_sbml_stamp": file_stamp(cobra_sbml_path)}
+    results = StagePipeline(HEALING_STAGES, outdir, n_workers).run(subjects, shared)
+
+    recordings = []
+    for sid, res in results.items():
+        manifest = {"eeg_path": subjects[sid]["eeg_path"], "status": res["status"]}
+        stages = res["stages"]
+        if res["status"] == "done":
+            # intermediate stages skipped on resume (checkpoint deleted, output not
+            # needed again) have no marker
+            feats = stages.get("eeg_to_features", {})
+            delta = stages.get("features_to_gene_delta", {})
+            manifest.update({
+                "feats_path": feats.get("path"),
+                "feats_hash": feats.get("sha256"),
+                "gene_delta_path": delta.get("path"),
+                "gene_delta_hash": delta.get("sha256"),
+                "fba_report": _load_report(stages["fba"]["path"]),
+            })
+        else:
+            manifest["error"] = res["error"]
+        manifest["stages"] = {name: {"resumed": m["resumed"], "elapsed_s": m["elapsed_s"]}
+                              for name, m in stages.items()}
+        save_json(manifest, outdir / sid / "manifest.json")
+        recordings.append(manifest)
+
+    pipeline_manifest = {
+        "cobra_sbml_path": str(cobra_sbml_path),
+        "n_recordings": len(recordings),
+        "n_failed": sum(r["status"] != "done" for r in recordings),
+        "recordings": recordings,
     }
-    save_json(manifest, outdir / "manifest.json")
-    return manifest
+    save_json(pipeline_manifest, outdir / "pipeline_manifest.json")
+    return pipeline_manifest
@@ -0,0 +1,285 @@
+"""
+quantum.pipeline
+Resumable stage DAG executor: Stages declared in dependency order are run for many
+subjects, every output is checkpointed, and a rerun skips the stages whose
+checkpoint fingerprint still matches. Used by healing_sim.run_healing_sim_pipeline.
+"""
+
+from collections import defaultdict, deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+import json, hashlib, os, time
+
+from .artifacts import write_artifact
+
+class Stage:
+    """
+    One node of a StagePipeline. fn(params, *inputs) returns the stage's value, where
+    inputs are the values of the stages named in `inputs`. The value is checkpointed to
+    `filename` with save(value, path) (which may return a sha256) and read back with
+    load(path); the default is pickle. A stage that also writes other files returns
+    them from files(value) as {path: sha256}; they are recorded in the marker, and the
+    stage reruns if one of them is later deleted or modified. `params` names the param
+    keys fn reads: only those are hashed into the stage's fingerprint and passed to fn
+    (None: all of them), so a param that only a later stage reads does not rerun this
+    one. A shared stage runs once per pipeline, not once per subject, and may only
+    depend on other shared stages. fn/save/load/files must be module-level functions so
+    stages can be sent to worker processes.
+    """
+    def __init__(self, name, fn, inputs=(), shared=False, filename=None, save=None, load=None,
+                 files=None, params=None):
+        self.name = name
+        self.fn = fn
+        self.inputs = tuple(inputs)
+        self.shared = shared
+        self.filename = filename or f"{name}.pkl"
+        self.save = save or _save_pickle
+        self.load = load or _load_pickle
+        self.files = files
+        self.params = None if params is None else tuple(params)
+
+    def select_params(self, params):
+        """The subset of params this stage reads (missing keys are left out)."""
+        if self.params is None:
+            return dict(params)
+        return {k: params[k] for k in self.params if k in params}
+
+def _save_pickle(value, path):
+    import pickle
+    return write_artifact(path, lambda fh: pickle.dump(value, fh, protocol=pickle.HIGHEST_PROTOCOL))
+
+def _load_pickle(path):
+    import pickle
+    with open(path, "rb") as fh:
+        return pickle.load(fh)
+
+# Shared-stage values loaded in this process, keyed by checkpoint path and mtime
+_CHECKPOINT_MEMO = {}
+
+def _load_checkpoint(stage, path):
+    if not stage.shared:
+        return stage.load(path)
+    key = (str(path), os.stat(path).st_mtime_ns)
+    if key not in _CHECKPOINT_MEMO:
+        _CHECKPOINT_MEMO.clear()
+        _CHECKPOINT_MEMO[key] = stage.load(path)
+    return _CHECKPOINT_MEMO[key]
+
+def file_stamp(path):
+    """[size, mtime_ns] of a file: cheap to compare, changes whenever the file is rewritten."""
+    st = os.stat(path)
+    return [st.st_size, st.st_mtime_ns]
+
+def _files_unchanged(files):
+    for path, rec in files.items():
+        if not os.path.exists(path) or file_stamp(path) != rec["stamp"]:
+            return False
+    return True
+
+def _execute_stage(stage, params, inputs, out_path, marker_path, fingerprint):
+    """
+    Run one stage and checkpoint it. inputs are values, or (Stage, path) pairs to load
+    from checkpoints. The marker is written last, so a crash mid-stage leaves no marker
+    and the stage reruns on resume. Returns (marker, value).
+    """
+    args = [_load_checkpoint(*v) if isinstance(v, tuple) and isinstance(v[0], Stage) else v
+            for v in inputs]
+    t0 = time.perf_counter()
+    value = stage.fn(params, *args)
+    elapsed = time.perf_counter() - t0
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    digest = stage.save(value, out_path)
+    files = stage.files(value) if stage.files is not None else {}
+    marker = {"stage": stage.name, "fingerprint": fingerprint, "path": str(out_path),
+              "sha256": digest, "elapsed_s": elapsed,
+              "files": {str(p): {"sha256": d, "stamp": file_stamp(p)} for p, d in files.items()}}
+    write_artifact(marker_path, lambda fh: fh.write(json.dumps(marker, indent=2).encode()))
+    return marker, value
+
+def _execute_stage_remote(*args):
+    # worker processes only hand back the marker; values travel via checkpoints
+    return _execute_stage(*args)[0]
+
+class StagePipeline:
+    """
+    Runs a list of Stages (declared in dependency order) for many subjects, with every
+    stage's output checkpointed under workdir/<subject>/ (shared stages: workdir/_shared/).
+    Each (stage, subject) task has a fingerprint hashed from the stage name, the
+    subject params the stage declares (Stage.params) and the fingerprints of its
+    inputs. A task whose marker holds the same fingerprint is complete and is not rerun,
+    so an interrupted run resumes after its last checkpointed stage, and a changed param
+    reruns only the stages that read it and the stages downstream of them.
+    Tasks start as soon as their inputs are done: with n_workers != 1 they run in a
+    process pool, so different subjects (and shared stages such as the model load)
+    proceed concurrently. A failing task stops only its own downstream tasks.
+    """
+    def __init__(self, stages, workdir, n_workers=1):
+        self.stages = list(stages)
+        self.workdir = Path(workdir)
+        self.n_workers = n_workers
+        seen = {}
+        for st in self.stages:
+            if st.name in seen:
+                raise ValueError(f"Duplicate stage name: {st.name}")
+            for dep in st.inputs:
+                if dep not in seen:
+                    raise ValueError(f"Stage {st.name} depends on {dep}, which is not declared before it")
+                if st.shared and not seen[dep].shared:
+                    raise ValueError(f"Shared stage {st.name} cannot depend on per-subject stage {dep}")
+            seen[st.name] = st
+        self._by_name = seen
+
+    def stage_dir(self, stage, subject):
+        return self.workdir / ("_shared" if stage.shared else subject)
+
+    def _paths(self, stage, subject):
+        d = self.stage_dir(stage, subject)
+        return d / stage.filename, d / ".stages" / f"{stage.name}.json"
+
+    def _done_marker(self, stage, subject, fingerprint):
+        out_path, marker_path = self._paths(stage, subject)
+        if not marker_path.exists() or not out_path.exists():
+            return None
+        with open(marker_path) as fh:
+            marker = json.load(fh)
+        if marker.get("fingerprint") != fingerprint or not _files_unchanged(marker.get("files", {})):
+            return None
+        return marker
+
+    def run(self, subjects, shared_params=None):
+        """
+        subjects: {subject_id: params}. Per-subject stages see their subject's params,
+        shared stages see shared_params, each narrowed to the keys in Stage.params.
+        Anything a subject stage needs from a shared stage comes through its inputs, so
+        changing shared_params reruns the shared stages and only their downstream stages.
+        Params must be JSON-serializable.
+        Returns {subject_id: {"status": "done" | "failed", "stages": {name: marker},
+        "error": str or None}}; markers carry "resumed" and the checkpoint path.
+        Completed tasks whose outputs are not needed by any pending task are not rerun,
+        even if their checkpoint file was deleted.
+        """
+        shared_params = dict(shared_params or {})
+        tasks = [(st, None) for st in self.stages if st.shared]
+        tasks += [(st, sid) for sid in subjects for st in self.stages if not st.shared]
+        params = {_task_key(t): t[0].select_params(shared_params if t[0].shared else subjects[t[1]])
+                  for t in tasks}
+        deps = {_task_key(t): [(self._by_name[d], None if self._by_name[d].shared else t[1])
+                               for d in t[0].inputs] for t in tasks}
+        children = defaultdict(list)
+        for t in tasks:
+            for d in deps[_task_key(t)]:
+                children[_task_key(d)].append(t)
+
+        # fingerprints in declared order (inputs first); matching markers are done
+        fingerprints, markers, state, errors = {}, {}, {}, {}
+        for st, sid in tasks:
+            k = (st.name, sid)
+            payload = json.dumps({"stage": st.name,
+                                  "params": params[k],
+                                  "inputs": [fingerprints[_task_key(d)] for d in deps[k]]},
+                                 sort_keys=True, default=str)
+            fingerprints[k] = hashlib.sha256(payload.encode()).hexdigest()
+            marker = self._done_marker(st, sid, fingerprints[k])
+            if marker is not None:
+                markers[k] = {**marker, "resumed": True}
+                state[k] = "done"
+        # a task is needed if it is not done and something downstream (or the result) needs it
+        needed = set()
+        for st, sid in reversed(tasks):
+            k = (st.name, sid)
+            if k not in state and (not children[k] or any(_task_key(c) in needed for c in children[k])):
+                needed.add(k)
+        for st, sid in tasks:
+            k = (st.name, sid)
+            if k not in state and k not in needed:
+                state[k] = "done"  # only feeds tasks that are already complete
+
+        waiting = {_task_key(t): sum(state.get(_task_key(d)) != "done" for d in deps[_task_key(t)])
+                   for t in tasks}
+        consumers = {k: sum(_task_key(c) not in state for c in c_list) for k, c_list in children.items()}
+        ready = deque(t for t in tasks if _task_key(t) not in state and waiting[_task_key(t)] == 0)
+        values = {}
+
+        def job(task):
+            st, sid = task
+            inputs = []
+            for dep in deps[_task_key(task)]:
+                dk = _task_key(dep)
+                inputs.append(values[dk] if dk in values else (dep[0], Path(markers[dk]["path"])))
+            out_path, marker_path = self._paths(st, sid)
+            return (st, params[_task_key(task)], inputs,
+                    out_path, marker_path, fingerprints[_task_key(task)])
+
+        def settle(task, marker=None, error=None):
+            k = _task_key(task)
+            for dep in deps[k]:  # drop in-memory inputs once every consumer has run
+                dk = _task_key(dep)
+                consumers[dk] -= 1
+                if consumers[dk] == 0:
+                    values.pop(dk, None)
+            if error is None:
+                markers[k] = {**marker, "resumed": False}
+                state[k] = "done"
+            else:
+                state[k], errors[k] = "failed", error
+            for child in children[k]:
+                ck = _task_key(child)
+                if ck in state:
+                    continue
+                if error is None:
+                    waiting[ck] -= 1
+                    if waiting[ck] == 0:
+                        ready.append(child)
+                else:
+                    skip(child)
+
+        def skip(task):
+            k = _task_key(task)
+            state[k] = "skipped"
+            for dep in deps[k]:
+                consumers[_task_key(dep)] -= 1
+            for child in children[k]:
+                if _task_key(child) not in state:
+                    skip(child)
+
+        if self.n_workers == 1:
+            while ready:
+                task = ready.popleft()
+                try:
+                    marker, value = _execute_stage(*job(task))
+                except Exception as exc:
+                    settle(task, error=repr(exc))
+                    continue
+                if consumers.get(_task_key(task)):
+                    values[_task_key(task)] = value
+                settle(task, marker)
+        else:
+            with ProcessPoolExecutor(max_workers=self.n_workers) as pool:
+                running = {}
+                while ready or running:
+                    while ready:
+                        task = ready.popleft()
+                        running[pool.submit(_execute_stage_remote, *job(task))] = task
+                    finished, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                    for fut in finished:
+                        task = running.pop(fut)
+                        try:
+                            marker = fut.result()
+                        except Exception as exc:
+                            settle(task, error=repr(exc))
+                        else:
+                            settle(task, marker)
+
+        results = {}
+        for sid in subjects:
+            mine = [(st.name, None if st.shared else sid) for st in self.stages]
+            failed = [errors[k] for k in mine if k in errors]
+            results[sid] = {
+                "status": "done" if all(state.get(k) == "done" for k in mine) else "failed",
+                "stages": {name: markers[(name, s)] for name, s in mine if (name, s) in markers},
+                "error": failed[0] if failed else None,
+            }
+        return results
+
+def _task_key(task):
+    return (task[0].name, task[1])
@@ -108,3 +108,50 @@ def cleanup_files():
                 os.remove(filepath)
         except OSError:
             pass  # Ignore cleanup errors
+
+@pytest.fixture
+def make_toy_model():
+    """Builder for a COBRA model EX_a -> A2B -> EX_b with a GPR on every reaction."""
+    cobra = pytest.importorskip("cobra")
+
+    def _build():
+        model = cobra.Model("toy")
+        a, b = cobra.Metabolite("a_c"), cobra.Metabolite("b_c")
+        uptake = cobra.Reaction("EX_a", lower_bound=-10.0, upper_bound=10.0)
+        uptake.add_metabolites({a: -1})
+        uptake.gene_reaction_rule = "GENE00000"
+        convert = cobra.Reaction("A2B", lower_bound=0.0, upper_bound=8.0)
+        convert.add_metabolites({a: -1, b: 1})
+        convert.gene_reaction_rule = "GENE00001"
+        sink = cobra.Reaction("EX_b", lower_bound=0.0, upper_bound=1000.0)
+        sink.add_metabolites({b: -1})
+        sink.gene_reaction_rule = "GENE00002 or GENE00003"
+        model.add_reactions([uptake, convert, sink])
+        model.objective = "EX_b"
+        return model
+    return _build
+
+@pytest.fixture
+def make_branched_model():
+    """Builder for a COBRA model where a -> b has two parallel routes (R1, R2),
+    so single-solution fluxes are not unique."""
+    cobra = pytest.importorskip("cobra")
+
+    def _build():
+        model = cobra.Model("branched")
+        a, b = cobra.Metabolite("a_c"), cobra.Metabolite("b_c")
+        uptake = cobra.Reaction("EX_a", lower_bound=-10.0, upper_bound=0.0)
+        uptake.add_metabolites({a: -1})
+        uptake.gene_reaction_rule = "G0"
+        route1 = cobra.Reaction("R1", lower_bound=0.0, upper_bound=8.0)
+        route1.add_metabolites({a: -1, b: 1})
+        route1.gene_reaction_rule = "G1"
+        route2 = cobra.Reaction("R2", lower_bound=0.0, upper_bound=8.0)
+        route2.add_metabolites({a: -1, b: 1})
+        route2.gene_reaction_rule = "G2"
+        sink = cobra.Reaction("EX_b", lower_bound=0.0, upper_bound=1000.0)
+        sink.add_metabolites({b: -1})
+        model.add_reactions([uptake, route1, route2, sink])
+        model.objective = "EX_b"
+        return model
+    return _build
@@ -0,0 +1,25 @@
+import numpy as np
+import pytest
+
+cobra = pytest.importorskip("cobra")
+mne = pytest.importorskip("mne")
+healing_sim = pytest.importorskip("quantum.healing_sim")
+
+def _fake_edf(path):
+    rs = np.random.RandomState(sum(map(ord, str(path))))
+    info = mne.create_info([f"C{i}" for i in range(4)], sfreq=256.0, ch_types="eeg")
+    return mne.io.RawArray(rs.randn(4, 256 * 20) * 1e-5, info, verbose=False)
+
+def test_batch_matches_single_runs_and_restores_model(tmp_path, monkeypatch, make_toy_model):
+    monkeypatch.setattr(healing_sim, "load_eeg_edf", _fake_edf)
+    model = make_toy_model()
+    paths = ["s1.edf", "s2.edf", "s3.edf"]
+    batch = healing_sim.run_healing_sim_batch(paths, model=model, outdir=str(tmp_path / "batch"), n_workers=1)
+    assert batch["n_recordings"] == 3
+    assert model.reactions.get_by_id("A2B").upper_bound == 8.0
+    sbml = tmp_path / "toy.xml"
+    cobra.io.write_sbml_model(make_toy_model(), str(sbml))
+    single = healing_sim.run_healing_sim(paths[1], str(sbml), outdir=str(tmp_path / "single"))
+    item = batch["recordings"][1]
+    assert item["feats_hash"] == single["feats_hash"]
+    assert item["fba_report"]["objective_changed"] == pytest.approx(single["fba_report"]["objective_changed"])
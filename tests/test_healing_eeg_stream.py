@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("scipy")
+eeg_stream = pytest.importorskip("quantum.eeg_stream")
+healing_sim = pytest.importorskip("quantum.healing_sim")
+
+@pytest.mark.parametrize("block", [64, 777, 4096])
+def test_streaming_welch_matches_bandpower_features(block):
+    data = np.random.RandomState(3).randn(5, 128 * 30) * 1e-5
+    acc = eeg_stream.StreamingBandpower(5, 128)
+    for start in range(0, data.shape[1], block):
+        acc.update(data[:, start:start + block])
+    np.testing.assert_allclose(acc.result(), healing_sim.bandpower_features(data, 128), rtol=1e-10)
+
+def test_streaming_fir_is_zero_phase_filter():
+    from scipy.signal import fftconvolve
+    data = np.random.RandomState(4).randn(3, 5000)
+    taps = eeg_stream.bandpass_taps(256)
+    fir = eeg_stream.StreamingFIR(taps, 3)
+    out = np.concatenate([fir.process(data[:, i:i + 900]) for i in range(0, 5000, 900)] + [fir.flush()], axis=1)
+    delay = (len(taps) - 1) // 2
+    expected = fftconvolve(data, taps[None, :], mode="full", axes=-1)[:, delay:delay + 5000]
+    np.testing.assert_allclose(out, expected, atol=1e-10)
+
+@pytest.mark.parametrize("sfreq", [512, 200])
+def test_stream_bandpower_does_not_depend_on_block_size(sfreq):
+    data = np.random.RandomState(5).randn(4, sfreq * 40) * 1e-5
+    def run(block):
+        return eeg_stream.stream_bandpower((data[:, i:i + block] for i in range(0, data.shape[1], block)), sfreq)
+    whole = run(data.shape[1])
+    assert whole.shape == (4 * len(eeg_stream.EEG_BANDS),)
+    np.testing.assert_allclose(run(1000), whole, rtol=1e-10)
+    np.testing.assert_allclose(run(sfreq * 7 + 3), whole, rtol=1e-10)
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("scipy")
+healing_sim = pytest.importorskip("quantum.healing_sim")
+
+def _loop_bandpower(data, sfreq):
+    from scipy.signal import welch
+    bp = []
+    for ch in range(data.shape[0]):
+        f, Pxx = welch(data[ch], fs=sfreq, nperseg=int(sfreq * 2))
+        for lo, hi in healing_sim.EEG_BANDS:
+            bp.append(Pxx[(f >= lo) & (f <= hi)].mean())
+    return np.array(bp)
+
+@pytest.mark.parametrize("sfreq", [100.0, 128, 160])
+def test_bandpower_matches_per_channel_loop(sfreq):
+    data = np.random.RandomState(0).randn(6, int(sfreq * 20)) * 1e-5
+    np.testing.assert_allclose(healing_sim.bandpower_features(data, sfreq),
+                               _loop_bandpower(data, sfreq), rtol=1e-10)
+
+def test_bandpower_keeps_leading_batch_axes():
+    stack = np.random.RandomState(1).randn(4, 3, 128 * 10)
+    out = healing_sim.bandpower_features(stack, 128)
+    assert out.shape == (4, 3 * len(healing_sim.EEG_BANDS))
+    np.testing.assert_allclose(out[2], healing_sim.bandpower_features(stack[2], 128))
+
+def test_projection_cache_is_bit_identical_and_lru():
+    cache = healing_sim.ProjectionCache(maxsize=2)
+    a = cache.get(3, (5, 7), scale=0.01)
+    np.testing.assert_array_equal(a, np.random.RandomState(3).normal(scale=0.01, size=(5, 7)))
+    assert cache.get(3, (5, 7), scale=0.01) is a
+    assert not a.flags.writeable
+    cache.get(4, (5, 7))
+    cache.get(5, (5, 7))
+    assert cache.get(3, (5, 7), scale=0.01) is not a
+    assert (cache.hits, cache.misses) == (1, 4)
+
+def test_projection_cache_persists_memory_mapped(tmp_path):
+    first = healing_sim.ProjectionCache(cache_dir=tmp_path).get(1, (4, 6))
+    assert len(list(tmp_path.glob("*.npy"))) == 1
+    second = healing_sim.ProjectionCache(cache_dir=tmp_path).get(1, (4, 6))
+    assert isinstance(second, np.memmap)
+    np.testing.assert_array_equal(first, second)
+
+def test_batched_mapping_matches_per_vector():
+    rs = np.random.RandomState(2)
+    bp = rs.rand(10, 40)
+    feats = healing_sim.bandpower_to_features(bp, n_features=16, seed=42)
+    delta = healing_sim.features_to_gene_delta(feats, ngenes=300, seed=43)
+    assert delta.shape == (10, 300)
+    for i in (0, 7):
+        single = healing_sim.bandpower_to_features(bp[i], n_features=16, seed=42)
+        np.testing.assert_allclose(feats[i], single, atol=1e-12)
+        np.testing.assert_allclose(delta[i], healing_sim.features_to_gene_delta(single, ngenes=300, seed=43),
+                                   atol=1e-12)
@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+
+cobra = pytest.importorskip("cobra")
+fba = pytest.importorskip("quantum.fba")
+from cobra.flux_analysis import flux_variability_analysis
+
+@pytest.mark.parametrize("n_workers, fraction", [(1, 1.0), (1, 0.5), (2, 0.9)])
+def test_flux_variability_matches_cobra(n_workers, fraction, make_branched_model):
+    model = make_branched_model()
+    progress = []
+    ours = fba.flux_variability(model, fraction_of_optimum=fraction, n_workers=n_workers,
+                                chunk_size=1, progress=progress.append)
+    ref = flux_variability_analysis(model, fraction_of_optimum=fraction, processes=1)
+    np.testing.assert_allclose(ours.loc[ref.index].to_numpy(), ref.to_numpy(), atol=1e-6)
+    assert progress[-1]["done"] == progress[-1]["total"] == 4
+    assert model.objective.expression == make_branched_model().objective.expression
+
+def test_session_fva_flags_robust_changes(make_branched_model):
+    model = make_branched_model()
+    genes = ["G0", "G1", "G2"]
+    with fba.FBASession(model) as session:
+        report = session.solve(genes, np.array([0.0, -0.9, 0.0]), top_k=3, fva=True)
+    # R1's upper bound drops to 1.6, so R1 and R2 are both pinned at the new optimum
+    ranges = {r["reaction"]: r for r in report["fva"]}
+    assert ranges["R1"]["baseline"] == pytest.approx([2.0, 8.0], abs=1e-6)
+    assert ranges["R1"]["changed"] == pytest.approx([1.6, 1.6], abs=1e-6)
+    assert ranges["R1"]["robust"]
+    assert ranges["R2"]["changed"] == pytest.approx([8.0, 8.0], abs=1e-6)
+    assert not ranges["R2"]["robust"]  # still inside its baseline range
+    assert "fva_s" in report["solve_stats"]
+    assert model.reactions.get_by_id("R1").bounds == (0.0, 8.0)
@@ -0,0 +1,59 @@
+import pytest
+
+fba = pytest.importorskip("quantum.fba")
+
+@pytest.mark.parametrize("rule, expected", [
+    ("", []),
+    ("b0001", [["b0001"]]),
+    ("a and (b or c)", [["a", "b"], ["a", "c"]]),
+    ("(a or b) and (c or d)", [["a", "c"], ["a", "d"], ["b", "c"], ["b", "d"]]),
+    ("HGNC:123 or (x_1 AND y.2)", [["HGNC:123"], ["x_1", "y.2"]]),
+])
+def test_gpr_to_dnf(rule, expected):
+    assert fba.gpr_to_dnf(rule) == expected
+
+def _model():
+    cobra = pytest.importorskip("cobra")
+    model = cobra.Model("gpr")
+    met = cobra.Metabolite("m_c")
+    rules = {"R_and": "g1 and g2", "R_or": "g1 or g3", "R_mix": "g1 and (g2 or g3)", "R_none": ""}
+    for rid, rule in rules.items():
+        rxn = cobra.Reaction(rid, lower_bound=-10.0, upper_bound=10.0)
+        rxn.add_metabolites({met: 1 if rid == "R_and" else -1})
+        rxn.gene_reaction_rule = rule
+        model.add_reactions([rxn])
+    return model
+
+def test_mean_mode_matches_original_rule():
+    model = _model()
+    fba.apply_gene_delta_to_model(model, ["g1", "g2", "g3"], [0.4, -0.2, 0.1])
+    bounds = {r.id: r.bounds for r in model.reactions}
+    assert bounds["R_and"] == pytest.approx((-11.0, 11.0))       # mean(0.4, -0.2)
+    assert bounds["R_or"] == pytest.approx((-12.5, 12.5))        # mean(0.4, 0.1)
+    assert bounds["R_mix"] == pytest.approx((-11.0, 11.0))       # mean(0.4, -0.2, 0.1)
+    assert bounds["R_none"] == (-10.0, 10.0)
+
+def test_and_or_mode_uses_min_max():
+    model = _model()
+    with model:
+        fba.apply_gene_delta_to_model(model, ["g1", "g2", "g3"], [0.4, -0.2, 0.1], gpr="and_or")
+        bounds = {r.id: r.bounds for r in model.reactions}
+        assert bounds["R_and"] == pytest.approx((-8.0, 8.0))     # min(0.4, -0.2)
+        assert bounds["R_or"] == pytest.approx((-14.0, 14.0))    # max(0.4, 0.1)
+        assert bounds["R_mix"] == pytest.approx((-11.0, 11.0))   # max(min(.4,-.2), min(.4,.1))
+    assert model.reactions.get_by_id("R_or").bounds == (-10.0, 10.0)
+
+def test_index_is_rebuilt_for_model_copies():
+    model = _model()
+    index = fba.gene_reaction_index(model)
+    assert fba.gene_reaction_index(model) is index
+    assert fba.gene_reaction_index(model.copy()) is not index
+
+def test_index_follows_edited_rules():
+    model = _model()
+    fba.apply_gene_delta_to_model(model, ["g1", "g2", "g3"], [0.4, -0.2, 0.1])
+    rxn = model.reactions.get_by_id("R_none")
+    rxn.bounds = (-10.0, 10.0)
+    rxn.gene_reaction_rule = "g3"
+    fba.apply_gene_delta_to_model(model, ["g1", "g2", "g3"], [0.4, -0.2, 0.1])
+    assert rxn.bounds == pytest.approx((-11.0, 11.0))           # score of g3 alone
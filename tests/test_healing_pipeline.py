@@ -0,0 +1,155 @@
+import hashlib
+import json
+
+import pytest
+
+pipeline = pytest.importorskip("quantum.pipeline")
+
+CALLS = []
+
+def _load(params):
+    CALLS.append(("load", params["x"]))
+    if params["x"] < 0:
+        raise ValueError("negative input")
+    return params["x"]
+
+def _offset(params):
+    CALLS.append(("offset", None))
+    return params["offset"]
+
+def _square(params, x):
+    CALLS.append(("square", params["x"]))
+    return x * x
+
+def _add(params, sq, offset):
+    CALLS.append(("add", params["x"]))
+    return sq + offset
+
+def _stages():
+    return [
+        pipeline.Stage("load", _load),
+        pipeline.Stage("offset", _offset, shared=True),
+        pipeline.Stage("square", _square, inputs=("load",)),
+        pipeline.Stage("add", _add, inputs=("square", "offset")),
+    ]
+
+def _final(result):
+    with open(result["stages"]["add"]["path"], "rb") as fh:
+        import pickle
+        return pickle.load(fh)
+
+def test_pipeline_checkpoints_and_resumes(tmp_path):
+    CALLS.clear()
+    pipe = pipeline.StagePipeline(_stages(), tmp_path)
+    subjects = {"s1": {"x": 2}, "s2": {"x": 3}}
+    res = pipe.run(subjects, {"offset": 10})
+    assert [_final(res[s]) for s in subjects] == [14, 19]
+    assert sum(c[0] == "offset" for c in CALLS) == 1  # shared stage runs once
+    assert json.loads((tmp_path / "s1" / ".stages" / "square.json").read_text())["stage"] == "square"
+
+    # interrupted run: s2's last stage never completed
+    (tmp_path / "s2" / ".stages" / "add.json").unlink()
+    CALLS.clear()
+    res = pipe.run(subjects, {"offset": 10})
+    assert CALLS == [("add", 3)]
+    assert res["s2"]["stages"]["add"]["resumed"] is False
+    assert res["s1"]["stages"]["add"]["resumed"] is True
+
+    # changed params rerun only that subject's stages
+    CALLS.clear()
+    res = pipe.run({"s1": {"x": 5}, "s2": {"x": 3}}, {"offset": 10})
+    assert CALLS == [("load", 5), ("square", 5), ("add", 5)]
+    assert _final(res["s1"]) == 35
+
+    # a changed shared param reruns the shared stage and what depends on it
+    CALLS.clear()
+    res = pipe.run({"s1": {"x": 5}, "s2": {"x": 3}}, {"offset": 1})
+    assert CALLS == [("offset", None), ("add", 5), ("add", 3)]
+    assert _final(res["s2"]) == 10
+
+def test_pipeline_isolates_failures(tmp_path):
+    pipe = pipeline.StagePipeline(_stages(), tmp_path)
+    res = pipe.run({"ok": {"x": 1}, "bad": {"x": -1}}, {"offset": 0})
+    assert res["ok"]["status"] == "done"
+    assert res["bad"]["status"] == "failed"
+    assert "negative input" in res["bad"]["error"]
+    assert "square" not in res["bad"]["stages"]
+
+def test_pipeline_skips_unneeded_deleted_checkpoints(tmp_path):
+    pipe = pipeline.StagePipeline(_stages(), tmp_path)
+    pipe.run({"s1": {"x": 4}}, {"offset": 0})
+    (tmp_path / "s1" / "load.pkl").unlink()
+    CALLS.clear()
+    res = pipe.run({"s1": {"x": 4}}, {"offset": 0})
+    assert CALLS == [] and res["s1"]["status"] == "done"
+
+def test_pipeline_process_pool_matches_serial(tmp_path):
+    subjects = {f"s{i}": {"x": i} for i in range(6)}
+    serial = pipeline.StagePipeline(_stages(), tmp_path / "serial").run(subjects, {"offset": 5})
+    pooled = pipeline.StagePipeline(_stages(), tmp_path / "pool", n_workers=2).run(subjects, {"offset": 5})
+    assert [_final(pooled[s]) for s in subjects] == [_final(serial[s]) for s in subjects]
+
+def test_stage_order_is_validated(tmp_path):
+    with pytest.raises(ValueError):
+        pipeline.StagePipeline([pipeline.Stage("square", _square, inputs=("load",))], tmp_path)
+    with pytest.raises(ValueError):
+        pipeline.StagePipeline([pipeline.Stage("load", _load),
+                                pipeline.Stage("offset", _offset, inputs=("load",), shared=True)],
+                               tmp_path)
+
+def _export(params, x):
+    CALLS.append(("export", params["x"]))
+    path = f"{params['outdir']}/side.txt"
+    digest = pipeline.write_artifact(path, lambda fh: fh.write(str(x).encode()))
+    return {"side_path": path, "side_hash": digest}
+
+def _export_files(value):
+    return {value["side_path"]: value["side_hash"]}
+
+def test_stage_side_files_are_checked_on_resume(tmp_path):
+    stages = [pipeline.Stage("load", _load),
+              pipeline.Stage("export", _export, inputs=("load",), files=_export_files)]
+    pipe = pipeline.StagePipeline(stages, tmp_path)
+    subjects = {"s1": {"x": 7, "outdir": str(tmp_path / "s1")}}
+    res = pipe.run(subjects)
+    side = tmp_path / "s1" / "side.txt"
+    assert res["s1"]["stages"]["export"]["files"][str(side)]["sha256"] == hashlib.sha256(b"7").hexdigest()
+    CALLS.clear()
+    pipe.run(subjects)
+    assert CALLS == []
+
+    side.unlink()  # deleted side file: the stage reruns from its checkpointed input
+    res = pipe.run(subjects)
+    assert CALLS == [("export", 7)] and side.read_text() == "7"
+
+    CALLS.clear()
+    side.write_text("edited")  # modified side file
+    pipe.run(subjects)
+    assert CALLS == [("export", 7)] and side.read_text() == "7"
+
+def _record(params, *inputs):
+    CALLS.append(sorted(params))
+    return len(CALLS)
+
+def test_params_only_rerun_the_stages_that_read_them(tmp_path):
+    healing_sim = pytest.importorskip("quantum.healing_sim")
+    # HEALING_STAGES' dependency graph and param declarations, with stub stage functions
+    stages = [pipeline.Stage(st.name, _record, inputs=st.inputs, shared=st.shared, params=st.params)
+              for st in healing_sim.HEALING_STAGES]
+    pipe = pipeline.StagePipeline(stages, tmp_path)
+    CALLS.clear()
+    subject = {"eeg_path": "a.edf", "eeg_stamp": [1, 2], "outdir": str(tmp_path / "s1"),
+               "gene_list": ["G1", "G2"], "seed": 42, "write_flux_delta": False}
+    shared = {"cobra_sbml_path": "m.xml", "cobra_sbml_stamp": [3, 4]}
+    pipe.run({"s1": subject}, shared)
+    assert CALLS[0] == ["cobra_sbml_path", "cobra_sbml_stamp"]  # stages only see their params
+
+    CALLS.clear()
+    res = pipe.run({"s1": {**subject, "write_flux_delta": True}}, shared)
+    assert CALLS == [["outdir", "write_flux_delta"]]
+    assert [n for n, m in res["s1"]["stages"].items() if not m["resumed"]] == ["fba"]
+
+    CALLS.clear()
+    res = pipe.run({"s1": {**subject, "write_flux_delta": True, "gene_list": ["G1"]}}, shared)
+    assert [n for n, m in res["s1"]["stages"].items() if not m["resumed"]] == [
+        "features_to_gene_delta", "apply", "fba"]
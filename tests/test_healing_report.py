@@ -0,0 +1,22 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+fba = pytest.importorskip("quantum.fba")
+
+@pytest.mark.parametrize("n, k", [(8, 20), (500, 20), (60, 5), (60, 0), (60, -3)])
+def test_top_abs_changes_matches_stable_full_sort(n, k):
+    values = np.round(np.random.RandomState(n).randn(n), 1)  # plenty of ties
+    diffs = pd.Series(values, index=[f"R{i}" for i in range(n)])
+    expected = sorted(diffs.items(), key=lambda kv: abs(kv[1]), reverse=True)[:max(k, 0)]
+    assert fba.top_abs_changes(diffs, k) == [(r, float(v)) for r, v in expected]
+
+def test_flux_delta_parquet_is_float32(tmp_path):
+    pytest.importorskip("pyarrow")
+    ids = pd.Index(["R1", "R2", "R3"])
+    before, after = np.array([1.0, 0.0, -2.0]), np.array([1.5, 0.0, -1.0])
+    path = fba.write_flux_delta_parquet(ids, before, after, tmp_path / "out" / "flux_delta.parquet")
+    table = pd.read_parquet(path)
+    assert list(table["reaction"]) == ["R1", "R2", "R3"]
+    assert table["flux_delta"].dtype == np.float32
+    np.testing.assert_allclose(table["flux_delta"], [0.5, 0.0, 1.0])
@@ -0,0 +1,25 @@
+import numpy as np
+import pytest
+
+cobra = pytest.importorskip("cobra")
+fba = pytest.importorskip("quantum.fba")
+
+def test_session_matches_fresh_solves_and_restores_bounds(make_toy_model):
+    genes = [f"GENE{i:05d}" for i in range(4)]
+    deltas = [[0.5, -0.5, 0.0, 0.0], [0.5, 0.3, 0.0, 0.0], [0.0, 0.0, 0.0, 0.0], [-0.9, 1.5, 0.2, 0.2]]
+    model, reference = make_toy_model(), make_toy_model()
+    baseline = model.optimize()
+    with fba.FBASession(model, baseline) as session:
+        for fc in deltas:
+            report = session.solve(genes, np.array(fc))
+            with reference:
+                fba.apply_gene_delta_to_model(reference, genes, np.array(fc))
+                expected = fba.run_fba_and_report(reference)
+            assert report["objective_changed"] == pytest.approx(expected["objective_changed"])
+        stats = session.stats()
+    assert stats["count"] == len(deltas)
+    assert stats["solve_s_p95"] >= stats["solve_s_p50"] > 0
+    # the second delta keeps EX_a's factor, so only A2B's bounds are rewritten
+    assert session.records[1]["n_changed_bounds"] == 1
+    assert model.reactions.get_by_id("A2B").bounds == (0.0, 8.0)
+    assert model.reactions.get_by_id("EX_a").bounds == (-10.0, 10.0)
@@ -0,0 +1,50 @@
+import os
+
+import numpy as np
+import pytest
+
+artifacts = pytest.importorskip("quantum.artifacts")
+healing_sim = pytest.importorskip("quantum.healing_sim")
+
+def test_write_artifact_hash_matches_file(tmp_path):
+    arr = np.arange(1000, dtype=float)
+    digest = artifacts.write_artifact(tmp_path / "a" / "x.npy", lambda fh: np.save(fh, arr))
+    assert digest == artifacts.sha256_file(tmp_path / "a" / "x.npy")
+    np.testing.assert_array_equal(np.load(tmp_path / "a" / "x.npy"), arr)
+
+def test_store_deduplicates_and_hardlinks(tmp_path):
+    store = artifacts.ArtifactStore(tmp_path / "store")
+    write = lambda fh: fh.write(b"gene\tlog2fc\n")
+    d1 = store.write(tmp_path / "run1" / "gene_delta.tsv", write)
+    d2 = store.write(tmp_path / "run2" / "gene_delta.tsv", write)
+    assert d1 == d2 == artifacts.sha256_file(tmp_path / "run2" / "gene_delta.tsv")
+    assert store.stats()["blobs_written"] == 1 and store.stats()["blobs_deduplicated"] == 1
+    assert os.stat(tmp_path / "run1" / "gene_delta.tsv").st_ino == os.stat(store.blob_path(d1)).st_ino
+
+def test_stage_records_require_their_blobs(tmp_path):
+    store = artifacts.ArtifactStore(tmp_path / "store")
+    key = store.stage_key("eeg_to_features", eeg="abc", seed=42)
+    assert key != store.stage_key("eeg_to_features", eeg="abc", seed=43)
+    assert store.get_stage(key) is None
+    digest = store.write(tmp_path / "run" / "f.npy", lambda fh: np.save(fh, np.ones(3)))
+    store.put_stage(key, {"features": digest})
+    assert store.get_stage(key)["blobs"] == {"features": digest}
+    os.chmod(store.blob_path(digest), 0o644)
+    os.unlink(store.blob_path(digest))
+    assert store.get_stage(key) is None
+
+def test_cached_stages_skip_eeg_load(tmp_path, monkeypatch):
+    calls = []
+    monkeypatch.setattr(healing_sim, "load_eeg_edf", lambda path: calls.append(path))
+    monkeypatch.setattr(healing_sim, "eeg_to_features",
+                        lambda raw, seed, n_features: np.linspace(-1, 1, n_features))
+    eeg = tmp_path / "s1.edf"
+    eeg.write_bytes(b"edf")
+    genes = [f"GENE{i:05d}" for i in range(50)]
+    store = artifacts.ArtifactStore(tmp_path / "store")
+    fc1, m1 = healing_sim._eeg_to_gene_delta(str(eeg), genes, tmp_path / "r1", 42, store)
+    fc2, m2 = healing_sim._eeg_to_gene_delta(str(eeg), genes, tmp_path / "r2", 42, store)
+    assert len(calls) == 1
+    assert m2["cached_stages"] == ["eeg_to_features", "features_to_gene_delta"]
+    np.testing.assert_array_equal(fc1, fc2)
+    assert m1["gene_delta_hash"] == m2["gene_delta_hash"] == artifacts.sha256_file(m2["gene_delta_path"])
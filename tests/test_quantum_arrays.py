@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+
+from dpbiogen.quantum import Agent, ArrayMapper, Mapper
+
+def _build(mapper_cls, states, neural, groups):
+    mapper = mapper_cls(neural_weight_multiplier=50.0)
+    agents = [mapper.add_agent(f"a{i}", s, n) for i, (s, n) in enumerate(zip(states, neural))]
+    for g in groups:
+        mapper.entangle_group([agents[i] for i in g])
+    return mapper, agents
+
+@pytest.mark.parametrize("seed", range(5))
+def test_collapse_matches_python_mapper_with_overlapping_groups(seed):
+    rs = np.random.RandomState(seed)
+    n = 40
+    states, neural = rs.randn(n) * 10, rs.rand(n) < 0.1
+    groups = [rs.choice(n, rs.randint(2, 12), replace=False) for _ in range(15)]
+    ref, ref_agents = _build(Mapper, states, neural, groups)
+    fast, _ = _build(ArrayMapper, states, neural, groups)
+    ref.collapse()
+    fast.collapse()
+    np.testing.assert_allclose(fast.states, [a.state for a in ref_agents], atol=1e-12)
+    assert fast.bio_deviation() == pytest.approx(ref.bio_deviation())
+
+def test_disjoint_groups_collapse_in_one_layer():
+    mapper = ArrayMapper()
+    for i in range(6):
+        mapper.add_agent(f"a{i}", float(i), is_neural=(i == 0))
+    mapper.entangle_group(np.array([0, 1, 2]))
+    mapper.entangle_group(np.array([3, 4, 5]))
+    assert len(mapper.entangler.groups.layers(6)) == 1
+    mapper.collapse()
+    np.testing.assert_allclose(mapper.states, [3 / 102] * 3 + [4.0] * 3)
+
+def test_agent_views_read_and_write_the_arrays():
+    mapper = ArrayMapper()
+    neural = mapper.add_agent("Residual-Intent-Detector", 9.0, is_neural=True)
+    bio = mapper.add_agent("Cerebral-Left", 18.0)
+    assert isinstance(neural, Agent)
+    mapper.entangle_group([neural, bio])
+    neural.state = 0.0
+    mapper.collapse()
+    assert bio.state == pytest.approx(18.0 / 101)
+    assert repr(bio) == "Cerebral-Left (Bio): +0.178"
+    assert [a.name for a in mapper.agents] == ["Residual-Intent-Detector", "Cerebral-Left"]
+
+def test_agent_uses_slots():
+    agent = Agent("Cerebral-Left", 18.0)
+    assert not hasattr(agent, "__dict__")
+    with pytest.raises(AttributeError):
+        agent.weight = 2.0
+
+@pytest.mark.parametrize("mapper_cls", [Mapper, ArrayMapper])
+def test_add_agents_bulk_matches_add_agent(mapper_cls):
+    names = ["n0", "b1", "b2"]
+    states = np.array([9.0, 18.0, -14.0])
+    neural = np.array([True, False, False])
+    bulk = mapper_cls()
+    added = bulk.add_agents(names, states, neural)
+    loop = mapper_cls()
+    for n, s, f in zip(names, states, neural):
+        loop.add_agent(n, s, f)
+    assert len(added) == 3
+    assert [repr(a) for a in bulk.agents] == [repr(a) for a in loop.agents]
+    assert bulk.bio_deviation() == pytest.approx(32.0)
+
+@pytest.mark.parametrize("mapper_cls", [Mapper, ArrayMapper])
+def test_add_agents_broadcasts_scalar_flag_and_rejects_length_mismatch(mapper_cls):
+    mapper = mapper_cls()
+    mapper.add_agents(["n0", "n1"], np.array([1.0, 2.0]), True)
+    assert [repr(a) for a in mapper.agents] == ["n0 (Neural Control): +1.000", "n1 (Neural Control): +2.000"]
+    for names, states, neural in [(["a", "b"], [1.0], False),
+                                  (["a"], [1.0, 2.0], False),
+                                  (["a", "b"], [1.0, 2.0], [True])]:
+        with pytest.raises(ValueError):
+            mapper.add_agents(names, states, neural)
+    assert [a.name for a in mapper.agents] == ["n0", "n1"]
+
+def test_load_agent_columns_from_csv(tmp_path):
+    from dpbiogen.quantum.utils import load_agent_columns_from_csv
+    path = tmp_path / "heart.csv"
+    path.write_text("Heart-Rate-Variability,25.0\nbad,row,extra\nCardiac-Output, -15.0\nQT,nan?\n")
+    names, states = load_agent_columns_from_csv(str(path))
+    assert names == ["Heart-Rate-Variability", "Cardiac-Output"]
+    assert states == [25.0, -15.0]
+    mapper = Mapper()
+    assert [a.state for a in mapper.add_agents(names, states)] == [25.0, -15.0]
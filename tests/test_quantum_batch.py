@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+qt = pytest.importorskip("qutip")
+
+from pdpbiogen.quantum.mapper import BELL_00, QuantumNeuroSymmetryMapper, SymmetryOptimizer
+
+@pytest.mark.quantum
+def test_batch_map_shapes():
+    windows = np.random.randn(6, 8, 128)
+    mapper = QuantumNeuroSymmetryMapper(g=0.2)
+    out = mapper.create_quantum_human_map_batch(windows, "ATGCGGTTAACCGT", np.random.rand(6, 20))
+    assert out["quantum_human_map"].shape == (6, 64)
+    assert out["fused_features"].shape == (6, 8)
+    assert out["entanglement_concurrence"].shape == (6,)
+    assert out["symmetry_score"].shape == (6,)
+    assert out["genomic_motif"] == "ATGCGGTTAACC"
+
+@pytest.mark.quantum
+def test_batch_evolution_matches_single_window():
+    mapper = QuantumNeuroSymmetryMapper(g=0.5)
+    fluxes = np.array([0.2, 1.5, 0.2])
+    conc, final = mapper.entangler.evolve_batch(BELL_00, fluxes)
+    rho0 = qt.ket2dm(qt.bell_state("00"))
+    for i, flux in enumerate(fluxes):
+        c, rho = mapper.entangler.evolve_state(rho0, neural_flux=flux)
+        assert conc[i] == pytest.approx(c, abs=1e-6)
+        np.testing.assert_allclose(final[i], rho.full(), atol=1e-10)
+
+@pytest.mark.quantum
+def test_optimize_batch_distances_are_whitened_mahalanobis():
+    a = np.random.randn(3, 5, 40)
+    covs = a @ np.swapaxes(a, 1, 2) / 40
+    sym, scores = SymmetryOptimizer().optimize_batch(covs)
+    for b in range(3):
+        inv = np.linalg.inv(sym[b])
+        d = [np.sqrt((sym[b, i] - sym[b, j]) @ inv @ (sym[b, i] - sym[b, j]))
+             for i in range(5) for j in range(i + 1, 5)]
+        assert scores[b] == pytest.approx(1 - np.mean(d))
@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("scipy")
+
+from dpbiogen.quantum import ArrayMapper, ConsensusSolver
+from dpbiogen.quantum.consensus import ConsensusSystem
+
+def _random_groups(rs, n_agents, n_groups, max_size=8):
+    groups = [rs.choice(n_agents, rs.randint(2, max_size), replace=False) for _ in range(n_groups)]
+    indptr = np.concatenate([[0], np.cumsum([len(g) for g in groups])])
+    return groups, indptr, np.concatenate(groups)
+
+def test_operator_matches_dense_laplacian():
+    rs = np.random.RandomState(0)
+    n = 25
+    groups, indptr, indices = _random_groups(rs, n, 8)
+    w = np.where(rs.rand(n) < 0.2, 40.0, 1.0)
+    system = ConsensusSystem(indptr, indices, w, anchor=1e-2)
+    dense = np.column_stack([system.matvec(e) for e in np.eye(n)])
+    expected = 1e-2 * np.diag(w)
+    for g in groups:
+        wg = w[g]
+        expected[np.ix_(g, g)] += np.diag(wg) - np.outer(wg, wg) / wg.sum()
+    np.testing.assert_allclose(dense, expected, atol=1e-12)
+    np.testing.assert_allclose(system.diagonal, np.diag(expected), atol=1e-12)
+
+def test_single_group_converges_to_collapse_target():
+    mapper = ArrayMapper(neural_weight_multiplier=100.0)
+    mapper.add_agents(["n", "a", "b", "c"], [0.0, 18.0, -14.0, 23.0], [True, False, False, False])
+    mapper.entangle_group(np.arange(4))
+    mapper.entangler.solver = ConsensusSolver(anchor=1e-8, tol=1e-12)
+    mapper.collapse_consensus()
+    np.testing.assert_allclose(mapper.states, 27.0 / 103.0, rtol=1e-5)
+
+@pytest.mark.parametrize("method", ["cg", "jacobi"])
+def test_solution_is_order_independent(method):
+    rs = np.random.RandomState(1)
+    n = 60
+    groups, indptr, indices = _random_groups(rs, n, 20)
+    w = np.where(rs.rand(n) < 0.1, 100.0, 1.0)
+    x0 = rs.randn(n) * 10
+    solver = ConsensusSolver(method=method, max_iter=50000, tol=1e-10, warm_start=False)
+    x = solver.solve(x0, w, indptr, indices)
+    assert solver.last_residual <= 1e-10
+    perm = rs.permutation(len(groups))
+    shuffled = [groups[k] for k in perm]
+    indptr2 = np.concatenate([[0], np.cumsum([len(g) for g in shuffled])])
+    x_shuffled = solver.solve(x0, w, indptr2, np.concatenate(shuffled))
+    np.testing.assert_allclose(x, x_shuffled, atol=1e-6)
+
+def test_warm_start_reduces_iterations():
+    rs = np.random.RandomState(2)
+    n = 5000
+    _, indptr, indices = _random_groups(rs, n, 1500, max_size=12)
+    w = np.where(rs.rand(n) < 0.01, 100.0, 1.0)
+    x0 = rs.randn(n)
+    solver = ConsensusSolver(tol=1e-10)
+    solver.solve(x0, w, indptr, indices)
+    x0[rs.choice(n, 5, replace=False)] = 0.0
+    warm = solver.solve(x0, w, indptr, indices)
+    warm_iters = solver.last_n_iter
+    solver.reset()
+    cold = solver.solve(x0, w, indptr, indices)
+    assert warm_iters < solver.last_n_iter
+    np.testing.assert_allclose(warm, cold, atol=1e-6)
+
+def test_invalid_configuration():
+    with pytest.raises(ValueError):
+        ConsensusSolver(method="gauss-seidel")
+    with pytest.raises(ValueError):
+        ConsensusSolver(anchor=0.0)
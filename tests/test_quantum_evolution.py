@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+qt = pytest.importorskip("qutip")
+
+from pdpbiogen.quantum.evolution import PropagatorEngine, concurrence, hamiltonian_matrix
+from pdpbiogen.quantum.mapper import DarkPhotonEntangler
+
+@pytest.mark.quantum
+def test_hamiltonian_matches_qutip_operators():
+    ent = DarkPhotonEntangler(g=0.2, omega=1.3)
+    np.testing.assert_allclose(hamiltonian_matrix(0.2, 1.3, 0.7), ent.hamiltonian(0.7))
+
+@pytest.mark.quantum
+def test_propagator_matches_mesolve():
+    rho0 = qt.ket2dm(qt.bell_state("00"))
+    flux = np.full(10, 2.0)
+    fast = DarkPhotonEntangler(g=0.5, dt=0.05, engine="propagator")
+    ref = DarkPhotonEntangler(g=0.5, dt=0.05, engine="mesolve")
+    c_fast, rho_fast = fast.evolve_state(rho0, neural_flux=flux)
+    c_ref, rho_ref = ref.evolve_state(rho0, neural_flux=flux)
+    assert c_fast == pytest.approx(c_ref, abs=1e-4)
+    np.testing.assert_allclose(rho_fast.full(), rho_ref.full(), atol=1e-4)
+
+@pytest.mark.quantum
+def test_propagator_caches_eigendecomposition():
+    engine = PropagatorEngine(g=0.1, cache_size=2)
+    rho0 = np.eye(4) / 4
+    for flux in (0.5, 0.5, 0.7, 0.5, 0.9, 0.7):
+        rhos = engine.evolve(rho0, flux, np.linspace(0, 1, 11))
+    assert rhos.shape == (11, 4, 4)
+    assert (engine.hits, engine.misses) == (2, 4)
+    np.testing.assert_allclose(np.trace(rhos, axis1=1, axis2=2), 1.0)
+
+@pytest.mark.quantum
+def test_numpy_concurrence_matches_qutip():
+    states = [qt.rand_dm([2, 2]) for _ in range(20)]
+    states += [qt.ket2dm(qt.bell_state(b)) for b in ("00", "01", "10", "11")]
+    states.append(qt.ket2dm(qt.tensor(qt.basis(2, 0), qt.basis(2, 1))))
+    expected = np.array([qt.concurrence(s) for s in states])
+    got = concurrence(np.stack([s.full() for s in states]))
+    assert got.shape == (len(states),)
+    np.testing.assert_allclose(got, expected, atol=1e-8)
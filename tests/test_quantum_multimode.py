@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("scipy")
+
+from pdpbiogen.quantum.evolution import PropagatorEngine
+from pdpbiogen.quantum.multimode import FockBasis, MultiModeEntangler
+
+@pytest.mark.quantum
+def test_truncated_basis_size_and_lookup():
+    basis = FockBasis(4, levels=3, max_excitations=2)
+    assert basis.dim == 15  # 1 + 4 + (4 + 6)
+    assert basis.index([[0, 2, 0, 0], [1, 1, 1, 0]]).tolist()[1] == -1
+    assert basis.states[basis.index([0, 2, 0, 0])[0]].tolist() == [0, 2, 0, 0]
+
+@pytest.mark.quantum
+def test_two_modes_match_propagator_engine():
+    ent = MultiModeEntangler(2, 2, g=0.8, method="dense", dt=0.1, n_steps=20)
+    psi = np.array([1, 0, 0, 1]) / np.sqrt(2)
+    final = ent.evolve(1.5, initial=psi)["final_state"]
+    ref = PropagatorEngine(g=0.8).evolve(np.outer(psi, psi), 1.5, ent.tlist)[-1]
+    np.testing.assert_allclose(np.outer(final, final.conj()), ref, atol=1e-10)
+
+@pytest.mark.quantum
+@pytest.mark.parametrize("omega", [1.0, [1.0, 1.2, 0.9, 1.1, 1.0]])
+def test_methods_agree_on_occupations(omega):
+    kw = dict(n_modes=5, levels=3, g=1.0, omega=omega, max_excitations=2, dt=0.1, n_steps=20)
+    initial = (1, 0, 0, 0, 1)
+    dense = MultiModeEntangler(method="dense", **kw).evolve(1.0, initial)
+    krylov = MultiModeEntangler(method="krylov", **kw).evolve(1.0, initial)
+    mean_field = MultiModeEntangler(method="mean_field", **kw).evolve(1.0, initial)
+    np.testing.assert_allclose(krylov["occupations"], dense["occupations"], atol=1e-10)
+    np.testing.assert_allclose(krylov["final_state"], dense["final_state"], atol=1e-10)
+    np.testing.assert_allclose(mean_field["occupations"], dense["occupations"], atol=1e-10)
+    np.testing.assert_allclose(dense["occupations"].sum(axis=1), 2.0)
+
+def test_auto_method_switches_on_basis_size():
+    assert MultiModeEntangler(4, 2, dense_threshold=16).resolve_method() == "dense"
+    assert MultiModeEntangler(5, 2, dense_threshold=16).resolve_method() == "krylov"
+    with pytest.raises(ValueError):
+        MultiModeEntangler(method="exact")
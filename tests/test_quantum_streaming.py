@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("qutip")
+
+from pdpbiogen.quantum.streaming import LatencyHistogram, StreamingQuantumMapper
+
+@pytest.mark.quantum
+def test_running_covariance_matches_window():
+    rs = np.random.RandomState(0)
+    data = rs.randn(8, 1000) + 3.0
+    mapper = StreamingQuantumMapper(8, window=128, seed=0)
+    outputs = [mapper.push(data[:, i:i + 16]) for i in range(0, 1000, 16)]
+    assert outputs[0] is None and outputs[-1] is not None
+    np.testing.assert_allclose(mapper.window_covariance(), np.cov(data[:, -128:]), atol=1e-9)
+
+@pytest.mark.quantum
+def test_running_covariance_survives_large_dc_offset():
+    rs = np.random.RandomState(1)
+    data = rs.randn(4, 700) + 1e6
+    mapper = StreamingQuantumMapper(4, window=64, refresh_every=10**9, seed=0)
+    for i in range(0, 700, 7):  # blocks straddle the end of the filling phase
+        mapper.push(data[:, i:i + 7])
+    np.testing.assert_allclose(mapper.window_covariance(), np.cov(data[:, -64:]), atol=1e-6)
+
+@pytest.mark.quantum
+def test_stream_output_and_latency_histogram():
+    mapper = StreamingQuantumMapper(6, window=32, genomic_data="GGCCAATTGGCCAA", seed=1)
+    for block in np.random.randn(50, 6, 8):
+        out = mapper.push(block)
+    assert out["quantum_human_map"].shape == (36,)
+    assert 0.0 <= out["entanglement_concurrence"] <= 1.0
+    assert out["genomic_motif"] == "GGCCAATTGGCC"
+    snap = mapper.latency.snapshot()
+    assert snap["count"] == 47
+    assert snap["p99_ms"] >= snap["p50_ms"] > 0
+
+@pytest.mark.quantum
+def test_budget_overrun_lowers_iteration_cap():
+    mapper = StreamingQuantumMapper(4, window=16, latency_budget_ms=0.0, max_iter=5, seed=2)
+    for block in np.random.randn(60, 4, 4):
+        mapper.push(block)
+    assert mapper.symmetry_agent.max_iter == 1
+    assert mapper.budget_overruns > 0
+
+def test_latency_histogram_prometheus():
+    hist = LatencyHistogram(buckets_ms=(1.0, 10.0))
+    for ms in (0.5, 2.0, 20.0):
+        hist.observe(ms)
+    text = hist.to_prometheus("lat")
+    assert 'lat_bucket{le="1.0"} 1' in text
+    assert 'lat_bucket{le="+Inf"} 3' in text
+    assert "lat_count 3" in text
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from dpbiogen.quantum import ArrayMapper, Mapper
+from dpbiogen.quantum.sweep import SweepSimulator, run_sweep, scenario_grid
+
+def _mapper(multiplier, states, neural, groups):
+    mapper = Mapper(neural_weight_multiplier=multiplier)
+    agents = mapper.add_agents([f"a{i}" for i in range(len(states))], states, neural)
+    for g in groups:
+        mapper.entangle_group([agents[i] for i in g])
+    return mapper, agents
+
+@pytest.fixture
+def system():
+    rs = np.random.RandomState(0)
+    n = 30
+    states, neural = rs.randn(n) * 10, rs.rand(n) < 0.15
+    groups = [rs.choice(n, rs.randint(2, 9), replace=False) for _ in range(10)]
+    return states, neural, groups
+
+def test_full_rate_matches_mapper_collapse(system):
+    states, neural, groups = system
+    multipliers = [1.0, 80.0, 200.0]
+    sim = SweepSimulator.from_mapper(_mapper(100.0, states, neural, groups)[0])
+    out = sim.run(np.tile(states, (3, 1)), multipliers, rates=1.0, n_steps=2)
+    for row, mult in zip(out["states"], multipliers):
+        ref, agents = _mapper(mult, states, neural, groups)
+        ref.collapse()
+        ref.collapse()
+        np.testing.assert_allclose(row, [a.state for a in agents], atol=1e-12)
+    assert out["bio_deviation"].shape == (3, 3)
+
+def test_partial_collapse_relaxes_monotonically_for_one_group():
+    mapper = ArrayMapper()
+    mapper.add_agents(["n", "a", "b"], [0.0, 18.0, -14.0], [True, False, False])
+    mapper.entangle_group(np.arange(3))
+    sim = SweepSimulator.from_mapper(mapper)
+    states, mult, rates = scenario_grid(mapper.states, [100.0], [0.1, 0.5])
+    dev = sim.run(states, mult, rates, n_steps=20, hold_neural=True)["bio_deviation"]
+    assert np.all(np.diff(dev, axis=1) <= 1e-12)
+    assert dev[1, -1] < dev[0, -1]
+    np.testing.assert_allclose(sim.run(states, mult, 1.0, n_steps=1, hold_neural=True)["states"][:, 0], 0.0)
+
+def test_scenario_grid_shapes_and_perturbation():
+    states, mult, rates = scenario_grid(np.zeros(5), [1.0, 2.0], [0.1, 1.0], n_perturbations=3,
+                                        perturbation_scale=1.0, seed=0)
+    assert states.shape == (12, 5)
+    assert sorted(set(mult)) == [1.0, 2.0] and sorted(set(rates)) == [0.1, 1.0]
+    assert np.std(states) > 0.5
+
+def test_process_pool_matches_in_process(system):
+    states, neural, groups = system
+    sim = SweepSimulator.from_mapper(_mapper(100.0, states, neural, groups)[0])
+    grid = scenario_grid(states, np.linspace(1, 200, 10), [0.2, 1.0], n_perturbations=5,
+                         perturbation_scale=1.0, seed=1)
+    serial = run_sweep(sim, *grid, n_steps=5, n_workers=1)
+    pooled = run_sweep(sim, *grid, n_steps=5, n_workers=2, chunk_size=32)
+    np.testing.assert_array_equal(serial["states"], pooled["states"])
+    np.testing.assert_array_equal(serial["bio_deviation"], pooled["bio_deviation"])
@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("qutip")
+
+from pdpbiogen.quantum.mapper import SymmetryOptimizer
+from pdpbiogen.quantum.symmetry import project_spd, whitened_asymmetry
+
+def _stream(n=16, n_win=6, step=8, width=64, seed=0):
+    rs = np.random.RandomState(seed)
+    sig = rs.randn(n, width + step * n_win)
+    offset = rs.rand(n, n)
+    for k in range(n_win):
+        x = sig[:, k * step:k * step + width]
+        x = x - x.mean(axis=1, keepdims=True)
+        yield x @ x.T / (width - 1) + offset
+
+@pytest.mark.quantum
+def test_project_spd_keeps_diagonal_and_floor():
+    a = next(_stream())
+    x, _, n_iter = project_spd(a, floor=1e-3, max_iter=200, tol=1e-9)
+    assert n_iter > 0
+    assert np.linalg.eigvalsh(x).min() >= 1e-3 - 1e-9
+    np.testing.assert_allclose(np.diag(x), np.diag(a), atol=1e-6)
+
+@pytest.mark.quantum
+def test_project_spd_fast_path_for_spd_input():
+    a = np.cov(np.random.randn(8, 100))
+    x, _, n_iter = project_spd(a)
+    assert n_iter == 0
+    np.testing.assert_allclose(x, a)
+
+@pytest.mark.quantum
+def test_warm_start_same_answer_fewer_iterations():
+    cold = SymmetryOptimizer(max_iter=500, tol=1e-8, warm_start=False)
+    warm = SymmetryOptimizer(max_iter=500, tol=1e-8, warm_start=True)
+    cold_iters = warm_iters = 0
+    for cov in _stream():
+        x_cold, s_cold = cold.optimize(cov)
+        x_warm, s_warm = warm.optimize(cov)
+        cold_iters += cold.last_n_iter
+        warm_iters += warm.last_n_iter
+        np.testing.assert_allclose(x_warm, x_cold, atol=1e-5)
+        assert s_warm == pytest.approx(s_cold, abs=1e-5)
+    assert warm_iters < cold_iters
+
+@pytest.mark.quantum
+def test_default_optimizer_is_deterministic_across_calls():
+    stream = _stream()
+    a, b = next(stream), next(stream)
+    opt = SymmetryOptimizer()  # default max_iter=5 does not converge here
+    first, score = opt.optimize(a)
+    assert opt.last_n_iter == opt.max_iter
+    again, score_again = opt.optimize(a)
+    np.testing.assert_array_equal(again, first)
+    assert score_again == score
+    opt.optimize(b)
+    np.testing.assert_array_equal(opt.optimize(a)[0], first)
+
+@pytest.mark.quantum
+def test_unconverged_dual_is_not_carried():
+    opt = SymmetryOptimizer(warm_start=True)
+    stream = _stream()
+    a, b = next(stream), next(stream)
+    first, _ = opt.optimize(a)
+    opt.optimize(b)
+    np.testing.assert_array_equal(opt.optimize(a)[0], first)
+
+@pytest.mark.quantum
+def test_whitened_asymmetry_matches_explicit_mahalanobis():
+    s = np.cov(np.random.randn(6, 50))
+    inv = np.linalg.inv(s)
+    d = [np.sqrt((s[i] - s[j]) @ inv @ (s[i] - s[j])) for i in range(6) for j in range(i + 1, 6)]
+    assert whitened_asymmetry(s) == pytest.approx(np.mean(d))
@@ -0,0 +1,48 @@
+import pytest
+
+from pdpbiogen.core.integrator import Integrator
+from pdpbiogen.validation.compiled import compile_schema, sample_validator
+from pdpbiogen.validation.validators import (
+    fast_validate_combined_output,
+    sampled_combined_validator,
+    validate_combined_output,
+)
+
+CASES = [
+    {"combined": {}, "agent": {"score": 0.5}},
+    {"combined": {}, "agent": {"score": 1}},
+    {"agent": {"score": 0.5}},
+    {"combined": {}},
+    {"combined": {}, "agent": {}},
+    {"combined": {}, "agent": {"score": "high"}},
+]
+
+@pytest.mark.parametrize("obj", CASES)
+def test_fast_validator_matches_full(obj):
+    try:
+        expected = validate_combined_output(obj)
+    except ValueError as exc:
+        with pytest.raises(ValueError, match=str(exc)):
+            fast_validate_combined_output(obj)
+    else:
+        assert fast_validate_combined_output(obj) is expected
+
+def test_compile_schema_default_messages():
+    check = compile_schema({"a": {"b": int}})
+    assert check({"a": {"b": 1}})
+    with pytest.raises(ValueError, match="Missing key: a.b"):
+        check({"a": {}})
+    with pytest.raises(ValueError, match="Invalid value for a.b"):
+        check({"a": {"b": 1.5}})
+
+def test_sample_validator_checks_one_in_n():
+    seen = []
+    check = sample_validator(seen.append, sample_every=3)
+    for i in range(7):
+        check(i)
+    assert seen == [0, 3, 6]
+
+def test_integrator_accepts_sampled_validator():
+    integrator = Integrator(validator=sampled_combined_validator(10))
+    result = integrator.run({"metabolic": {"measures": {"a": 1}}})
+    assert result["agent"]["score"] == 1.0
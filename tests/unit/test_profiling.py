@@ -0,0 +1,60 @@
+import json
+
+import pytest
+
+from pdpbiogen.core.integrator import Integrator
+from pdpbiogen.core.profiling import StageHook, StageProfiler
+
+INPUTS = {
+    "neural": {"signals": [[1, 0]]},
+    "genomic": {"variants": []},
+    "metabolic": {"measures": {"a": 1}},
+}
+
+class RecordingHook(StageHook):
+    def __init__(self):
+        self.calls = []
+
+    def before_stage(self, stage, domain=None, payload=None):
+        self.calls.append(("before", stage, domain))
+
+    def after_stage(self, stage, domain=None, output=None):
+        self.calls.append(("after", stage, domain))
+
+def test_hooks_wrap_each_stage():
+    hook = RecordingHook()
+    Integrator(hooks=[hook]).run(INPUTS)
+    stages = [(s, d) for when, s, d in hook.calls if when == "before"]
+    assert stages == [("map", "neural"), ("map", "genomic"), ("map", "metabolic"),
+                      ("agent", None), ("validate", None)]
+    assert len(hook.calls) == 2 * len(stages)
+
+def test_profiler_records_and_exports():
+    profiler = StageProfiler()
+    integrator = Integrator(hooks=[profiler])
+    integrator.run(INPUTS)
+    integrator.run(INPUTS)
+    summary = {(s["stage"], s["domain"]): s for s in profiler.summary()}
+    assert summary[("map", "neural")]["count"] == 2
+    assert summary[("map", "neural")]["input_bytes"] > 0
+    assert all(s["wall_s"] >= 0 for s in summary.values())
+
+    exported = json.loads(profiler.to_json())
+    assert len(exported["records"]) == 10
+    text = profiler.to_prometheus()
+    assert '# TYPE pdpbiogen_stage_wall_s counter' in text
+    assert 'pdpbiogen_stage_count{stage="map",domain="genomic"} 2' in text
+
+def test_failed_stage_is_recorded_and_timer_released():
+    def boom(result):
+        raise ValueError("bad output")
+
+    profiler = StageProfiler()
+    integrator = Integrator(hooks=[profiler], validator=boom)
+    with pytest.raises(ValueError):
+        integrator.run(INPUTS)
+    assert profiler._open == {}
+    assert [r["error"] for r in profiler.records] == [None] * 4 + ["ValueError"]
+    summary = {s["stage"]: s for s in profiler.summary()}
+    assert summary["validate"]["errors"] == 1 and summary["agent"]["errors"] == 0
+    assert 'pdpbiogen_stage_errors{stage="validate",domain=""} 1' in profiler.to_prometheus()
@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from pdpbiogen.core.subject_store import load_subject, save_subject
+from pdpbiogen.core.utils import load_json
+from pdpbiogen.modules.genomic.genomic_mapper import GenomicMapper
+from pdpbiogen.modules.metabolic.metabolic_mapper import MetabolicMapper
+from pdpbiogen.modules.neural.neural_mapper import NeuralMapper
+
+INPUTS = {
+    "neural": {"signals": [[0, 1, 0, 1], [1, 1, 0], [0, 0, 1, 1, 1]]},
+    "genomic": {"variants": [{"chr": "1", "pos": 12345, "ref": "A", "alt": "G"},
+                             {"chr": "2", "pos": 67890, "ref": "C", "alt": "T"}]},
+    "metabolic": {"measures": {"glucose": 5.1, "lactate": 2.2, "ph": 7.4}},
+}
+
+def test_subject_store_roundtrip(tmp_path):
+    manifest = save_subject(tmp_path / "s1", INPUTS)
+    assert manifest["domains"]["genomic"]["num_rows"] == 2
+    assert load_json(tmp_path / "s1" / "manifest.json") == manifest
+
+    loaded = load_subject(tmp_path / "s1")
+    np.testing.assert_array_equal(loaded["neural"]["signals"][2], [0, 0, 1, 1, 1])
+    assert list(loaded["genomic"]["variants"]) == INPUTS["genomic"]["variants"]
+    measures = loaded["metabolic"]["measures"]
+    assert measures["lactate"] == 2.2
+    assert list(measures.values()) == [5.1, 2.2, 7.4]
+    assert dict(measures.items()) == INPUTS["metabolic"]["measures"]
+    np.testing.assert_array_equal(measures.as_array(), [5.1, 2.2, 7.4])
+
+def test_loaded_payloads_match_json_mapping(tmp_path):
+    save_subject(tmp_path / "s1", INPUTS)
+    loaded = load_subject(tmp_path / "s1")
+    for domain, mapper in (("neural", NeuralMapper()), ("genomic", GenomicMapper()),
+                           ("metabolic", MetabolicMapper())):
+        assert mapper.map(loaded[domain]) == mapper.map(INPUTS[domain])
+
+def test_neural_signals_are_views(tmp_path):
+    save_subject(tmp_path / "s1", INPUTS)
+    signals = load_subject(tmp_path / "s1", domains=["neural"])["neural"]["signals"]
+    assert signals[0].base is not None
+    assert not signals[0].flags.writeable
@@ -0,0 +1,55 @@
+import gzip
+
+from pdpbiogen.modules.genomic.genomic_mapper import GenomicMapper
+from pdpbiogen.modules.genomic.vcf_reader import iter_vcf_batches, parse_region
+
+VCF = (
+    "##fileformat=VCFv4.2\n"
+    "#CHROM\tPOS\tID\tREF\tALT\tQUAL\tFILTER\tINFO\n"
+    "1\t12345\t.\tA\tG\t.\tPASS\t.\n"
+    "1\t22345\t.\tC\tT\t.\tPASS\t.\n"
+    "2\t67890\t.\tC\tT\t.\tPASS\t.\n"
+)
+
+def _write_vcf(tmp_path, compressed=False):
+    if compressed:
+        p = tmp_path / "sample.vcf.gz"
+        with gzip.open(p, "wt") as fh:
+            fh.write(VCF)
+    else:
+        p = tmp_path / "sample.vcf"
+        p.write_text(VCF)
+    return p
+
+def test_parse_region():
+    assert parse_region("1") == ("1", None, None)
+    assert parse_region("1:100-2,000") == ("1", 100, 2000)
+
+def test_vcf_batches_fixed_size(tmp_path):
+    p = _write_vcf(tmp_path, compressed=True)
+    sizes = [len(b) for b in iter_vcf_batches(p, batch_size=2)]
+    assert sizes == [2, 1]
+
+def test_genomic_mapper_streams_vcf(tmp_path):
+    p = _write_vcf(tmp_path)
+    out = GenomicMapper().map({"vcf": p, "batch_size": 2})
+    assert out["variant_count"] == 3
+    assert out["top_variant"] == {"chr": "1", "pos": 12345, "ref": "A", "alt": "G"}
+    assert out["chrom_counts"] == {"1": 2, "2": 1}
+
+def test_genomic_mapper_region_query(tmp_path):
+    p = _write_vcf(tmp_path)
+    out = GenomicMapper().map({"vcf": p, "region": "1:20000-30000"})
+    assert out["variant_count"] == 1
+
+def test_genomic_mapper_in_memory_matches_streamed_summary(tmp_path):
+    p = _write_vcf(tmp_path)
+    streamed = GenomicMapper().map({"vcf": p, "batch_size": 2})
+    variants = [v for batch in iter_vcf_batches(p) for v in batch]
+    in_memory = GenomicMapper().map({"variants": variants})
+    assert in_memory.keys() == streamed.keys()
+    assert (streamed["batch_count"], in_memory["batch_count"]) == (2, 1)
+    for key in ("variant_count", "top_variant", "chrom_counts"):
+        assert in_memory[key] == streamed[key]
+    assert GenomicMapper().map({"variants": []}) == {
+        "variant_count": 0, "top_variant": None, "chrom_counts": {}, "batch_count": 0}